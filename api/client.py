@@ -3,24 +3,57 @@
 Wraps ``httpx.AsyncClient`` to provide typed methods for the two core
 endpoints: ``POST /api/clips`` and ``GET /api/health``.  The client is
 designed to work inside the qasync event loop.
+
+With ``on_upload_progress(sent, total)`` request bodies are handed to
+httpx in ``UPLOAD_SLICE`` pieces and each piece is reported as it is
+taken (``total`` is None for streamed bodies), so a long upload can be
+told apart from a stuck one.
 """
 
 from __future__ import annotations
 
 import logging
-from typing import Any, Optional
+import time
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Optional
 
 import httpx
 
+from metrics import registry as metrics
+from payloads.delta import CONTENT_TYPE as DELTA_CONTENT_TYPE
+
+from .wire import MAX_METADATA_HEADER, check_reply, json_body, outgoing_metadata, raw_request
+
 logger = logging.getLogger(__name__)
 
+UploadProgress = Callable[[int, Optional[int]], None]
+
+UPLOAD_SLICE = 64 * 1024
+
+_REQUESTS = metrics.counter(
+    "api_requests", "Backend requests by endpoint and outcome", ("endpoint", "outcome"),
+)
+_LATENCY = metrics.histogram(
+    "api_request_seconds", "Backend request round-trip time", ("endpoint",),
+)
+_BYTES_SENT = metrics.counter(
+    "api_request_bytes", "Request body bytes sent to the backend", ("endpoint",),
+)
+
 
 class BiomeApiClient:
     """Lightweight async wrapper around the Biome REST API."""
 
-    def __init__(self, base_url: str = "http://localhost:8000") -> None:
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8000",
+        *,
+        raw_bodies: bool = True,
+        on_upload_progress: UploadProgress | None = None,
+    ) -> None:
         self._base_url = base_url.rstrip("/")
         self._client: Optional[httpx.AsyncClient] = None
+        self._raw_bodies = raw_bodies
+        self._on_upload_progress = on_upload_progress
 
     async def _ensure_client(self) -> httpx.AsyncClient:
         if self._client is None or self._client.is_closed:
@@ -31,34 +64,186 @@ class BiomeApiClient:
             )
         return self._client
 
+    async def _request(self, endpoint: str, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """Issue a request, recording its outcome, latency and size."""
+        client = await self._ensure_client()
+        if self._on_upload_progress is not None and kwargs.get("content") is not None:
+            kwargs = self._with_progress(kwargs)
+        started = time.perf_counter()
+        try:
+            resp = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            _REQUESTS.labels(endpoint, "error").inc()
+            raise
+        finally:
+            _LATENCY.labels(endpoint).observe(time.perf_counter() - started)
+        _REQUESTS.labels(endpoint, f"{resp.status_code // 100}xx").inc()
+        length = resp.request.headers.get("Content-Length")
+        if length:
+            _BYTES_SENT.labels(endpoint).inc(int(length))
+        return resp
+
+    def _with_progress(self, kwargs: dict[str, Any]) -> dict[str, Any]:
+        content = kwargs["content"]
+        if isinstance(content, (bytes, bytearray)):
+            if len(content) <= UPLOAD_SLICE:
+                return kwargs
+            # an explicit length keeps httpx from chunk-encoding the slices
+            headers = {**(kwargs.get("headers") or {}), "Content-Length": str(len(content))}
+            return {**kwargs, "content": self._sliced(content), "headers": headers}
+        return {**kwargs, "content": self._counted(content)}
+
+    async def _sliced(self, content: bytes) -> AsyncIterator[memoryview]:
+        # views, not copies: httpx writes any buffer, and the raw body stays zero-copy
+        view = memoryview(content)
+        for start in range(0, len(view), UPLOAD_SLICE):
+            piece = view[start:start + UPLOAD_SLICE]
+            self._report_upload(start + len(piece), len(view))
+            yield piece
+
+    async def _counted(self, body: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+        sent = 0
+        async for piece in body:
+            sent += len(piece)
+            self._report_upload(sent, None)
+            yield piece
+
+    def _report_upload(self, sent: int, total: Optional[int]) -> None:
+        try:
+            self._on_upload_progress(sent, total)
+        except Exception:
+            logger.exception("Upload progress callback failed")
+
     # ── endpoints ────────────────────────────────────────────────────
 
     async def health_check(self) -> bool:
         """Return True if the backend is reachable and healthy."""
         try:
-            client = await self._ensure_client()
-            resp = await client.get("/api/health")
+            resp = await self._request("health", "GET", "/api/health")
             return resp.status_code == 200
         except httpx.HTTPError as exc:
             logger.warning("Health check failed: %s", exc)
             return False
 
-    async def send_clip(self, text: str, *, metadata: dict[str, Any] | None = None) -> dict[str, Any]:
+    async def send_clip(
+        self,
+        text: str,
+        *,
+        metadata: dict[str, Any] | None = None,
+        idempotency_key: str | None = None,
+    ) -> dict[str, Any]:
         """Post a clipboard payload to the backend.
 
+        The text goes out as the raw UTF-8 body with metadata in headers,
+        so nothing is escaped or copied into a JSON document.  A server
+        that answers 415 is sent the ``{"kind", "data"}`` JSON body
+        instead, for the rest of the session.
+
+        With *idempotency_key* the server answers 409 if it already
+        stored a clip under that key (outbox replay).
+
         Returns the JSON response body on success, raises on failure.
         """
-        client = await self._ensure_client()
-        body: dict[str, Any] = {
-            "kind": "text",
-            "data": text,
-        }
-        if metadata:
-            body["metadata"] = metadata
+        extra = {"Idempotency-Key": idempotency_key} if idempotency_key else {}
+        raw = raw_request(text, metadata) if self._raw_bodies else None
+        if raw is not None:
+            content, headers = raw
+            resp = await self._request(
+                "clips", "POST", "/api/clips", content=content, headers={**headers, **extra},
+            )
+            if resp.status_code != 415:
+                resp.raise_for_status()
+                return check_reply(resp.json())
+            logger.info("Server does not accept raw clip bodies; falling back to JSON")
+            self._raw_bodies = False
+
+        resp = await self._request(
+            "clips", "POST", "/api/clips", json=json_body(text, metadata), headers=extra,
+        )
+        resp.raise_for_status()
+        return check_reply(resp.json())
 
-        resp = await client.post("/api/clips", json=body)
+    async def send_batch(self, entries: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Post several clips in one ``POST /api/clips/batch`` request.
+
+        *entries* come from ``api.wire.batch_entry``.  Returns one result
+        per entry, ``{"idempotencyKey", "status": "created" | "duplicate"
+        | "rejected", ...}``.  Servers without the endpoint answer
+        404/405/501.
+        """
+        resp = await self._request("batch", "POST", "/api/clips/batch", json={"clips": entries})
+        resp.raise_for_status()
+        results = resp.json().get("results", [])
+        for result in results:
+            if isinstance(result, dict) and isinstance(result.get("clip"), dict):
+                check_reply(result["clip"])
+        return results
+
+    async def list_devices(
+        self, *, etag: str | None = None,
+    ) -> tuple[Optional[list[dict[str, Any]]], Optional[str]]:
+        """``GET /api/devices``, conditional on *etag*.
+
+        Returns ``(devices, etag)``; ``devices`` is None when the server
+        answers 304 Not Modified.
+        """
+        headers = {"If-None-Match": etag} if etag else {}
+        resp = await self._request("devices", "GET", "/api/devices", headers=headers)
+        if resp.status_code == 304:
+            return None, etag
+        resp.raise_for_status()
+        devices = resp.json().get("devices", [])
+        return [d for d in devices if isinstance(d, dict)], resp.headers.get("ETag")
+
+    async def send_stream(
+        self,
+        body: AsyncIterable[bytes],
+        *,
+        content_type: str,
+        headers: dict[str, str] | None = None,
+    ) -> dict[str, Any]:
+        """Post a streamed (chunk-encoded) payload body to ``/api/clips``.
+
+        Used for encrypted payloads; ``body`` is consumed as it is sent.
+        """
+        resp = await self._request(
+            "stream", "POST", "/api/clips",
+            content=body,
+            headers={"Content-Type": content_type, **(headers or {})},
+        )
+        resp.raise_for_status()
+        return check_reply(resp.json())
+
+    async def send_delta(
+        self,
+        delta: bytes,
+        *,
+        base_digest: str,
+        metadata: dict[str, Any] | None = None,
+        idempotency_key: str | None = None,
+    ) -> dict[str, Any]:
+        """Post a ``payloads.delta`` diff against an earlier clip.
+
+        The server answers 404 or 412 when it no longer has the base;
+        that surfaces as ``httpx.HTTPStatusError`` for the caller to
+        fall back on.  409 is reserved for "already stored" under
+        *idempotency_key*, as for ``send_clip``.
+        """
+        headers = {
+            "Content-Type": DELTA_CONTENT_TYPE,
+            "X-Biome-Kind": "text",
+            "X-Biome-Base-Digest": base_digest,
+        }
+        meta_header = outgoing_metadata(metadata)
+        if meta_header is not None:
+            if len(meta_header) > MAX_METADATA_HEADER:
+                raise ValueError("metadata too large for a delta upload")
+            headers["X-Biome-Metadata"] = meta_header
+        if idempotency_key:
+            headers["Idempotency-Key"] = idempotency_key
+        resp = await self._request("delta", "POST", "/api/clips", content=delta, headers=headers)
         resp.raise_for_status()
-        return resp.json()
+        return check_reply(resp.json())
 
     # ── lifecycle ────────────────────────────────────────────────────
 
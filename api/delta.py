@@ -0,0 +1,129 @@
+"""``BiomeApiClient`` wrapper that uploads edits of recent clips as deltas.
+
+Every clip the backend acknowledges is remembered (``DeltaEncoder``).
+When a new clip resembles one of them, only a ``payloads.delta`` diff
+against that base's digest is posted.  If the server no longer has the
+base it answers 404 or 412 and the clip is re-sent in full; a 415
+means the server does not take deltas at all, and they are switched off
+for the rest of the session.  409 only ever means "already stored" for
+a send with an idempotency key: that is raised to the caller (the outbox
+counts it as delivered) and the base is kept.
+
+Sketching a clip and diffing it are GIL-bound loops and run in the
+process pool, each bounded by ``DIFF_TIMEOUT`` so a slow one falls back
+to a full send; picking a base and remembering run in the thread pool.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional, TypeVar
+
+import httpx
+
+from payloads.delta import MIN_DELTA_INPUT, DeltaEncoder, DeltaResult, DeltaStats, diff, sketch
+from workers.pool import offload
+
+from .client import BiomeApiClient
+from .wire import metadata_header
+
+logger = logging.getLogger(__name__)
+
+BASE_MISSING = frozenset({404, 412})
+UNSUPPORTED = 415
+DIFF_TIMEOUT = 2.0      # seconds; past this the clip goes in full
+
+T = TypeVar("T")
+
+
+class DeltaClient:
+    """Drop-in for ``BiomeApiClient`` in the send path."""
+
+    def __init__(self, client: BiomeApiClient, encoder: DeltaEncoder | None = None) -> None:
+        self._client = client
+        self._encoder = encoder or DeltaEncoder()
+        self._supported = True
+        self.stats = DeltaStats()
+
+    async def send_clip(
+        self,
+        text: str,
+        *,
+        metadata: dict[str, Any] | None = None,
+        idempotency_key: str | None = None,
+    ) -> dict[str, Any]:
+        data = text.encode("utf-8")
+        eligible = (
+            self._supported
+            and len(data) >= MIN_DELTA_INPUT
+            and (not metadata or metadata_header(metadata) is not None)
+        )
+        content_sketch = None
+        if eligible:
+            content_sketch = await self._in_process("sketch", sketch, data)
+            eligible = content_sketch is not None
+        if eligible and len(self._encoder):
+            self.stats.attempts += 1
+            result = await self._diff(data, content_sketch)
+            if result is not None:
+                try:
+                    response = await self._client.send_delta(
+                        result.delta,
+                        base_digest=result.base_digest.hex(),
+                        metadata=metadata,
+                        idempotency_key=idempotency_key,
+                    )
+                except httpx.HTTPStatusError as exc:
+                    status = exc.response.status_code
+                    if status == UNSUPPORTED:
+                        logger.info("Server does not accept deltas; sending full clips")
+                        self._supported = False
+                    elif status in BASE_MISSING:
+                        self._encoder.forget(result.base_digest)
+                    else:
+                        raise
+                    self.stats.fallbacks += 1
+                else:
+                    self.stats.deltas_sent += 1
+                    self.stats.bytes_full += result.full_size
+                    self.stats.bytes_sent += len(result.delta)
+                    logger.info(
+                        "Sent %d-byte delta for a %d-byte clip (saved %d bytes)",
+                        len(result.delta), result.full_size, result.bytes_saved,
+                    )
+                    await offload(self._encoder.remember, data, content_sketch)
+                    return response
+
+        response = await self._client.send_clip(
+            text, metadata=metadata, idempotency_key=idempotency_key,
+        )
+        if eligible and self._supported:
+            await offload(self._encoder.remember, data, content_sketch)
+        return response
+
+    async def _diff(self, data: bytes, content_sketch: frozenset[int]) -> Optional[DeltaResult]:
+        plan = await offload(self._encoder.plan, data, content_sketch)
+        if plan is None:
+            return None
+        return await self._in_process("diff", diff, plan)
+
+    @staticmethod
+    async def _in_process(what: str, fn: Callable[..., T], *args: Any) -> Optional[T]:
+        try:
+            return await offload(fn, *args, process=True, timeout=DIFF_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.info("Delta %s took over %.1fs; sending the full clip", what, DIFF_TIMEOUT)
+        except (BrokenProcessPool, OSError) as exc:
+            logger.warning("Delta %s failed (%s); sending the full clip", what, exc)
+        return None
+
+    async def send_batch(self, entries: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        return await self._client.send_batch(entries)
+
+    async def health_check(self) -> bool:
+        return await self._client.health_check()
+
+    async def close(self) -> None:
+        await self._client.close()
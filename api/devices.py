@@ -0,0 +1,196 @@
+"""Cached registry of the account's linked devices.
+
+``DeviceRegistry`` serves the device list from memory, loaded from
+``~/.biome/cache/devices.json`` at start, so the tray menu and the send
+path never wait on the network.  ``refresh_soon`` revalidates it in the
+background with a conditional ``GET /api/devices`` (``If-None-Match``
+with the stored ETag); a 304 only bumps the freshness time, a 200
+replaces the list and rewrites the cache file.  When the backend is
+unreachable the cached list stays in use.
+
+Sends pick devices by putting their ids in the clip metadata as
+``targetDeviceIds`` (see ``target_metadata``); without it a clip goes
+to every linked device, as before.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+
+import httpx
+
+from workers.pool import offload
+
+logger = logging.getLogger(__name__)
+
+TARGETS_KEY = "targetDeviceIds"
+DEFAULT_MAX_AGE = 300.0
+CACHE_VERSION = 1
+
+
+def default_cache_path() -> Path:
+    return Path.home() / ".biome" / "cache" / "devices.json"
+
+
+def target_metadata(metadata: dict[str, Any] | None, targets: Iterable[str] | None) -> dict[str, Any]:
+    """*metadata* with ``targetDeviceIds`` set; no targets means all devices."""
+    result = dict(metadata or {})
+    ids = [t for t in dict.fromkeys(targets or ()) if t]
+    if ids:
+        result[TARGETS_KEY] = ids
+    else:
+        result.pop(TARGETS_KEY, None)
+    return result
+
+
+@dataclass(frozen=True)
+class Device:
+    id: str
+    name: str
+    platform: str = ""
+    last_seen: Optional[str] = None
+
+    @classmethod
+    def from_json(cls, raw: dict[str, Any]) -> Optional["Device"]:
+        device_id = raw.get("id")
+        if not isinstance(device_id, str) or not device_id:
+            return None
+        return cls(
+            id=device_id,
+            name=str(raw.get("name") or device_id),
+            platform=str(raw.get("platform") or ""),
+            last_seen=raw.get("lastSeen") or raw.get("last_seen"),
+        )
+
+
+class DeviceRegistry:
+    """Device list that is always answered from cache."""
+
+    def __init__(
+        self,
+        client: Any,
+        *,
+        own_device_id: str = "",
+        path: Path | None = None,
+        max_age: float = DEFAULT_MAX_AGE,
+        on_change: Optional[Callable[[list[Device]], None]] = None,
+    ) -> None:
+        self._client = client
+        self._own = own_device_id
+        self._path = path or default_cache_path()
+        self._max_age = max_age
+        self._on_change = on_change
+        self._devices: list[Device] = []
+        self._etag: Optional[str] = None
+        self._fetched_at = 0.0          # wall clock, survives restarts
+        self._task: Optional[asyncio.Task] = None
+        self._load()
+
+    # ── lookups (never touch the network) ────────────────────────────
+
+    def devices(self) -> list[Device]:
+        return list(self._devices)
+
+    def others(self) -> list[Device]:
+        """Devices a clip can be sent to — everything but this one."""
+        return [d for d in self._devices if d.id != self._own]
+
+    def get(self, device_id: str) -> Optional[Device]:
+        return next((d for d in self._devices if d.id == device_id), None)
+
+    @property
+    def stale(self) -> bool:
+        return time.time() - self._fetched_at >= self._max_age
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "devices": [asdict(d) for d in self._devices],
+            "etag": self._etag,
+            "age_s": round(time.time() - self._fetched_at, 1) if self._fetched_at else None,
+        }
+
+    # ── revalidation ─────────────────────────────────────────────────
+
+    def refresh_soon(self, *, force: bool = False) -> None:
+        """Revalidate in the background if stale; returns immediately."""
+        if not (force or self.stale) or (self._task is not None and not self._task.done()):
+            return
+        self._task = asyncio.get_running_loop().create_task(self.refresh())
+
+    async def refresh(self) -> bool:
+        """Conditional GET; True if the device list changed."""
+        try:
+            devices, etag = await self._client.list_devices(etag=self._etag)
+        except httpx.HTTPError as exc:
+            logger.info("Device list refresh failed, keeping the cached list: %s", exc)
+            return False
+        self._fetched_at = time.time()
+        if devices is None:                 # 304 Not Modified
+            await offload(self._save)
+            return False
+        parsed = [d for d in map(Device.from_json, devices) if d is not None]
+        changed = parsed != self._devices
+        self._devices, self._etag = parsed, etag
+        await offload(self._save)
+        if changed:
+            logger.info("Device list updated: %d devices", len(parsed))
+            if self._on_change is not None:
+                try:
+                    self._on_change(self.devices())
+                except Exception:
+                    logger.exception("Device list callback failed")
+        return changed
+
+    def close(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+    # ── cache file ───────────────────────────────────────────────────
+
+    def _load(self) -> None:
+        try:
+            with self._path.open("r", encoding="utf-8") as f:
+                raw = json.load(f)
+            if raw.get("version") != CACHE_VERSION:
+                return
+            self._devices = [d for d in map(Device.from_json, raw.get("devices", [])) if d is not None]
+            self._etag = raw.get("etag")
+            self._fetched_at = float(raw.get("fetched_at", 0.0))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, TypeError, AttributeError) as exc:
+            logger.warning("Ignoring unreadable device cache %s: %s", self._path, exc)
+
+    def _save(self) -> None:
+        record = {
+            "version": CACHE_VERSION,
+            "etag": self._etag,
+            "fetched_at": self._fetched_at,
+            "devices": [
+                {"id": d.id, "name": d.name, "platform": d.platform, "lastSeen": d.last_seen}
+                for d in self._devices
+            ],
+        }
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self._path.parent, prefix=".devices-", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(record, f)
+                os.replace(tmp, self._path)
+            except BaseException:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+                raise
+        except OSError as exc:
+            logger.warning("Could not write device cache %s: %s", self._path, exc)
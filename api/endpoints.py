@@ -0,0 +1,291 @@
+"""Send through several backend endpoints with latency-based failover.
+
+``FailoverClient`` is a drop-in for ``BiomeApiClient`` when
+``api_endpoints`` lists more than one backend (regional deployments, a
+LAN relay).  Each endpoint keeps its own ``BiomeApiClient`` — and so its
+own connection pool — plus an EWMA of its health-probe RTT and of its
+error rate.
+
+* Requests go to the healthy endpoint with the lowest score (RTT scaled
+  up by the error rate); until probes have run, the configured order
+  wins.
+* A transport error, 429 or 502/503/504 moves the request to the next
+  endpoint.  Answers such as 409 or 415 are returned to the caller
+  as-is.  Streamed (encrypted) bodies cannot be replayed, so they only
+  move on when the connection was never established.
+* ``start_probing`` checks every endpoint's ``/api/health`` in the
+  background; an endpoint marked down comes back once a probe succeeds.
+* With ``hedge_small_clips`` a clip up to ``HEDGE_MAX_BYTES`` that the
+  best endpoint has not answered within about twice its RTT is sent to
+  the runner-up as well, under the same idempotency key, and the first
+  success wins.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, Awaitable, Callable, Iterable, Optional, TypeVar
+
+import httpx
+
+from .client import BiomeApiClient, UploadProgress
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+Call = Callable[[BiomeApiClient], Awaitable[T]]
+
+EWMA_ALPHA = 0.3
+UNKNOWN_RTT_MS = 250.0
+ERROR_PENALTY = 4.0            # a 100% error rate scores like 5x the RTT
+DEFAULT_PROBE_INTERVAL = 30.0
+HEDGE_MAX_BYTES = 64 * 1024
+HEDGE_MIN_DELAY = 0.05
+HEDGE_MAX_DELAY = 1.0
+
+_FAIL_OVER_STATUS = frozenset({429, 502, 503, 504})
+
+
+@dataclass
+class EndpointStats:
+    url: str
+    rtt_ms: Optional[float] = None   # EWMA of health-probe round trips
+    error_rate: float = 0.0          # EWMA of request failures, 0..1
+    healthy: bool = True
+    requests: int = 0
+    failures: int = 0
+    last_error: Optional[str] = None
+
+    @property
+    def score(self) -> float:
+        rtt = self.rtt_ms if self.rtt_ms is not None else UNKNOWN_RTT_MS
+        return rtt * (1.0 + ERROR_PENALTY * self.error_rate)
+
+    def record_rtt(self, ms: float) -> None:
+        self.rtt_ms = ms if self.rtt_ms is None else self.rtt_ms + EWMA_ALPHA * (ms - self.rtt_ms)
+
+    def record_result(self, ok: bool) -> None:
+        self.error_rate += EWMA_ALPHA * ((0.0 if ok else 1.0) - self.error_rate)
+
+
+@dataclass
+class _Endpoint:
+    stats: EndpointStats
+    client: BiomeApiClient = field(repr=False)
+
+
+def _fails_over(exc: BaseException, replayable: bool) -> bool:
+    if not replayable:
+        # the body was never read if the connection never came up
+        return isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout))
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in _FAIL_OVER_STATUS
+    return isinstance(exc, httpx.TransportError)
+
+
+def _marks_down(exc: BaseException) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500
+    return isinstance(exc, httpx.TransportError)
+
+
+class FailoverClient:
+    """Drop-in for ``BiomeApiClient`` over several endpoints."""
+
+    def __init__(
+        self,
+        urls: Iterable[str],
+        *,
+        hedge_small_clips: bool = False,
+        probe_interval: float = DEFAULT_PROBE_INTERVAL,
+        on_upload_progress: UploadProgress | None = None,
+    ) -> None:
+        self._endpoints = [
+            _Endpoint(EndpointStats(url), BiomeApiClient(url, on_upload_progress=on_upload_progress))
+            for url in urls
+        ]
+        if not self._endpoints:
+            raise ValueError("FailoverClient needs at least one endpoint")
+        self._hedge = hedge_small_clips
+        self._probe_interval = probe_interval
+        self._probe_task: Optional[asyncio.Task] = None
+
+    @property
+    def endpoints(self) -> list[EndpointStats]:
+        return [e.stats for e in self._endpoints]
+
+    def ranked(self) -> list[_Endpoint]:
+        """Healthy endpoints by score, then the ones marked down."""
+        return sorted(self._endpoints, key=lambda e: (not e.stats.healthy, e.stats.score))
+
+    # ── endpoints ────────────────────────────────────────────────────
+
+    async def health_check(self) -> bool:
+        """Probe every endpoint; True if any is healthy."""
+        results = await asyncio.gather(*(self._probe(e) for e in self._endpoints))
+        return any(results)
+
+    async def send_clip(
+        self,
+        text: str,
+        *,
+        metadata: dict[str, Any] | None = None,
+        idempotency_key: str | None = None,
+    ) -> dict[str, Any]:
+        if self._hedge and len(text) <= HEDGE_MAX_BYTES and len(text.encode("utf-8")) <= HEDGE_MAX_BYTES:
+            # one key for both copies, so the backend stores the clip once
+            key = idempotency_key or uuid.uuid4().hex
+            return await self._hedged(
+                lambda c: c.send_clip(text, metadata=metadata, idempotency_key=key),
+            )
+        return await self._call(
+            lambda c: c.send_clip(text, metadata=metadata, idempotency_key=idempotency_key),
+        )
+
+    async def send_batch(self, entries: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        return await self._call(lambda c: c.send_batch(entries))
+
+    async def list_devices(self, *, etag: str | None = None):
+        return await self._call(lambda c: c.list_devices(etag=etag))
+
+    async def send_stream(
+        self,
+        body: AsyncIterable[bytes],
+        *,
+        content_type: str,
+        headers: dict[str, str] | None = None,
+    ) -> dict[str, Any]:
+        return await self._call(
+            lambda c: c.send_stream(body, content_type=content_type, headers=headers),
+            replayable=False,
+        )
+
+    async def send_delta(self, delta: bytes, **kwargs: Any) -> dict[str, Any]:
+        return await self._call(lambda c: c.send_delta(delta, **kwargs))
+
+    # ── probing ──────────────────────────────────────────────────────
+
+    def start_probing(self) -> None:
+        """Probe all endpoints every ``probe_interval`` seconds.
+
+        The first probe is left to the caller's own ``health_check``.
+        """
+        if self._probe_task is None or self._probe_task.done():
+            self._probe_task = asyncio.get_running_loop().create_task(self._probe_loop())
+
+    def stop_probing(self) -> None:
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            self._probe_task = None
+
+    async def _probe_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._probe_interval)
+            await self.health_check()
+
+    async def _probe(self, endpoint: _Endpoint) -> bool:
+        stats = endpoint.stats
+        started = time.perf_counter()
+        ok = await endpoint.client.health_check()
+        if ok:
+            stats.record_rtt((time.perf_counter() - started) * 1000)
+        if ok != stats.healthy:
+            logger.info("Endpoint %s is %s", stats.url, "back up" if ok else "down")
+        stats.healthy = ok
+        return ok
+
+    # ── requests ─────────────────────────────────────────────────────
+
+    async def _attempt(self, endpoint: _Endpoint, call: Call[T]) -> T:
+        stats = endpoint.stats
+        stats.requests += 1
+        try:
+            result = await call(endpoint.client)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            stats.failures += 1
+            stats.record_result(False)
+            stats.last_error = str(exc) or type(exc).__name__
+            if _marks_down(exc):
+                stats.healthy = False
+            raise
+        stats.record_result(True)
+        stats.healthy = True
+        return result
+
+    async def _call(self, call: Call[T], *, replayable: bool = True,
+                    order: Optional[list[_Endpoint]] = None) -> T:
+        order = self.ranked() if order is None else order
+        for endpoint, fallback in zip(order, order[1:]):
+            try:
+                return await self._attempt(endpoint, call)
+            except Exception as exc:
+                if not _fails_over(exc, replayable):
+                    raise
+                logger.warning(
+                    "Request to %s failed (%s); failing over to %s",
+                    endpoint.stats.url, endpoint.stats.last_error, fallback.stats.url,
+                )
+        return await self._attempt(order[-1], call)
+
+    async def _hedged(self, call: Call[T]) -> T:
+        order = self.ranked()
+        first, rest = order[0], order[1:]
+        if not rest or not rest[0].stats.healthy:
+            return await self._call(call, order=order)
+
+        primary = asyncio.ensure_future(self._attempt(first, call))
+        delay = 2 * (first.stats.rtt_ms if first.stats.rtt_ms is not None else UNKNOWN_RTT_MS) / 1000
+        done, _ = await asyncio.wait({primary}, timeout=min(max(delay, HEDGE_MIN_DELAY), HEDGE_MAX_DELAY))
+        if done:
+            exc = primary.exception()
+            if exc is None:
+                return primary.result()
+            if not _fails_over(exc, True):
+                raise exc
+            return await self._call(call, order=rest)
+
+        logger.debug("Hedging send to %s after %.0f ms", rest[0].stats.url, delay * 1000)
+        pending = {primary, asyncio.ensure_future(self._attempt(rest[0], call))}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = error or task.exception()
+        finally:
+            for task in pending:
+                task.cancel()
+        if len(rest) > 1 and _fails_over(error, True):
+            return await self._call(call, order=rest[1:])
+        raise error
+
+    # ── lifecycle ────────────────────────────────────────────────────
+
+    async def close(self) -> None:
+        self.stop_probing()
+        for endpoint in self._endpoints:
+            await endpoint.client.close()
+
+
+def build_client(
+    base_url: str,
+    endpoints: Iterable[str] = (),
+    *,
+    hedge_small_clips: bool = False,
+    on_upload_progress: UploadProgress | None = None,
+) -> BiomeApiClient | FailoverClient:
+    """A ``FailoverClient`` when several endpoints are configured."""
+    urls = list(dict.fromkeys(u.rstrip("/") for u in endpoints if u and u.strip()))
+    if len(urls) <= 1:
+        return BiomeApiClient(urls[0] if urls else base_url, on_upload_progress=on_upload_progress)
+    return FailoverClient(
+        urls, hedge_small_clips=hedge_small_clips, on_upload_progress=on_upload_progress,
+    )
@@ -0,0 +1,105 @@
+"""Request body encodings for ``POST /api/clips``.
+
+``raw`` (preferred): the clip is the UTF-8 request body, metadata
+travels as compact ASCII JSON in ``X-Biome-Metadata``.  ``json``
+(fallback): the original ``{"kind", "data", "metadata"}`` document,
+which escapes every quote, newline and — with ``ensure_ascii`` — every
+non-ASCII character of the clip.
+
+Both validate the clip document the upload describes (``kind`` and the
+metadata object as it is serialised) with ``outgoing_metadata`` before
+anything is sent.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any, Optional
+
+from payloads.schema import SchemaError, outgoing_draft, validate_clip_document, validate_outgoing_clip
+
+from .devices import TARGETS_KEY
+
+logger = logging.getLogger(__name__)
+
+RAW_CONTENT_TYPE = "text/plain; charset=utf-8"
+MAX_METADATA_HEADER = 8 * 1024
+
+
+def metadata_header(metadata: dict[str, Any]) -> Optional[str]:
+    """Compact ASCII JSON for ``X-Biome-Metadata``, or None if too large."""
+    encoded = json.dumps(metadata, separators=(",", ":"), default=str)
+    return encoded if len(encoded) <= MAX_METADATA_HEADER else None
+
+
+def outgoing_metadata(metadata: Any, kind: str = "text") -> Optional[str]:
+    """Validate the document an upload of *kind* with *metadata* describes.
+
+    *metadata* must be a JSON-serialisable object whose ``targetDeviceIds``,
+    if present, is a list of device ids.  Returns the compact metadata
+    JSON (None when there is none); raises ``SchemaError``.
+    """
+    encoded = None
+    if metadata is not None:
+        if not isinstance(metadata, dict):
+            raise SchemaError("$.metadata", "must be an object")
+        targets = metadata.get(TARGETS_KEY, [])
+        if not isinstance(targets, list) or not all(isinstance(t, str) and t for t in targets):
+            raise SchemaError(f"$.metadata.{TARGETS_KEY}", "must be a list of device ids")
+        if metadata:
+            try:
+                encoded = json.dumps(metadata, separators=(",", ":"), allow_nan=False)
+            except (TypeError, ValueError) as exc:
+                raise SchemaError("$.metadata", f"is not JSON-serialisable: {exc}") from None
+    validate_outgoing_clip(outgoing_draft(kind, encoded))
+    return encoded
+
+
+def raw_request(
+    text: str,
+    metadata: dict[str, Any] | None,
+    kind: str = "text",
+) -> Optional[tuple[bytes, dict[str, str]]]:
+    """Body and headers for the raw encoding; None if metadata will not fit.
+
+    Raises ``SchemaError`` if the clip would not make a valid document.
+    """
+    headers = {"Content-Type": RAW_CONTENT_TYPE, "X-Biome-Kind": kind}
+    encoded = outgoing_metadata(metadata, kind)
+    if encoded is not None:
+        if len(encoded) > MAX_METADATA_HEADER:
+            return None
+        headers["X-Biome-Metadata"] = encoded
+    return text.encode("utf-8"), headers
+
+
+def json_body(text: str, metadata: dict[str, Any] | None, kind: str = "text") -> dict[str, Any]:
+    """The ``{"kind", "data", "metadata"}`` document; raises ``SchemaError``."""
+    outgoing_metadata(metadata, kind)
+    body: dict[str, Any] = {
+        "kind": kind,
+        "data": text,
+    }
+    if metadata:
+        body["metadata"] = metadata
+    return body
+
+
+def batch_entry(text: str, metadata: dict[str, Any] | None, idempotency_key: str) -> dict[str, Any]:
+    """One element of a ``POST /api/clips/batch`` request."""
+    return {**json_body(text, metadata), "idempotencyKey": idempotency_key}
+
+
+def check_reply(body: Any) -> Any:
+    """Validate a clip document echoed back by the server.
+
+    The clip is already stored by then, so a malformed document is
+    logged rather than failing the send.
+    """
+    if isinstance(body, dict) and "storagePath" in body:
+        try:
+            validate_clip_document(body)
+        except SchemaError as exc:
+            logger.warning("Server returned an invalid clip document: %s", exc)
+    return body
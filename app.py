@@ -3,6 +3,10 @@
 Creates the QApplication, applies the theme, builds the main window,
 starts the tray, clipboard watcher, and integrates qasync for async
 HTTP calls.  This is the single composition root for the desktop client.
+
+The main window (and each of its pages) and the SpeedBoost overlay are
+built on first use, so a tray-only start (``--minimized`` or the
+``start_minimized`` setting) never imports or constructs them.
 """
 
 from __future__ import annotations
@@ -12,17 +16,28 @@ import logging
 import os
 import platform
 import sys
+import uuid
+from dataclasses import asdict
 
+from diagnostics.startup import get_profiler
 
 logger = logging.getLogger(__name__)
 
 
-def run() -> None:
-    """Entry point — initialise Qt + async loop and launch the app."""
+def run(initial_command: tuple[str, dict] | None = None) -> None:
+    """Entry point — initialise Qt + async loop and launch the app.
+
+    ``initial_command`` is an IPC command (see ``ipc.protocol``) to run
+    once the app is up, e.g. ``("send", {"text": …})`` from ``main.py``.
+    """
+
+    profiler = get_profiler()
 
+    profiler.begin("logging")
     _configure_logging()
 
     # ── Qt application ───────────────────────────────────────────────
+    profiler.begin("qt_application")
     from PySide6.QtWidgets import QApplication
 
     app = QApplication(sys.argv)
@@ -30,58 +45,385 @@ def run() -> None:
     app.setOrganizationName("Biome")
     app.setQuitOnLastWindowClosed(False)  # keep alive in tray
 
+    # ── single-instance lock ─────────────────────────────────────────
+    profiler.begin("instance_server")
+    from ipc import protocol
+    from ipc.server import InstanceServer
+    instance_server = InstanceServer(lambda cmd, args: _handle_command(cmd, args), app)
+    if not instance_server.listen():
+        # another instance won the race since main.py checked — defer to it
+        cmd, payload = initial_command or ("show", {})
+        protocol.request(cmd, payload)
+        return
+    app.aboutToQuit.connect(instance_server.close)
+
     # ── theme ────────────────────────────────────────────────────────
+    profiler.begin("theme")
     from ui.theme import apply_theme
     apply_theme(app)
 
     # ── async event loop (qasync) ────────────────────────────────────
+    profiler.begin("event_loop")
     import qasync
     loop = qasync.QEventLoop(app)
     asyncio.set_event_loop(loop)
 
+    from diagnostics import watchdog
+    stall_watchdog = watchdog.configure()
+    app.aboutToQuit.connect(stall_watchdog.stop)
+
+    from metrics import exporter as metrics_exporter
+    metrics_export = metrics_exporter.configure()
+    app.aboutToQuit.connect(metrics_export.stop)
+
     # ── settings ─────────────────────────────────────────────────────
+    profiler.begin("settings")
     from settings.store import SettingsStore
     settings = SettingsStore()
     settings.load()
 
     # ── API client ───────────────────────────────────────────────────
-    from api.client import BiomeApiClient
+    profiler.begin("api_client")
+    from api.endpoints import FailoverClient, build_client
     api_base = settings.get("api_base_url", "http://localhost:8000")
-    api_client = BiomeApiClient(base_url=api_base)
+
+    def _on_upload_progress(sent: int, total: int | None) -> None:
+        if overlay is not None:
+            overlay.notify_progress()     # a long upload is not a stall
+
+    api_client = build_client(
+        api_base,
+        settings.get("api_endpoints") or (),
+        hedge_small_clips=bool(settings.get("api_hedge_small_clips", False)),
+        on_upload_progress=_on_upload_progress,
+    )
 
     # ── clipboard watcher ────────────────────────────────────────────
+    profiler.begin("clipboard_watcher")
     from clipboard.watcher import ClipboardWatcher
     clipboard_watcher = ClipboardWatcher()
 
     # ── payload classifier ───────────────────────────────────────────
+    profiler.begin("classifier")
     from payloads.classifier import PayloadClassifier
     classifier = PayloadClassifier()
 
-    # ── overlay ──────────────────────────────────────────────────────
-    from ui.overlay import SpeedBoostOverlay
-    overlay = SpeedBoostOverlay()
-
-    # ── main window ──────────────────────────────────────────────────
-    from ui.main_window import MainWindow
-    window = MainWindow()
-    window.dashboard_page.set_services(
-        api_client=api_client,
-        clipboard_watcher=clipboard_watcher,
-    )
-    window.settings_page.set_settings_store(settings)
+    # ── clip history ─────────────────────────────────────────────────
+    profiler.begin("history")
+    history = None
+    if settings.get("history_enabled", True):
+        from history.store import HistoryStore
+        history = HistoryStore()
+        history.open()
+
+    # ── received-payload blob cache (index read on first use) ────────
+    profiler.begin("blob_cache")
+    from cache.blobs import BlobCache
+    blob_cache = BlobCache(max_bytes=int(settings.get("blob_cache_max_mb", 512)) * 2**20)
+    app.aboutToQuit.connect(blob_cache.close)
+
+    # ── worker pools (created on first offload) ──────────────────────
+    from workers import pool as worker_pool
+    app.aboutToQuit.connect(worker_pool.shutdown)
+
+    # ── overlay (built on first send) ────────────────────────────────
+    profiler.begin("overlay")
+    overlay = None
+
+    def _start_overlay() -> None:
+        nonlocal overlay
+        if not settings.get("speedboost_enabled", True):
+            return
+        if overlay is None:
+            from ui.overlay import SpeedBoostOverlay
+            overlay = SpeedBoostOverlay()
+        overlay.start()
+
+    def _stop_overlay() -> None:
+        if overlay is not None:
+            overlay.stop()
+
+    # ── activity log (outlives the lazily built dashboard) ───────────
+    from ui.activity_log import ActivityLogModel
+    activity = ActivityLogModel(capacity=200, parent=app)
+    connection_ok: bool | None = None
+
+    # ── main window (built on first show) ────────────────────────────
+    profiler.begin("main_window")
+    window = None
+
+    def _on_page_created(index: int, page) -> None:
+        from ui.main_window import DASHBOARD_PAGE, HISTORY_PAGE, SETTINGS_PAGE
+        if index == DASHBOARD_PAGE:
+            page.set_activity_model(activity)
+            page.set_services(
+                dispatcher=dispatcher,
+                clipboard_watcher=clipboard_watcher,
+                send_metadata=lambda: target_metadata(None, tray.targets),
+            )
+            if connection_ok is not None:
+                page.set_connection_status(connection_ok)
+            page.set_outbox_progress(reconciler.progress)
+        elif index == HISTORY_PAGE and history is not None:
+            from history.search import HistorySearcher
+            page.set_history(history, HistorySearcher(history.path))
+            page.clip_activated.connect(
+                lambda clip_id: loop.create_task(_copy_from_history(clip_id))
+            )
+        elif index == SETTINGS_PAGE:
+            page.set_settings_store(settings)
+            page.set_outbox_progress(reconciler.progress)
+
+    def _ensure_window():
+        nonlocal window
+        if window is None:
+            from ui.main_window import MainWindow
+            window = MainWindow()
+            window.page_created.connect(_on_page_created)
+        return window
 
     # ── tray service ─────────────────────────────────────────────────
+    profiler.begin("tray")
     from tray.service import TrayService, TrayState
     tray = TrayService()
 
     def _on_tray_show() -> None:
-        window.show()
-        window.raise_()
-        window.activateWindow()
+        win = _ensure_window()
+        win.show()
+        win.raise_()
+        win.activateWindow()
 
     tray.show_requested.connect(_on_tray_show)
     tray.quit_requested.connect(app.quit)
 
+    # ── linked devices (cached; "Send to" targets) ───────────────────
+    from api.devices import DeviceRegistry, target_metadata
+
+    def _on_devices_changed(_devices=None) -> None:
+        # the saved selection is the source of truth: a device missing
+        # from an older cache comes back ticked once it is listed again
+        tray.set_devices(
+            [(d.id, d.name) for d in device_registry.others()],
+            selected=list(settings.get("send_targets") or ()),
+        )
+
+    device_registry = DeviceRegistry(
+        api_client, own_device_id=settings.get("device_id") or "", on_change=_on_devices_changed,
+    )
+    app.aboutToQuit.connect(device_registry.close)
+    _on_devices_changed()
+
+    def _on_targets_changed(targets: list) -> None:
+        settings.set("send_targets", targets)
+        settings.save()
+
+    tray.targets_changed.connect(_on_targets_changed)
+    tray.targets_menu_opened.connect(device_registry.refresh_soon)
+
+    # ── send dispatch (every send path goes through here) ────────────
+    profiler.begin("dispatch")
+    from dispatch.scheduler import DispatchScheduler, JobStatus, Lane
+    from outbox.store import Outbox
+
+    def _dashboard():
+        if window is None:
+            return None
+        from ui.main_window import DASHBOARD_PAGE
+        return window.built_page(DASHBOARD_PAGE)
+
+    outbox = Outbox()
+
+    def _on_job_started(job) -> None:
+        tray.begin_send()
+        _start_overlay()
+
+    def _on_job_finished(job) -> None:
+        manual = job.lane is Lane.MANUAL
+        result = None
+        if job.status is JobStatus.SENT:
+            result = TrayState.SENT
+            activity.append(f"{'Sent' if manual else 'Auto-sent'}: {job.text[:60]}")
+            if manual:
+                tray.notify("Biome", "Clipboard sent.")
+            dashboard = _dashboard()
+            if dashboard is not None:
+                dashboard.set_last_sent(job.text)
+            reconciler.set_online(True)
+            reconciler.set_authorized(True)
+            if reconciler.progress.pending and not reconciler.running:
+                reconciler.kick()
+        elif job.status in (JobStatus.SPILLED, JobStatus.FAILED):
+            result = TrayState.ERROR
+            queued = " — queued in outbox" if job.status is JobStatus.SPILLED else ""
+            activity.append(f"Send failed: {job.error}{queued}")
+            if manual:
+                tray.notify("Biome", f"Send failed: {job.error}")
+            if job.status is JobStatus.SPILLED:
+                reconciler.kick()
+
+        if job.started_at is not None:
+            tray.end_send(result)
+        elif result is not None:
+            tray.set_state(result)     # spilled before it ever ran
+
+        if dispatcher.in_flight == 0 and dispatcher.queue_depth == 0:
+            _stop_overlay()
+        elif overlay is not None:
+            overlay.notify_progress()     # the burst is still moving
+
+    # ── re-paste from history (received clips come from the blob cache) ──
+    def _read_cached_text(digest: str) -> str | None:
+        view = blob_cache.get(digest)
+        if view is None:
+            return None
+        try:
+            return str(view, "utf-8")
+        except UnicodeDecodeError:
+            return None
+        finally:
+            view.release()
+
+    async def _copy_from_history(clip_id: int) -> None:
+        if history is None:
+            return
+        text = None
+        digest = history.metadata(clip_id).get("blob")
+        if digest:
+            text = await worker_pool.offload(_read_cached_text, digest)
+        if text is None:
+            entry = history.get(clip_id)
+            if entry is None:
+                return
+            text = entry.content
+        clipboard_watcher.suppress(text)     # already sent or received once
+        app.clipboard().setText(text)
+        activity.append(f"Copied from history: {text[:60]}")
+
+    # ── LAN transport (direct to linked devices on this network) ─────
+    lan = None
+
+    async def _store_received(text: str) -> None:
+        digest = None
+        try:
+            digest = await worker_pool.offload(blob_cache.put, text.encode("utf-8"))
+        except OSError as exc:
+            logger.warning("Could not cache a received clip: %s", exc)
+        payload = classifier.classify(text)
+        if history is not None and payload is not None:
+            if digest is not None:
+                payload.metadata["blob"] = digest     # exact bytes for re-paste
+            clip_id = history.add(payload)
+            if window is not None:
+                from ui.main_window import HISTORY_PAGE
+                history_page = window.built_page(HISTORY_PAGE)
+                if history_page is not None:
+                    history_page.clip_added(clip_id)
+
+    def _on_lan_clip(text: str, metadata: dict, device: str) -> None:
+        clipboard_watcher.suppress(text)     # don't send it straight back
+        app.clipboard().setText(text)
+        activity.append(f"Received from {device} over LAN: {text[:60]}")
+        loop.create_task(_store_received(text))
+
+    if settings.get("lan_enabled", False):
+        from e2e.keys import Keyring
+        from lan.transport import LanTransport
+        lan_keyring = Keyring()
+        lan = LanTransport(
+            device_id=settings.get("device_id") or platform.node(),
+            group_key=lan_keyring.get_or_create(settings.get("e2e_group", "default")),
+            keyring=lan_keyring,
+            port=int(settings.get("lan_port", 47318)),
+            discovery_port=int(settings.get("lan_discovery_port", 47317)),
+            static_peers=settings.get("lan_peers") or (),
+            seal=bool(settings.get("e2e_enabled", False)),
+            on_clip=_on_lan_clip,
+        )
+
+    async def _start_lan() -> None:
+        nonlocal lan
+        try:
+            await lan.start()
+        except OSError as exc:
+            logger.warning("LAN transport disabled: %s", exc)
+            lan = None
+
+    from api.delta import DeltaClient
+    delta_client = DeltaClient(api_client)
+    encrypting_client = None
+
+    async def _send_clip(text: str, metadata: dict | None = None, *,
+                         idempotency_key: str | None = None) -> dict:
+        # read per send so toggling E2E in Settings takes effect at once
+        nonlocal encrypting_client
+        if lan is not None:
+            # shared with the API path when the LAN cannot reach everyone
+            idempotency_key = idempotency_key or uuid.uuid4().hex
+            reply = await lan.send_clip(
+                text, metadata=metadata, idempotency_key=idempotency_key,
+                recipients=[d.id for d in device_registry.others()],
+            )
+            if reply is not None:
+                return reply     # every device it was meant for has it
+        if not settings.get("e2e_enabled", False):
+            client = delta_client if settings.get("delta_uploads", True) else api_client
+            return await client.send_clip(text, metadata=metadata, idempotency_key=idempotency_key)
+        if encrypting_client is None:
+            from e2e.client import EncryptingClient
+            from e2e.keys import Keyring
+            encrypting_client = EncryptingClient(
+                api_client, Keyring(), settings.get("e2e_group", "default"),
+            )
+        return await encrypting_client.send_clip(text, metadata=metadata, idempotency_key=idempotency_key)
+
+    async def _send_batch(entries: list[dict]) -> list[dict] | None:
+        if settings.get("e2e_enabled", False):
+            return None      # encrypted clips are replayed one by one
+        return await api_client.send_batch(entries)
+
+    # ── outbox replay ────────────────────────────────────────────────
+    from outbox.reconcile import OutboxReconciler
+
+    def _on_outbox_progress(progress) -> None:
+        tray.set_outbox_depth(progress.pending)
+        if window is None:
+            return
+        from ui.main_window import DASHBOARD_PAGE, SETTINGS_PAGE
+        for index in (DASHBOARD_PAGE, SETTINGS_PAGE):
+            page = window.built_page(index)
+            if page is not None:
+                page.set_outbox_progress(progress)
+
+    reconciler = OutboxReconciler(
+        _send_clip,
+        outbox=outbox,
+        send_batch=_send_batch,
+        health=api_client.health_check,
+        parallelism=int(settings.get("outbox_parallelism", 4)),
+        batch_size=int(settings.get("outbox_batch_size", 50)),
+        on_progress=_on_outbox_progress,
+    )
+    app.aboutToQuit.connect(reconciler.close)
+
+    dispatcher = DispatchScheduler(
+        _send_clip,
+        outbox=outbox,
+        max_in_flight=int(settings.get("dispatch_max_in_flight", 4)),
+        max_queued=int(settings.get("dispatch_max_queued", 64)),
+        on_started=_on_job_started,
+        on_finished=_on_job_finished,
+    )
+    app.aboutToQuit.connect(dispatcher.close)
+    tray.set_outbox_depth(reconciler.progress.pending)
+
+    from metrics import registry as metrics
+    metrics.gauge("dispatch_queue_depth", "Jobs waiting to be sent", fn=lambda: dispatcher.queue_depth)
+    metrics.gauge("dispatch_in_flight", "Sends currently running", fn=lambda: dispatcher.in_flight)
+    metrics.gauge("outbox_pending", "Items waiting in the offline outbox",
+                  fn=lambda: reconciler.progress.pending)
+    metrics.gauge("delta_bytes_saved", "Upload bytes saved by delta encoding",
+                  fn=lambda: delta_client.stats.bytes_saved)
+
     # Send from tray menu
     def _on_tray_send() -> None:
         cb = app.clipboard()
@@ -91,36 +433,72 @@ def run() -> None:
         if not text or not text.strip():
             tray.notify("Biome", "Clipboard is empty.")
             return
-
-        async def _dispatch() -> None:
-            tray.set_state(TrayState.SENDING)
-            if settings.get("speedboost_enabled", True):
-                overlay.start()
-            try:
-                await api_client.send_clip(text)
-                tray.set_state(TrayState.SENT)
-                tray.notify("Biome", "Clipboard sent.")
-                window.dashboard_page.log_activity(f"Sent: {text[:60]}…")
-            except Exception as exc:
-                logger.exception("Tray send failed: %s", exc)
-                tray.set_state(TrayState.ERROR)
-                tray.notify("Biome", f"Send failed: {exc}")
-            finally:
-                overlay.stop()
-                # return to idle after a brief pause
-                from PySide6.QtCore import QTimer
-                QTimer.singleShot(2000, lambda: tray.set_state(TrayState.IDLE))
-
-        asyncio.get_event_loop().create_task(_dispatch())
+        dispatcher.submit(text, metadata=target_metadata(None, tray.targets))
 
     tray.send_requested.connect(_on_tray_send)
 
+    # ── forwarded commands (second launches / initial command) ───────
+    def _handle_command(cmd: str, args: dict) -> dict:
+        if cmd == "show":
+            _on_tray_show()
+            return {"ok": True}
+        if cmd == "status":
+            return {
+                "ok": True,
+                "running": True,
+                "pid": os.getpid(),
+                "state": tray.state.name.lower(),
+                "connected": connection_ok,
+                "dispatch": asdict(dispatcher.metrics()),
+                "outbox": asdict(reconciler.progress),
+                "endpoints": (
+                    [asdict(e) for e in api_client.endpoints]
+                    if isinstance(api_client, FailoverClient) else None
+                ),
+                "lan": (
+                    {"port": lan.port, "peers": [asdict(p) for p in lan.peers()]}
+                    if lan is not None else None
+                ),
+                "devices": device_registry.status(),
+                "targets": tray.targets,
+                "blob_cache": asdict(blob_cache.stats()),
+                "delta": {**asdict(delta_client.stats), "bytes_saved": delta_client.stats.bytes_saved},
+                "stalls": stall_watchdog.summary() if stall_watchdog.enabled else None,
+                "window_visible": bool(window is not None and window.isVisible()),
+            }
+        if cmd == "send-file":
+            try:
+                with open(args.get("path", ""), "r", encoding="utf-8") as f:
+                    args = {"text": f.read(), "targets": args.get("targets")}
+            except (OSError, UnicodeDecodeError) as exc:
+                return {"ok": False, "error": f"cannot read file: {exc}"}
+            cmd = "send"
+        if cmd == "send":
+            text = args.get("text") or ""
+            if not text.strip():
+                return {"ok": False, "error": "nothing to send"}
+            targets = args.get("targets")
+            job = dispatcher.submit(
+                text, metadata=target_metadata(None, tray.targets if targets is None else targets),
+            )
+            return {"ok": True, "queued": True, "job": job.id, "status": job.status.name.lower()}
+        return {"ok": False, "error": f"unsupported command {cmd!r}"}
+
     # ── clipboard auto-send wiring ───────────────────────────────────
+    profiler.begin("wiring")
     def _on_clipboard_captured(text: str) -> None:
         payload = classifier.classify(text)
         if payload is None:
             return
 
+        if history is not None:
+            clip_id = history.add(payload)
+            if window is not None:
+                from ui.main_window import HISTORY_PAGE
+                history_page = window.built_page(HISTORY_PAGE)
+                if history_page is not None:
+                    history_page.clip_added(clip_id)
+
         from payloads.classifier import PayloadKind
         auto_send = False
         if payload.kind == PayloadKind.TEXT and settings.get("auto_send_text"):
@@ -129,55 +507,65 @@ def run() -> None:
             auto_send = True
 
         if auto_send:
-
-            async def _auto() -> None:
-                tray.set_state(TrayState.SENDING)
-                if settings.get("speedboost_enabled", True):
-                    overlay.start()
-                try:
-                    await api_client.send_clip(text)
-                    tray.set_state(TrayState.SENT)
-                    window.dashboard_page.log_activity(f"Auto-sent: {text[:60]}")
-                except Exception as exc:
-                    logger.exception("Auto-send failed: %s", exc)
-                    tray.set_state(TrayState.ERROR)
-                finally:
-                    overlay.stop()
-                    from PySide6.QtCore import QTimer
-                    QTimer.singleShot(2000, lambda: tray.set_state(TrayState.IDLE))
-
-            asyncio.get_event_loop().create_task(_auto())
+            dispatcher.submit(text, lane=Lane.AUTO, metadata=target_metadata(None, tray.targets))
         else:
             tray.set_state(TrayState.WAITING)
-            window.dashboard_page.log_activity(f"Clipboard captured: {text[:60]}")
+            activity.append(f"Clipboard captured: {text[:60]}")
 
     clipboard_watcher.text_captured.connect(_on_clipboard_captured)
 
     # ── health check on startup ──────────────────────────────────────
     async def _initial_health() -> None:
+        nonlocal connection_ok
         ok = await api_client.health_check()
-        window.dashboard_page.set_connection_status(ok)
+        connection_ok = ok
+        if window is not None:
+            from ui.main_window import DASHBOARD_PAGE
+            dashboard = window.built_page(DASHBOARD_PAGE)
+            if dashboard is not None:
+                dashboard.set_connection_status(ok)
         if ok:
-            window.dashboard_page.log_activity("Backend connected.")
+            activity.append("Backend connected.")
         else:
-            window.dashboard_page.log_activity("Backend unreachable — payloads will queue locally.")
+            activity.append("Backend unreachable — payloads will queue locally.")
+        if reconciler.progress.pending:
+            reconciler.kick()     # pauses and probes by itself while offline
+        if ok:
+            device_registry.refresh_soon()
 
     # ── launch ───────────────────────────────────────────────────────
+    profiler.begin("show")
     clipboard_watcher.start()
     tray.show()
-    window.show()
+    start_minimized = "--minimized" in sys.argv[1:] or settings.get("start_minimized", False)
+    if not start_minimized:
+        _ensure_window().show()
+
+    def _on_interactive() -> None:
+        profiler.mark_interactive()
+        profiler.emit()
+        if profiler.exit_when_interactive:
+            app.quit()
 
     with loop:
+        if initial_command is not None:
+            loop.call_soon(_handle_command, *initial_command)
+        if profiler.enabled:
+            loop.call_soon(_on_interactive)
+        loop.call_soon(stall_watchdog.start, loop)
+        metrics_export.start()
         loop.create_task(_initial_health())
+        if lan is not None:
+            loop.create_task(_start_lan())
+        if isinstance(api_client, FailoverClient):
+            loop.call_soon(api_client.start_probing)
+            app.aboutToQuit.connect(api_client.stop_probing)
         loop.run_forever()
 
 
 def _configure_logging() -> None:
     if logging.getLogger().handlers:
         return
-    level_name = os.environ.get("BIOME_LOG_LEVEL", "INFO").upper()
-    level = getattr(logging, level_name, logging.INFO)
-    logging.basicConfig(
-        level=level,
-        format="%(asctime)s | %(levelname)-7s | %(name)s | %(message)s",
-    )
+    from diagnostics import logs
+    # stopped (and flushed) at interpreter exit, after aboutToQuit handlers log
+    logs.configure(default_file="biome.log").start()
@@ -0,0 +1,101 @@
+"""Benchmark the Dashboard activity log under a 10k events/sec storm.
+
+Usage::
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_activity_log.py [--rate 10000] [--seconds 5] [--legacy]
+
+Drives ``DashboardPage.log_activity`` from a 1 ms timer at ``--rate``
+events/sec while a 16 ms probe timer measures how late the GUI thread
+services it.  ``--legacy`` swaps in the old QListWidget insert/trim
+logic for a before/after comparison.  A responsive GUI keeps probe
+lateness well under one frame.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QTimer  # noqa: E402
+from PySide6.QtWidgets import QApplication, QListWidget, QListWidgetItem  # noqa: E402
+
+from ui.pages.dashboard import DashboardPage  # noqa: E402
+
+
+def _legacy_logger(page: DashboardPage):
+    widget = QListWidget()
+    page._activity_list.parentWidget().layout().replaceWidget(page._activity_list, widget)
+    page._activity_list.hide()
+
+    def log(message: str) -> None:
+        ts = datetime.now().strftime("%H:%M:%S")
+        widget.insertItem(0, QListWidgetItem(f"[{ts}]  {message}"))
+        while widget.count() > 200:
+            widget.takeItem(widget.count() - 1)
+
+    return log
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rate", type=int, default=10_000)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--legacy", action="store_true")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    page = DashboardPage()
+    page.resize(900, 640)
+    page.show()
+    log = _legacy_logger(page) if args.legacy else page.log_activity
+    app.processEvents()
+
+    per_tick = max(1, args.rate // 1000)
+    sent = 0
+    lateness: list[float] = []
+    last_probe = time.perf_counter()
+    start = time.perf_counter()
+
+    def producer() -> None:
+        nonlocal sent
+        for _ in range(per_tick):
+            log(f"Auto-sent: clip {sent}")
+            sent += 1
+
+    def probe() -> None:
+        nonlocal last_probe
+        now = time.perf_counter()
+        lateness.append(max(0.0, (now - last_probe) * 1000 - 16))
+        last_probe = now
+        if now - start >= args.seconds:
+            app.quit()
+
+    prod_timer = QTimer()
+    prod_timer.setInterval(1)
+    prod_timer.timeout.connect(producer)
+    probe_timer = QTimer()
+    probe_timer.setInterval(16)
+    probe_timer.timeout.connect(probe)
+    prod_timer.start()
+    probe_timer.start()
+    app.exec()
+
+    elapsed = time.perf_counter() - start
+    lateness.sort()
+    print(f"mode                {'legacy QListWidget' if args.legacy else 'ring-buffer model'}")
+    print(f"events logged       {sent:,} ({sent / elapsed:,.0f}/s)")
+    print(f"probe late median   {statistics.median(lateness):.2f} ms")
+    print(f"probe late p99      {lateness[int(len(lateness) * 0.99)]:.2f} ms")
+    print(f"probe late max      {lateness[-1]:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Bytes on the wire and CPU cost of delta uploads.
+
+Usage::
+
+    python benchmarks/bench_delta.py [--kb 512] [--runs 5]
+
+Builds a ``--kb`` KiB line-oriented document, remembers it as an
+acknowledged base, then encodes a set of typical successive edits
+(one line changed, a paragraph inserted, text appended, a block moved)
+plus an unrelated document.  For each it reports the full size, the
+delta size (or ``null`` when a full upload is chosen), the encode time
+including base selection, and the time to apply the delta.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from payloads.delta import DeltaEncoder, apply_delta  # noqa: E402
+
+
+def _document(kb: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    words = ["clip", "biome", "sync", "payload", "device", "queue", "delta", "server", "token", "cache"]
+    lines, size = [], 0
+    while size < kb * 1024:
+        line = " ".join(rng.choice(words) for _ in range(rng.randint(4, 14))) + f" #{len(lines)}"
+        lines.append(line)
+        size += len(line) + 1
+    return lines
+
+
+def _edits(lines: list[str]) -> dict[str, list[str]]:
+    mid = len(lines) // 2
+    inserted = lines[:mid] + [f"inserted paragraph line {i}" for i in range(20)] + lines[mid:]
+    moved = lines[:10] + lines[mid:mid + 50] + lines[10:mid] + lines[mid + 50:]
+    return {
+        "one_line_changed": lines[:mid] + ["this line was edited"] + lines[mid + 1:],
+        "paragraph_inserted": inserted,
+        "appended": lines + ["appended at the end"] * 5,
+        "block_moved": moved,
+        "unrelated": _document(len("\n".join(lines)) // 1024, seed=99),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--kb", type=int, default=512)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    base_lines = _document(args.kb, seed=1)
+    base = "\n".join(base_lines).encode()
+    encoder = DeltaEncoder()
+    encoder.remember(base)
+
+    results = {}
+    for name, lines in _edits(base_lines).items():
+        target = "\n".join(lines).encode()
+        encode_times, result = [], None
+        for _ in range(args.runs):
+            t0 = time.perf_counter()
+            result = encoder.encode(target)
+            encode_times.append(time.perf_counter() - t0)
+        entry = {
+            "full_bytes": len(target),
+            "delta_bytes": len(result.delta) if result else None,
+            "encode_ms": round(statistics.median(encode_times) * 1000, 2),
+        }
+        if result is not None:
+            t0 = time.perf_counter()
+            assert apply_delta(base, result.delta) == target
+            entry["apply_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+            entry["saved_pct"] = round(100 * result.bytes_saved / len(target), 2)
+        results[name] = entry
+    print(json.dumps({"base_kb": len(base) // 1024, "edits": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
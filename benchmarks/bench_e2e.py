@@ -0,0 +1,89 @@
+"""Throughput and memory of the BME1 streaming encryption.
+
+Usage::
+
+    python benchmarks/bench_e2e.py [--mb 64] [--chunk-kb 64] [--runs 3]
+
+Encrypts and decrypts a ``--mb`` MiB payload chunk by chunk (as the
+send path does) and reports MB/s for each direction, plus peak Python
+heap (tracemalloc) and process peak RSS.  For comparison it also seals
+the payload with a single one-shot AES-GCM call, which needs the whole
+ciphertext in memory next to the plaintext.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from e2e.keys import key_id_for  # noqa: E402
+from e2e.stream import iter_decrypt, iter_encrypt  # noqa: E402
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 if sys.platform != "darwin" else peak / 2**20
+
+
+def _timed(fn, runs: int) -> tuple[float, int]:
+    times, peaks = [], []
+    for _ in range(runs):
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return statistics.median(times), max(peaks)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mb", type=int, default=64)
+    parser.add_argument("--chunk-kb", type=int, default=64)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    key = os.urandom(32)
+    key_id = key_id_for(key)
+    data = os.urandom(1024 * 1024) * args.mb
+    chunk = args.chunk_kb * 1024
+    sealed: list[bytes] = list(iter_encrypt(key, key_id, data, chunk))   # decrypt input
+
+    def encrypt_streaming() -> None:
+        for _ in iter_encrypt(key, key_id, data, chunk):
+            pass    # each sealed chunk is handed to the socket and dropped
+
+    def decrypt_streaming() -> None:
+        for _ in iter_decrypt(iter(sealed), lambda kid: key):
+            pass
+
+    def encrypt_one_shot() -> None:
+        from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+        AESGCM(key).encrypt(os.urandom(12), data, None)
+
+    rss_before = _peak_rss_mb()
+    result = {"payload_mb": args.mb, "chunk_kb": args.chunk_kb}
+    for name, fn in (("encrypt_stream", encrypt_streaming),
+                     ("decrypt_stream", decrypt_streaming),
+                     ("encrypt_one_shot", encrypt_one_shot)):
+        seconds, heap_peak = _timed(fn, args.runs)
+        result[name] = {
+            "mb_per_s": round(args.mb / seconds, 1),
+            "peak_heap_mb": round(heap_peak / 2**20, 2),
+        }
+    result["peak_rss_mb"] = {"before": round(rss_before, 1), "after": round(_peak_rss_mb(), 1)}
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
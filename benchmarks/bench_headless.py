@@ -0,0 +1,141 @@
+"""Compare the headless sender with the GUI send path.
+
+Usage::
+
+    python benchmarks/bench_headless.py [--clips 2000] [--runs 5]
+
+1. Import time: median wall time of ``python -c "import cli"`` versus
+   importing the GUI send path (``app`` + PySide6 widgets + qasync),
+   each minus a bare interpreter start.
+2. Throughput: clips/sec posting to a stdlib loopback HTTP server —
+   ``cli.HeadlessSender`` at concurrency 1 and 8, and the GUI's one
+   ``send_clip`` at a time under a qasync loop (skipped when PySide6 or
+   qasync are not installed).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+GUI_IMPORTS = "import app, qasync, api.client; from PySide6.QtWidgets import QApplication"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive, like the real backend
+
+    def do_POST(self) -> None:  # noqa: N802
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = b'{"id":"bench","status":"queued"}'
+        self.send_response(201)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def _import_ms(code: str, runs: int) -> float:
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, check=True)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def _clips(n: int) -> list[tuple[str, dict]]:
+    return [(f"build-{i:06d}.log: " + "x" * 200, {}) for i in range(n)]
+
+
+def _bench_headless(url: str, n: int, concurrency: int) -> float:
+    from api.client import BiomeApiClient
+    from cli import HeadlessSender
+
+    async def go() -> float:
+        client = BiomeApiClient(url)
+        sender = HeadlessSender(client, None, concurrency=concurrency)
+        try:
+            stats = await sender.send_many(_clips(n))
+        finally:
+            await client.close()
+        assert stats.sent == n, stats
+        return stats.clips_per_sec
+
+    return asyncio.run(go())
+
+
+def _bench_gui(url: str, n: int) -> float | None:
+    try:
+        import qasync
+        from PySide6.QtWidgets import QApplication
+    except ImportError:
+        return None
+    from api.client import BiomeApiClient
+
+    app = QApplication.instance() or QApplication([])
+    loop = qasync.QEventLoop(app)
+    client = BiomeApiClient(url)
+
+    async def go() -> float:
+        started = time.perf_counter()
+        for text, _ in _clips(n):
+            await client.send_clip(text)
+        elapsed = time.perf_counter() - started
+        await client.close()
+        return round(n / elapsed, 1)
+
+    with loop:
+        return loop.run_until_complete(go())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clips", type=int, default=2000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    baseline = _import_ms("pass", args.runs)
+    results: dict = {
+        "import_ms": {
+            "headless": round(_import_ms("import cli", args.runs) - baseline, 1),
+        },
+    }
+    try:
+        results["import_ms"]["gui"] = round(_import_ms(GUI_IMPORTS, args.runs) - baseline, 1)
+    except subprocess.CalledProcessError:
+        results["import_ms"]["gui"] = None
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        results["clips_per_sec"] = {
+            "headless_c1": round(_bench_headless(url, args.clips, 1), 1),
+            "headless_c8": round(_bench_headless(url, args.clips, 8), 1),
+            "gui_sequential": _bench_gui(url, args.clips),
+        }
+    finally:
+        server.shutdown()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
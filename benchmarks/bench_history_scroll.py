@@ -0,0 +1,76 @@
+"""Benchmark History page scrolling over a large history (offscreen).
+
+Usage::
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_history_scroll.py [--clips 100000]
+
+Populates a temp history, then scrolls the list from top to bottom in
+viewport-sized steps, forcing a repaint per step.  Reports per-frame
+paint time and how many pages / previews the model and delegate hold at
+the end, which should stay constant regardless of ``--clips``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+from bench_history_search import _populate  # noqa: E402
+from history.search import HistorySearcher  # noqa: E402
+from history.store import HistoryStore  # noqa: E402
+from ui.pages.history import HistoryPage  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clips", type=int, default=100_000)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = HistoryStore(Path(tmp) / "history.db")
+        store.open()
+        _populate(store, args.clips)
+
+        page = HistoryPage()
+        page.resize(900, 640)
+        page.set_history(store, HistorySearcher(store.path))
+        page.show()
+        app.processEvents()
+
+        view = page._list
+        bar = view.verticalScrollBar()
+        frames: list[float] = []
+        t_start = time.perf_counter()
+        while True:
+            t0 = time.perf_counter()
+            bar.setValue(bar.value() + view.viewport().height())
+            view.viewport().repaint()
+            app.processEvents()
+            frames.append((time.perf_counter() - t0) * 1000)
+            if bar.value() >= bar.maximum() and not page._model.canFetchMore():
+                break
+
+        model = page._model
+        delegate = view.itemDelegate()
+        print(f"rows scrolled       {model.rowCount():,} in {time.perf_counter() - t_start:.1f}s")
+        print(f"frames              {len(frames):,}")
+        print(f"frame time median   {statistics.median(frames):.2f} ms")
+        print(f"frame time p99      {sorted(frames)[int(len(frames) * 0.99)]:.2f} ms")
+        print(f"cached pages        {len(model._pages)}")
+        print(f"cached previews     {len(delegate._previews)}")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
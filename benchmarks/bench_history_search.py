@@ -0,0 +1,105 @@
+"""Benchmark history search latency on a synthetic 100k-clip history.
+
+Usage::
+
+    python benchmarks/bench_history_search.py [--clips 100000]
+
+Builds a throwaway database in a temp dir, then times representative
+queries (substring, fuzzy, short, filtered) through ``run_query``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import string
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from history.search import SearchQuery, run_query  # noqa: E402
+from history.store import HistoryStore, connect  # noqa: E402
+from payloads.classifier import PayloadClassifier  # noqa: E402
+
+_WORDS = [
+    "git", "commit", "docker", "run", "kubectl", "apply", "select", "from",
+    "where", "import", "numpy", "config", "server", "deploy", "token",
+    "password", "release", "branch", "merge", "python", "biome", "clip",
+]
+_DOMAINS = ["github.com", "docs.python.org", "example.com", "stackoverflow.com"]
+
+
+def _synthetic_clip(rng: random.Random) -> str:
+    if rng.random() < 0.2:
+        slug = "".join(rng.choices(string.ascii_lowercase, k=10))
+        return f"https://{rng.choice(_DOMAINS)}/{slug}"
+    n = rng.randint(3, 60)
+    return " ".join(rng.choice(_WORDS) for _ in range(n))
+
+
+def _populate(store: HistoryStore, clips: int) -> None:
+    rng = random.Random(42)
+    classifier = PayloadClassifier()
+    conn = store._require()
+    conn.execute("BEGIN")
+    for i in range(clips):
+        payload = classifier.classify(_synthetic_clip(rng))
+        if payload is None:
+            continue
+        # bypass per-insert commit for a fast setup
+        meta = dict(payload.metadata)
+        conn.execute(
+            "INSERT INTO clips (created_at, kind, content, domain, length, metadata)"
+            " VALUES (?, ?, ?, ?, ?, NULL)",
+            (float(i), payload.kind.name.lower(), payload.data,
+             meta.get("domain"), meta["length"]),
+        )
+    conn.execute("COMMIT")
+
+
+def _time(conn, query: SearchQuery, repeat: int = 20) -> tuple[float, float, int]:
+    samples = []
+    hits = 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = run_query(conn, query)
+        samples.append((time.perf_counter() - t0) * 1000)
+        hits = len(result.entries)
+    return statistics.median(samples), max(samples), hits
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clips", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "history.db"
+        store = HistoryStore(path)
+        store.open()
+        t0 = time.perf_counter()
+        _populate(store, args.clips)
+        print(f"populated {store.count()} clips in {time.perf_counter() - t0:.1f}s")
+
+        conn = connect(path, readonly=True)
+        queries = {
+            "substring 'kubectl apply'": SearchQuery(text="kubectl apply"),
+            "substring rare 'merge biome clip'": SearchQuery(text="merge biome clip"),
+            "fuzzy 'kubectl aplpy'": SearchQuery(text="kubectl aplpy"),
+            "short 'gi'": SearchQuery(text="gi"),
+            "kind=url domain=github.com": SearchQuery(kinds=frozenset({"url"}), domain="github.com"),
+            "substring + length<=40": SearchQuery(text="docker", max_length=40),
+        }
+        for name, query in queries.items():
+            median, worst, hits = _time(conn, query)
+            print(f"{name:<36} median {median:6.2f} ms  max {worst:6.2f} ms  hits {hits}")
+        conn.close()
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
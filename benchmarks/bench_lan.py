@@ -0,0 +1,150 @@
+"""Send latency of the LAN transport against the HTTP API path.
+
+Usage::
+
+    python benchmarks/bench_lan.py [--sends 200] [--api-url URL]
+
+Starts two ``LanTransport`` instances on loopback sharing a group key,
+measures how long discovery takes, then times ``send_clip`` for a few
+clip sizes.  The same clips are then sent with ``BiomeApiClient``, to
+``--api-url`` when given (a real backend: Cloud Storage, Firestore and
+FCM included) or else to a stub HTTP server on loopback, which is the
+floor for the HTTP path.  Reports median and p95 per size in ms.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from e2e.keys import Keyring  # noqa: E402
+from lan.transport import LanTransport  # noqa: E402
+
+SIZES = {"100B": 100, "10KiB": 10 * 1024, "1MiB": 1024 * 1024}
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _reply(self, status: int, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:  # noqa: N802
+        self._reply(200, b'{"ok":true}')
+
+    def do_POST(self) -> None:  # noqa: N802
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._reply(201, b'{"id":"bench","kind":"text"}')
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def _summary(samples: list[float]) -> dict[str, float]:
+    samples = sorted(samples)
+    return {
+        "median_ms": round(statistics.median(samples) * 1000, 3),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1] * 1000, 3),
+    }
+
+
+async def _time_sends(send, text: str, count: int) -> list[float]:
+    times = []
+    for _ in range(count):
+        t0 = time.perf_counter()
+        await send(text)
+        times.append(time.perf_counter() - t0)
+    return times
+
+
+async def _bench_lan(sends: int) -> dict:
+    root = Path(tempfile.mkdtemp())
+    sender_keys, receiver_keys = Keyring(root / "a"), Keyring(root / "b")
+    sender_keys.get_or_create("bench")
+    receiver_keys.import_key("bench", sender_keys.export_key("bench"))
+    received = 0
+
+    def on_clip(text, metadata, device) -> None:
+        nonlocal received
+        received += 1
+
+    a = LanTransport(device_id="bench-a", group_key=sender_keys.get("bench"), host="127.0.0.1", port=0,
+                     discovery_port=47611, discovery_targets=["127.0.0.1:47612"], discovery_interval=0.5)
+    b = LanTransport(device_id="bench-b", group_key=receiver_keys.get("bench"), host="127.0.0.1", port=0,
+                     discovery_port=47612, discovery_targets=["127.0.0.1:47611"], discovery_interval=0.5,
+                     on_clip=on_clip)
+    await b.start()
+    t0 = time.perf_counter()
+    await a.start()
+    while not a.peers():
+        await asyncio.sleep(0.001)
+    discovery_ms = round((time.perf_counter() - t0) * 1000, 2)
+
+    async def send(text: str) -> None:
+        if await a.send_clip(text, recipients=["bench-b"]) is None:
+            raise RuntimeError("LAN send fell back")
+
+    result = {"discovery_ms": discovery_ms}
+    try:
+        for name, size in SIZES.items():
+            result[name] = _summary(await _time_sends(send, "x" * size, sends))
+    finally:
+        await a.close()
+        await b.close()
+    assert received == sends * len(SIZES), received
+    return result
+
+
+async def _bench_http(sends: int, api_url: str | None) -> dict | None:
+    try:
+        from api.client import BiomeApiClient
+    except ImportError as exc:
+        return {"skipped": f"HTTP client unavailable: {exc}"}
+    server = None
+    if api_url is None:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        api_url = f"http://127.0.0.1:{server.server_address[1]}"
+    client = BiomeApiClient(api_url)
+
+    async def send(text: str) -> None:
+        await client.send_clip(text)
+
+    result = {"target": "stub" if server is not None else api_url}
+    try:
+        for name, size in SIZES.items():
+            result[name] = _summary(await _time_sends(send, "x" * size, sends))
+    finally:
+        await client.close()
+        if server is not None:
+            server.shutdown()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sends", type=int, default=200)
+    parser.add_argument("--api-url", default=None)
+    args = parser.parse_args()
+
+    lan = asyncio.run(_bench_lan(args.sends))
+    http = asyncio.run(_bench_http(args.sends, args.api_url))
+    print(json.dumps({"sends_per_size": args.sends, "lan": lan, "http": http}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
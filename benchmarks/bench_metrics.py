@@ -0,0 +1,96 @@
+"""Cost of recording metrics on the hot path.
+
+Usage::
+
+    python benchmarks/bench_metrics.py [--ops 1000000] [--threads 4]
+
+Compares a per-thread-cell ``Counter.inc`` against a counter guarded by
+a ``threading.Lock``, single-threaded and with ``--threads`` threads
+incrementing at once, then times ``Histogram.observe`` and a full
+Prometheus render of a registry shaped like the app's.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from metrics.registry import Registry  # noqa: E402
+
+
+class LockedCounter:
+    def __init__(self) -> None:
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+
+def _ns_per_op(fn, ops: int, threads: int) -> float:
+    per_thread = ops // threads
+    barrier = threading.Barrier(threads + 1)
+
+    def run() -> None:
+        barrier.wait()
+        for _ in range(per_thread):
+            fn()
+
+    workers = [threading.Thread(target=run) for _ in range(threads)]
+    for w in workers:
+        w.start()
+    barrier.wait()
+    t0 = time.perf_counter()
+    for w in workers:
+        w.join()
+    return (time.perf_counter() - t0) * 1e9 / (per_thread * threads)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ops", type=int, default=1_000_000)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    registry = Registry()
+    counter = registry.counter("bench", "bench").labels()
+    labelled = registry.counter("bench_labelled", "bench", ("endpoint", "outcome"))
+    locked = LockedCounter()
+    histogram = registry.histogram("bench_seconds", "bench").labels()
+    samples = [random.expovariate(20) for _ in range(1024)]
+    it = iter(samples * (args.ops // len(samples) + 1))
+
+    results = {}
+    for threads in (1, args.threads):
+        results[f"threads_{threads}"] = {
+            "cell_counter_ns": round(_ns_per_op(counter.inc, args.ops, threads), 1),
+            "locked_counter_ns": round(_ns_per_op(locked.inc, args.ops, threads), 1),
+            "labels_then_inc_ns": round(
+                _ns_per_op(lambda: labelled.labels("clips", "2xx").inc(), args.ops, threads), 1,
+            ),
+        }
+    results["histogram_observe_ns"] = round(_ns_per_op(lambda: histogram.observe(next(it)), args.ops, 1), 1)
+    expected = args.ops // args.threads * args.threads + args.ops
+    assert counter.value == expected, (counter.value, expected)
+
+    for i in range(5):
+        for outcome in ("2xx", "4xx", "5xx", "error"):
+            registry.counter("api_requests", "", ("endpoint", "outcome")).labels(f"e{i}", outcome).inc()
+        registry.histogram("api_request_seconds", "", ("endpoint",)).labels(f"e{i}").observe(0.1)
+    t0 = time.perf_counter()
+    text = registry.render_prometheus()
+    results["render_ms"] = round((time.perf_counter() - t0) * 1000, 3)
+    results["render_bytes"] = len(text)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Event-loop responsiveness with inline vs offloaded payload work.
+
+Usage::
+
+    python benchmarks/bench_offload.py [--mb 256] [--scan-kb 4096]
+
+Runs a 5 ms heartbeat on the asyncio loop (standing in for the Qt event
+loop under qasync) while processing a payload three ways, and reports
+the worst heartbeat lag and wall time for each:
+
+  - sha256 + zlib of ``--mb`` MiB: inline vs ``offload()`` (thread pool);
+  - a pure-Python secret-pattern scan over ``--scan-kb`` KiB: inline vs
+    ``offload(process=True)``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import time
+import zlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from workers import pool as worker_pool  # noqa: E402
+
+HEARTBEAT_S = 0.005
+
+
+def digest_and_compress(data: bytes) -> tuple[str, int]:
+    # both release the GIL on large buffers
+    return hashlib.sha256(data).hexdigest(), len(zlib.compress(data, 1))
+
+
+def scan(text: str) -> int:
+    # deliberately GIL-bound: character loop looking for key-like runs
+    hits = run = 0
+    for ch in text:
+        if ch.isalnum():
+            run += 1
+            if run == 32:
+                hits += 1
+        else:
+            run = 0
+    return hits
+
+
+async def _measure(work) -> dict:
+    worst = 0.0
+    stop = asyncio.Event()
+
+    async def heartbeat() -> None:
+        nonlocal worst
+        loop = asyncio.get_running_loop()
+        while not stop.is_set():
+            expected = loop.time() + HEARTBEAT_S
+            await asyncio.sleep(HEARTBEAT_S)
+            worst = max(worst, loop.time() - expected)
+
+    beat = asyncio.create_task(heartbeat())
+    await asyncio.sleep(HEARTBEAT_S * 2)
+    started = time.perf_counter()
+    await work()
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await beat
+    return {"wall_ms": round(elapsed * 1000, 1), "worst_loop_lag_ms": round(worst * 1000, 1)}
+
+
+async def _run(args: argparse.Namespace) -> dict:
+    data = os.urandom(1024 * 1024) * args.mb
+    text = os.urandom(args.scan_kb * 512).hex()
+
+    async def inline_hash() -> None:
+        digest_and_compress(data)
+
+    async def offloaded_hash() -> None:
+        await worker_pool.offload(digest_and_compress, data)
+
+    async def inline_scan() -> None:
+        scan(text)
+
+    async def offloaded_scan() -> None:
+        await worker_pool.offload(scan, text, process=True)
+
+    # warm the process pool so spawn cost is not attributed to the scan
+    await worker_pool.offload(scan, "x", process=True)
+
+    return {
+        "cpus": worker_pool.cpu_count(),
+        "hash_inline": await _measure(inline_hash),
+        "hash_thread_pool": await _measure(offloaded_hash),
+        "scan_inline": await _measure(inline_scan),
+        "scan_process_pool": await _measure(offloaded_scan),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mb", type=int, default=256)
+    parser.add_argument("--scan-kb", type=int, default=4096)
+    args = parser.parse_args()
+    try:
+        print(json.dumps(asyncio.run(_run(args)), indent=2))
+    finally:
+        worker_pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Outbox replay concurrency with per-target lanes.
+
+Usage::
+
+    python benchmarks/bench_outbox.py [--items 200] [--devices 8] [--latency-ms 20]
+
+Queues ``--items`` clips in a temporary outbox, each targeted at one of
+``--devices`` devices, plus a broadcast every 50 items, and replays them
+with ``OutboxReconciler`` at parallelism 1 and 8 against a stub sender
+that sleeps ``--latency-ms`` per request (batching off, so every item is
+one request).  Reports wall time, peak requests in flight and whether
+each device still received its clips in queue order.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from api.devices import target_metadata  # noqa: E402
+from outbox.reconcile import OutboxReconciler  # noqa: E402
+from outbox.store import Outbox  # noqa: E402
+
+
+def _fill(outbox: Outbox, items: int, devices: int) -> None:
+    for i in range(items):
+        targets = [] if i % 50 == 49 else [f"device-{i % devices}"]
+        outbox.enqueue(f"clip {i}", target_metadata(None, targets))
+
+
+async def _replay(items: int, devices: int, latency: float, parallelism: int) -> dict:
+    outbox = Outbox(Path(tempfile.mkdtemp()))
+    _fill(outbox, items, devices)
+    in_flight = peak = 0
+    received: dict[str, list[int]] = {}
+
+    async def send(text: str, *, metadata=None, idempotency_key=None) -> dict:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(latency)
+        in_flight -= 1
+        for device in (metadata or {}).get("targetDeviceIds") or [f"device-{d}" for d in range(devices)]:
+            received.setdefault(device, []).append(int(text.split()[1]))
+        return {"id": idempotency_key}
+
+    reconciler = OutboxReconciler(send, outbox=outbox, parallelism=parallelism)
+    started = time.perf_counter()
+    progress = await reconciler.drain()
+    return {
+        "wall_ms": round((time.perf_counter() - started) * 1000, 1),
+        "peak_in_flight": peak,
+        "sent": progress.sent,
+        "ordered": all(seq == sorted(seq) for seq in received.values()),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=200)
+    parser.add_argument("--devices", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    result = {
+        f"parallelism_{p}": asyncio.run(_replay(args.items, args.devices, args.latency_ms / 1000, p))
+        for p in (1, 8)
+    }
+    print(json.dumps({"items": args.items, "devices": args.devices, **result}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
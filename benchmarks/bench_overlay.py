@@ -0,0 +1,191 @@
+"""CPU and frame time of the SpeedBoost overlay during a long send.
+
+Usage::
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_overlay.py [--seconds 60] [--legacy]
+
+Starts the overlay as a send would, keeps it running for ``--seconds``
+while reporting upload progress every ``--progress-ms`` (as the API
+client does during a long upload) and reports process CPU time, paint
+count and frame-interval percentiles.  It then simulates 20 fast (80 ms) sends and counts how
+many made the overlay visible.  ``--legacy`` swaps in the previous
+implementation (five QLabels, each with a QGraphicsOpacityEffect, driven
+by a looping QSequentialAnimationGroup) for a before/after comparison.
+
+Pass ``--progress-ms 0 --stall-after-ms 2000`` for a quick check that
+the new overlay stops repainting on a stalled send.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import (  # noqa: E402
+    Property,
+    QEasingCurve,
+    QEvent,
+    QObject,
+    QPropertyAnimation,
+    QSequentialAnimationGroup,
+    Qt,
+    QTimer,
+)
+from PySide6.QtGui import QFont  # noqa: E402
+from PySide6.QtWidgets import (  # noqa: E402
+    QApplication,
+    QGraphicsOpacityEffect,
+    QLabel,
+    QVBoxLayout,
+    QWidget,
+)
+
+from ui import overlay as overlay_module  # noqa: E402
+
+
+class _LegacyChevron(QLabel):
+    def __init__(self, parent: QWidget) -> None:
+        super().__init__(overlay_module.CHEVRON_CHAR, parent)
+        self.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.setFont(QFont("Segoe UI", 28, QFont.Weight.Bold))
+        self._effect = QGraphicsOpacityEffect(self)
+        self._effect.setOpacity(0.15)
+        self.setGraphicsEffect(self._effect)
+
+    def _get(self) -> float:
+        return self._effect.opacity()
+
+    def _set(self, value: float) -> None:
+        self._effect.setOpacity(value)
+
+    opacity = Property(float, _get, _set)
+
+
+class _LegacyOverlay(QWidget):
+    def __init__(self) -> None:
+        super().__init__()
+        self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.Tool)
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+        self.setFixedSize(60, 5 * 48 + 20)
+        layout = QVBoxLayout(self)
+        self._chevrons = [_LegacyChevron(self) for _ in range(5)]
+        for chev in self._chevrons:
+            layout.addWidget(chev)
+        self._group: QSequentialAnimationGroup | None = None
+
+    def start(self) -> None:
+        self.show()
+        self._group = QSequentialAnimationGroup(self)
+        for chevs, duration, a, b in ((self._chevrons, 280, 0.15, 1.0),
+                                       (list(reversed(self._chevrons)), 200, 1.0, 0.15)):
+            for chev in chevs:
+                anim = QPropertyAnimation(chev, b"opacity")
+                anim.setDuration(duration)
+                anim.setStartValue(a)
+                anim.setEndValue(b)
+                anim.setEasingCurve(QEasingCurve.Type.InOutQuad)
+                self._group.addAnimation(anim)
+        self._group.setLoopCount(-1)
+        self._group.start()
+
+    def stop(self) -> None:
+        if self._group:
+            self._group.stop()
+        self.hide()
+
+
+class _PaintCounter(QObject):
+    """Records one timestamp per frame (paints of the overlay or its children)."""
+
+    def __init__(self, root: QWidget) -> None:
+        super().__init__()
+        self._root = root
+        self.frames: list[float] = []
+        self.shown = 0
+
+    def eventFilter(self, obj, event) -> bool:  # noqa: N802
+        if isinstance(obj, QWidget) and (obj is self._root or self._root.isAncestorOf(obj)):
+            if event.type() == QEvent.Type.Paint:
+                now = time.perf_counter()
+                if not self.frames or now - self.frames[-1] > 0.001:
+                    self.frames.append(now)
+            elif event.type() == QEvent.Type.Show and obj is self._root:
+                self.shown += 1
+        return False
+
+
+def _run_for(app: QApplication, ms: int) -> None:
+    QTimer.singleShot(ms, app.quit)
+    app.exec()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=60.0)
+    parser.add_argument("--legacy", action="store_true")
+    parser.add_argument("--stall-after-ms", type=int, default=None)
+    parser.add_argument("--progress-ms", type=int, default=1000)
+    args = parser.parse_args()
+
+    if args.stall_after_ms is not None:
+        overlay_module.STALL_AFTER_MS = args.stall_after_ms
+
+    app = QApplication(sys.argv)
+    widget = _LegacyOverlay() if args.legacy else overlay_module.SpeedBoostOverlay()
+    counter = _PaintCounter(widget)
+    app.installEventFilter(counter)
+
+    # ── long send ────────────────────────────────────────────────────
+    progress = QTimer()
+    progress.setInterval(args.progress_ms)
+    progress.timeout.connect(getattr(widget, "notify_progress", lambda: None))
+
+    cpu0, wall0 = time.process_time(), time.perf_counter()
+    widget.start()
+    if args.progress_ms > 0:
+        progress.start()
+    _run_for(app, int(args.seconds * 1000))
+    progress.stop()
+    widget.stop()
+    cpu, wall = time.process_time() - cpu0, time.perf_counter() - wall0
+
+    intervals = [(b - a) * 1000 for a, b in zip(counter.frames, counter.frames[1:])]
+    intervals.sort()
+
+    def pct(p: float) -> float:
+        return round(intervals[min(len(intervals) - 1, int(p / 100 * len(intervals)))], 2) if intervals else 0.0
+
+    result = {
+        "implementation": "legacy" if args.legacy else "single-painter",
+        "seconds": round(wall, 2),
+        "cpu_seconds": round(cpu, 3),
+        "cpu_percent": round(100 * cpu / wall, 2),
+        "frames": len(counter.frames),
+        "frame_interval_ms": {
+            "median": round(statistics.median(intervals), 2) if intervals else 0.0,
+            "p95": pct(95),
+            "max": round(intervals[-1], 2) if intervals else 0.0,
+        },
+    }
+
+    # ── fast sends ───────────────────────────────────────────────────
+    counter.shown = 0
+    for _ in range(20):
+        widget.start()
+        _run_for(app, 80)
+        widget.stop()
+    result["fast_sends_shown"] = f"{counter.shown}/20"
+
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Track time-to-interactive across launches.
+
+Usage::
+
+    python benchmarks/bench_startup.py [--runs 5] [--json out.json]
+
+Launches ``main.py --profile-startup=<tmp> --profile-startup-exit``
+repeatedly (offscreen QPA) and summarises the reports: median
+time-to-interactive, per-phase medians and the slowest imports of the
+last run.  ``--json`` writes the summary for CI trend tracking.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _launch(report: Path) -> dict:
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    subprocess.run(
+        [sys.executable, "main.py", f"--profile-startup={report}", "--profile-startup-exit"],
+        cwd=ROOT, env=env, check=True, timeout=120,
+    )
+    return json.loads(report.read_text(encoding="utf-8"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", type=Path, default=None)
+    args = parser.parse_args()
+
+    reports = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(args.runs):
+            reports.append(_launch(Path(tmp) / f"startup-{i}.json"))
+
+    tti = [r["time_to_interactive_ms"] for r in reports]
+    phases: dict[str, list[float]] = defaultdict(list)
+    for r in reports:
+        for p in r["phases"]:
+            phases[p["name"]].append(p["duration_ms"])
+
+    summary = {
+        "runs": args.runs,
+        "time_to_interactive_ms": statistics.median(tti),
+        "phases_ms": {name: statistics.median(v) for name, v in phases.items()},
+        "top_imports": reports[-1]["imports"][:15],
+    }
+
+    print(f"time to interactive (median of {args.runs})  {summary['time_to_interactive_ms']:.1f} ms")
+    for name, ms in summary["phases_ms"].items():
+        print(f"  {name:<20} {ms:8.1f} ms")
+    print("slowest imports (cumulative):")
+    for imp in summary["top_imports"]:
+        print(f"  {imp['module']:<40} {imp['cumulative_ms']:8.1f} ms  (self {imp['self_ms']:.1f})")
+
+    if args.json:
+        args.json.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
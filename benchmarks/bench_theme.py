@@ -0,0 +1,68 @@
+"""Measure theme application time with a cold vs warm stylesheet cache.
+
+Usage::
+
+    python benchmarks/bench_theme.py [--runs 5]
+
+Each sample is a fresh interpreter (offscreen QPA) with ``HOME`` pointed
+at a temp dir, so the first run compiles via qt-material and later runs
+load ``~/.biome/cache/theme``.  Reports import + apply time per mode.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+_CHILD = """
+import sys, time
+t0 = time.perf_counter()
+from PySide6.QtWidgets import QApplication
+app = QApplication([])
+t1 = time.perf_counter()
+from ui.theme import apply_theme
+apply_theme(app)
+print((time.perf_counter() - t1) * 1000)
+"""
+
+
+def _sample(home: str, cache: bool) -> float:
+    env = dict(os.environ)
+    env.update({
+        "HOME": home,
+        "USERPROFILE": home,
+        "QT_QPA_PLATFORM": "offscreen",
+        "BIOME_THEME_CACHE": "1" if cache else "0",
+    })
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD], cwd=ROOT, env=env,
+        check=True, capture_output=True, text=True,
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as home:
+        uncached = [_sample(home, cache=False) for _ in range(args.runs)]
+        cold = _sample(home, cache=True)
+        warm = [_sample(home, cache=True) for _ in range(args.runs)]
+
+    print(f"no cache (median)   {statistics.median(uncached):8.1f} ms")
+    print(f"cold (compile+save) {cold:8.1f} ms")
+    print(f"warm hit (median)   {statistics.median(warm):8.1f} ms")
+    print(f"saved per launch    {statistics.median(uncached) - statistics.median(warm):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
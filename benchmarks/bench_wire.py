@@ -0,0 +1,86 @@
+"""Serialization cost of the clip request body: raw vs JSON.
+
+Usage::
+
+    python benchmarks/bench_wire.py [--mb 1 16] [--runs 5]
+
+For each size, builds three texts — source code (quotes, backslashes,
+newlines), prose with non-ASCII (accents, CJK, emoji) and plain ASCII —
+and times producing the request body + headers three ways:
+
+* ``raw``: ``api.wire.raw_request`` (UTF-8 body, metadata header)
+* ``json_compact``: ``json.dumps(ensure_ascii=False)``, what recent
+  httpx versions do for ``json=``
+* ``json_ascii``: ``json.dumps()`` defaults, what older httpx does
+
+Reports median ms, body bytes and peak Python heap per encoding.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from api.wire import json_body, raw_request  # noqa: E402
+
+_SAMPLES = {
+    "code": 'def f(x):\n    return "a\\tb" + x  # \'quoted\'\n\tif {"k": [1, 2]}:\n        pass\n',
+    "non_ascii": "Grüße aus Köln — naïve café. 東京の天気は晴れ。🙂🚀 Ωμέγα.\n",
+    "ascii": "The quick brown fox jumps over the lazy dog 0123456789 times.\n",
+}
+_METADATA = {"domain": "example.com", "length": 0, "source": "clipboard"}
+
+
+def _encodings():
+    def raw(text: str) -> int:
+        body, headers = raw_request(text, _METADATA)
+        return len(body) + sum(len(v) for v in headers.values())
+
+    def json_compact(text: str) -> int:
+        return len(json.dumps(json_body(text, _METADATA), ensure_ascii=False,
+                              separators=(",", ":"), allow_nan=False).encode("utf-8"))
+
+    def json_ascii(text: str) -> int:
+        return len(json.dumps(json_body(text, _METADATA)).encode("utf-8"))
+
+    return {"raw": raw, "json_compact": json_compact, "json_ascii": json_ascii}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mb", type=int, nargs="+", default=[1, 16])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    results: dict[str, dict] = {}
+    for mb in args.mb:
+        for name, sample in _SAMPLES.items():
+            text = (sample * (mb * 2**20 // len(sample.encode()) + 1))[: mb * 2**20]
+            row = {"text_bytes": len(text.encode("utf-8"))}
+            for enc_name, fn in _encodings().items():
+                times, size, peak = [], 0, 0
+                for _ in range(args.runs):
+                    tracemalloc.start()
+                    t0 = time.perf_counter()
+                    size = fn(text)
+                    times.append(time.perf_counter() - t0)
+                    peak = max(peak, tracemalloc.get_traced_memory()[1])
+                    tracemalloc.stop()
+                row[enc_name] = {
+                    "ms": round(statistics.median(times) * 1000, 2),
+                    "bytes": size,
+                    "peak_heap_mb": round(peak / 2**20, 1),
+                }
+            results[f"{name}_{mb}mb"] = row
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
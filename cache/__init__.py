@@ -0,0 +1 @@
+"""Local on-disk caches."""
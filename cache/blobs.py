@@ -0,0 +1,345 @@
+"""Content-addressed blob cache for received payloads.
+
+Blobs live under ``~/.biome/cache/blobs/<aa>/<sha256>`` and are written
+atomically (temp file in the same directory + ``os.replace``), so a
+reader never observes a half-written blob.  An LRU index keeps the total
+size under a byte budget; it is held in memory and written back to
+``index.json`` at most every ``INDEX_SAVE_INTERVAL`` seconds and on
+``flush`` / ``close``.  A stale index only loses LRU order: on open it is
+reconciled with the blobs actually on disk.  The index is read on first
+use rather than at startup.
+
+Reads are memory-mapped: ``get`` returns a read-only ``memoryview`` over
+an ``mmap`` of the file, so large images or files can be handed to the
+clipboard or the uploader without first being copied into a Python
+``bytes`` object.  The mapping stays valid for as long as the view is
+referenced.  On Windows a mapped blob cannot be deleted; such removals
+are retried on the next eviction.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Union
+
+from metrics import registry as metrics
+
+logger = logging.getLogger(__name__)
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+INDEX_VERSION = 1
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+INDEX_SAVE_INTERVAL = 5.0
+_COPY_CHUNK = 1024 * 1024
+
+_LOOKUPS = metrics.counter("blob_cache_lookups", "Blob cache reads by result", ("result",))
+
+
+def default_cache_dir() -> Path:
+    return Path.home() / ".biome" / "cache" / "blobs"
+
+
+@dataclass
+class BlobCacheStats:
+    entries: int
+    total_bytes: int
+    max_bytes: int
+    hits: int
+    misses: int
+    bytes_served: int
+    evictions: int
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class BlobCache:
+    """Size-capped, content-addressed (SHA-256) blob store with LRU eviction."""
+
+    def __init__(self, root: Path | None = None, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self._root = root or default_cache_dir()
+        self._max_bytes = max_bytes
+        self._index_path = self._root / "index.json"
+        self._entries: OrderedDict[str, int] = OrderedDict()   # digest → size, LRU first
+        self._total = 0
+        self._lock = threading.Lock()
+        self._open_lock = threading.Lock()
+        self._opened = False
+        self._dirty = False
+        self._saved_at = 0.0                   # monotonic time of the last index write
+        self._pending_unlinks: set[str] = set()
+
+        self._hits = 0
+        self._misses = 0
+        self._bytes_served = 0
+        self._evictions = 0
+
+    # ── lifecycle ────────────────────────────────────────────────────
+
+    def open(self) -> None:
+        self._root.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self._load_index()
+            self._evict_locked(keep=None)
+            self._save_index_locked()
+        self._opened = True
+        logger.info(
+            "Blob cache opened at %s (%d blobs, %.1f MiB)",
+            self._root, len(self._entries), self._total / 2**20,
+        )
+
+    def _ensure_open(self) -> None:
+        if self._opened:
+            return
+        with self._open_lock:
+            if not self._opened:
+                self.open()
+
+    def flush(self) -> None:
+        """Persist index changes not yet written."""
+        if not self._opened:
+            return
+        with self._lock:
+            if self._dirty:
+                self._save_index_locked()
+
+    def close(self) -> None:
+        self.flush()
+
+    # ── writes ───────────────────────────────────────────────────────
+
+    def put(self, data: Buffer) -> str:
+        """Store ``data`` and return its hex SHA-256 digest."""
+        self._ensure_open()
+        view = memoryview(data).cast("B")
+        digest = hashlib.sha256(view).hexdigest()
+        if self._touch(digest):
+            return digest
+
+        path = self._path_for(digest)
+        self._write_atomic(path, lambda f: f.write(view))
+        self._commit(digest, len(view))
+        return digest
+
+    def put_file(self, src: Path) -> str:
+        """Copy ``src`` into the cache, hashing while streaming."""
+        self._ensure_open()
+        hasher = hashlib.sha256()
+        tmp = self._new_temp(self._root)
+        size = 0
+        try:
+            with open(src, "rb") as fin, os.fdopen(tmp[0], "wb") as fout:
+                while chunk := fin.read(_COPY_CHUNK):
+                    hasher.update(chunk)
+                    fout.write(chunk)
+                    size += len(chunk)
+            digest = hasher.hexdigest()
+            if self._touch(digest):
+                os.unlink(tmp[1])
+                return digest
+            path = self._path_for(digest)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp[1], path)
+        except BaseException:
+            _unlink_quiet(tmp[1])
+            raise
+        self._commit(digest, size)
+        return digest
+
+    def remove(self, digest: str) -> bool:
+        self._ensure_open()
+        with self._lock:
+            size = self._entries.pop(digest, None)
+            if size is None:
+                return False
+            self._total -= size
+            self._unlink_blob(digest)
+            self._dirty = True
+            self._maybe_save_index_locked()
+        return True
+
+    # ── reads ────────────────────────────────────────────────────────
+
+    def __contains__(self, digest: str) -> bool:
+        self._ensure_open()
+        with self._lock:
+            return digest in self._entries
+
+    def get(self, digest: str) -> Optional[memoryview]:
+        """Return a read-only mmap-backed view of the blob, or None."""
+        self._ensure_open()
+        with self._lock:
+            size = self._entries.get(digest)
+            if size is None:
+                self._misses += 1
+                _LOOKUPS.labels("miss").inc()
+                return None
+            self._entries.move_to_end(digest)
+            self._dirty = True
+
+        try:
+            view = _map_readonly(self._path_for(digest), size)
+        except OSError as exc:
+            logger.warning("Blob %s unreadable, dropping: %s", digest[:12], exc)
+            self.remove(digest)
+            with self._lock:
+                self._misses += 1
+            _LOOKUPS.labels("miss").inc()
+            return None
+
+        with self._lock:
+            self._hits += 1
+            self._bytes_served += len(view)
+        _LOOKUPS.labels("hit").inc()
+        return view
+
+    def stats(self) -> BlobCacheStats:
+        self._ensure_open()     # report what is on disk, not an unread index
+        with self._lock:
+            return BlobCacheStats(
+                entries=len(self._entries),
+                total_bytes=self._total,
+                max_bytes=self._max_bytes,
+                hits=self._hits,
+                misses=self._misses,
+                bytes_served=self._bytes_served,
+                evictions=self._evictions,
+            )
+
+    # ── private ──────────────────────────────────────────────────────
+
+    def _path_for(self, digest: str) -> Path:
+        return self._root / digest[:2] / digest
+
+    def _touch(self, digest: str) -> bool:
+        with self._lock:
+            if digest in self._entries:
+                self._entries.move_to_end(digest)
+                self._dirty = True
+                return True
+        return False
+
+    def _commit(self, digest: str, size: int) -> None:
+        with self._lock:
+            self._pending_unlinks.discard(digest)
+            if digest not in self._entries:
+                self._entries[digest] = size
+                self._total += size
+            self._evict_locked(keep=digest)
+            self._dirty = True
+            self._maybe_save_index_locked()
+
+    def _evict_locked(self, keep: Optional[str]) -> None:
+        for digest in list(self._pending_unlinks):
+            self._pending_unlinks.discard(digest)
+            self._unlink_blob(digest)
+        while self._total > self._max_bytes and self._entries:
+            digest, size = next(iter(self._entries.items()))
+            if digest == keep:
+                if len(self._entries) == 1:
+                    break  # a single blob over budget stays until replaced
+                self._entries.move_to_end(digest)
+                continue
+            del self._entries[digest]
+            self._total -= size
+            self._evictions += 1
+            self._unlink_blob(digest)
+
+    def _unlink_blob(self, digest: str) -> None:
+        try:
+            self._path_for(digest).unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as exc:
+            # Windows refuses to delete a file that is still mapped
+            logger.debug("Blob %s still in use, retrying removal later: %s", digest[:12], exc)
+            self._pending_unlinks.add(digest)
+
+    def _write_atomic(self, path: Path, write) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = self._new_temp(path.parent)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(tmp, path)
+        except BaseException:
+            _unlink_quiet(tmp)
+            raise
+
+    @staticmethod
+    def _new_temp(directory: Path) -> tuple[int, str]:
+        return tempfile.mkstemp(dir=directory, prefix=".blob-", suffix=".tmp")
+
+    def _load_index(self) -> None:
+        self._entries.clear()
+        if self._index_path.exists():
+            try:
+                with self._index_path.open("r", encoding="utf-8") as f:
+                    raw = json.load(f)
+                if raw.get("version") == INDEX_VERSION:
+                    for digest, size in raw.get("entries", []):
+                        self._entries[digest] = int(size)
+            except (json.JSONDecodeError, OSError, ValueError, TypeError) as exc:
+                logger.warning("Blob cache index unreadable, rebuilding: %s", exc)
+                self._entries.clear()
+
+        # reconcile with what is actually on disk
+        on_disk: dict[str, int] = {}
+        for path in self._root.glob("*/*"):
+            if path.name.endswith(".tmp"):
+                _unlink_quiet(str(path))
+            elif len(path.name) == 64:
+                on_disk[path.name] = path.stat().st_size
+        for stray in self._root.glob(".blob-*.tmp"):
+            _unlink_quiet(str(stray))
+
+        indexed = OrderedDict(
+            (d, on_disk[d]) for d in self._entries if d in on_disk
+        )
+        unindexed = [(d, s) for d, s in on_disk.items() if d not in indexed]
+        self._entries = OrderedDict(unindexed)   # unknown blobs are evicted first
+        self._entries.update(indexed)
+        self._total = sum(self._entries.values())
+
+    def _maybe_save_index_locked(self) -> None:
+        if self._dirty and time.monotonic() - self._saved_at >= INDEX_SAVE_INTERVAL:
+            self._save_index_locked()
+
+    def _save_index_locked(self) -> None:
+        payload = {
+            "version": INDEX_VERSION,
+            "saved_at": time.time(),
+            "entries": list(self._entries.items()),
+        }
+        data = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        self._write_atomic(self._index_path, lambda f: f.write(data))
+        self._dirty = False
+        self._saved_at = time.monotonic()
+
+
+def _map_readonly(path: Path, size: int) -> memoryview:
+    if size == 0:
+        return memoryview(b"")
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return memoryview(mapped)
+
+
+def _unlink_quiet(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
@@ -0,0 +1,475 @@
+"""Headless sender — no Qt, no display.
+
+    python cli.py send [TEXT] [--file PATH]     send one clip (TEXT, file or stdin)
+    python cli.py batch [PATH|-] [--lines]      send NDJSON records (or one clip per line)
+    python cli.py daemon [--spool DIR]          watch a spool directory and send new files
+    python cli.py flush                         replay the offline outbox
+    python cli.py keys export [--group G]       print the end-to-end group key
+    python cli.py keys import [KEY] [--group G] store a key exported on another device
+
+``send`` and ``batch`` take ``--to DEVICE_ID`` (repeatable) to deliver
+only to those devices.
+
+NDJSON records are ``{"text": "...", "metadata": {...}}`` objects.  Clips
+that cannot be delivered go to the same ``~/.biome/outbox/`` the desktop
+app uses (disable with ``--no-outbox``).  Results are printed as JSON on
+stdout; logs go to stderr.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import signal
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+import httpx
+
+from api.client import BiomeApiClient
+from api.devices import target_metadata
+from api.endpoints import build_client
+from diagnostics import logs
+from metrics import exporter as metrics_exporter
+from outbox.reconcile import OutboxReconciler
+from outbox.store import Outbox
+from payloads.classifier import PayloadClassifier
+from payloads.schema import SchemaError
+from settings.store import SettingsStore
+from workers import pool as worker_pool
+
+logger = logging.getLogger("biome.cli")
+
+DEFAULT_CONCURRENCY = 8
+SPOOL_POLL_INTERVAL = 0.5
+SPOOL_SETTLE_SECONDS = 0.5     # leave files alone while they are still being written
+OUTBOX_FLUSH_INTERVAL = 30.0
+_NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+
+Record = tuple[str, dict[str, Any]]
+
+
+def default_spool_dir() -> Path:
+    return Path.home() / ".biome" / "spool"
+
+
+@dataclass
+class SendStats:
+    sent: int = 0
+    queued: int = 0
+    failed: int = 0
+    skipped: int = 0
+    seconds: float = 0.0
+
+    @property
+    def clips_per_sec(self) -> float:
+        return self.sent / self.seconds if self.seconds > 0 else 0.0
+
+    def to_json(self) -> dict[str, Any]:
+        return {**asdict(self), "clips_per_sec": round(self.clips_per_sec, 1)}
+
+
+class HeadlessSender:
+    """Classify and post clips with bounded concurrency."""
+
+    def __init__(
+        self,
+        client: BiomeApiClient,
+        outbox: Optional[Outbox],
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> None:
+        self._client = client
+        self._outbox = outbox
+        self._classifier = PayloadClassifier()
+        self._concurrency = max(1, concurrency)
+
+    async def send_one(self, text: str, metadata: dict[str, Any] | None = None,
+                       stats: SendStats | None = None) -> bool:
+        stats = stats if stats is not None else SendStats()
+        # the classifier only decides skipping and metadata; its
+        # stripped ``data`` would lose the clip's own whitespace
+        payload = self._classifier.classify(text)
+        if payload is None:
+            stats.skipped += 1
+            return False
+        meta = {**payload.metadata, **(metadata or {})}
+        try:
+            await self._client.send_clip(text, metadata=meta)
+        except SchemaError as exc:
+            logger.error("Clip rejected: %s", exc)
+            stats.failed += 1
+            return False
+        except (httpx.HTTPError, ValueError) as exc:
+            logger.warning("Send failed: %s", exc)
+            if self._outbox is not None:
+                try:
+                    self._outbox.enqueue(text, meta)
+                except OSError as queue_exc:
+                    logger.error("Could not queue the clip: %s", queue_exc)
+                else:
+                    stats.queued += 1
+                    return False
+            stats.failed += 1
+            return False
+        except Exception:
+            # one broken clip must not abort the rest of a batch
+            logger.exception("Send failed unexpectedly")
+            stats.failed += 1
+            return False
+        stats.sent += 1
+        return True
+
+    async def send_many(self, records: Iterable[Record]) -> SendStats:
+        """Send *records* with at most ``concurrency`` requests in flight.
+
+        Records are pulled lazily so arbitrarily large inputs stream
+        through a small bounded queue.
+        """
+        stats = SendStats()
+        queue: asyncio.Queue[Optional[Record]] = asyncio.Queue(maxsize=self._concurrency * 2)
+
+        async def worker() -> None:
+            while True:
+                record = await queue.get()
+                if record is None:
+                    return
+                await self.send_one(record[0], record[1], stats)
+
+        started = time.perf_counter()
+        workers = [asyncio.create_task(worker()) for _ in range(self._concurrency)]
+        try:
+            for record in records:
+                await queue.put(record)
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+        stats.seconds = time.perf_counter() - started
+        return stats
+
+    async def flush_outbox(self) -> SendStats:
+        """Replay the outbox with ``OutboxReconciler``.
+
+        Lanes drain ``concurrency`` at a time, in batches where the
+        server supports them; the flush stops at the first connectivity
+        failure instead of waiting.  Items already on the server count
+        as ``skipped``, items it refuses as ``failed``.
+        """
+        stats = SendStats()
+        if self._outbox is None:
+            return stats
+        reconciler = OutboxReconciler(
+            self._client.send_clip,
+            outbox=self._outbox,
+            send_batch=getattr(self._client, "send_batch", None),    # not with E2E
+            parallelism=self._concurrency,
+            pause_when_offline=False,
+        )
+        started = time.perf_counter()
+        progress = await reconciler.drain()
+        stats.sent = progress.sent
+        stats.skipped = progress.duplicates
+        stats.failed = progress.rejected
+        stats.seconds = time.perf_counter() - started
+        return stats
+
+
+# ── input parsing ────────────────────────────────────────────────────
+
+
+def iter_ndjson(lines: Iterable[str]) -> Iterator[Record]:
+    for lineno, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as exc:
+            logger.warning("Line %d: invalid JSON (%s) — skipped", lineno, exc)
+            continue
+        if isinstance(record, str):
+            yield record, {}
+        elif isinstance(record, dict) and isinstance(record.get("text"), str):
+            metadata = record.get("metadata")
+            yield record["text"], metadata if isinstance(metadata, dict) else {}
+        else:
+            logger.warning("Line %d: expected a string or {\"text\": ...} — skipped", lineno)
+
+
+def iter_lines(lines: Iterable[str]) -> Iterator[Record]:
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line:
+            yield line, {}
+
+
+def _read_text(path: Path) -> str:
+    """The file as UTF-8; raises ``UnicodeDecodeError`` for anything else."""
+    return path.read_text(encoding="utf-8")
+
+
+# ── daemon ───────────────────────────────────────────────────────────
+
+
+class SpoolDaemon:
+    """Poll a spool directory and send every file dropped into it.
+
+    ``*.ndjson`` / ``*.jsonl`` files are sent record by record, any other
+    file as a single clip.  Hidden files and ``*.tmp`` / ``*.part`` are
+    ignored, so writers can create-then-rename for atomic hand-off.  A
+    file is deleted once all its clips are sent or queued in the outbox;
+    one that is not valid UTF-8 is counted as failed and renamed to
+    ``<name>.rejected``.
+    """
+
+    def __init__(self, sender: HeadlessSender, client: BiomeApiClient, spool: Path) -> None:
+        self._sender = sender
+        self._client = client
+        self._spool = spool
+        self._stop = asyncio.Event()
+        self.totals = SendStats()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    async def run(self) -> None:
+        self._spool.mkdir(parents=True, exist_ok=True)
+        logger.info("Watching spool directory %s", self._spool)
+        next_flush = 0.0
+        while not self._stop.is_set():
+            for path in self._ready_files():
+                await self._process(path)
+                if self._stop.is_set():
+                    break
+
+            now = time.monotonic()
+            if now >= next_flush:
+                next_flush = now + OUTBOX_FLUSH_INTERVAL
+                if await self._client.health_check():
+                    flushed = await self._sender.flush_outbox()
+                    if flushed.sent:
+                        logger.info("Replayed %d outbox item(s)", flushed.sent)
+
+            try:
+                await asyncio.wait_for(self._stop.wait(), SPOOL_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    def _ready_files(self) -> list[Path]:
+        cutoff = time.time() - SPOOL_SETTLE_SECONDS
+        ready: list[Path] = []
+        for entry in sorted(self._spool.iterdir()):
+            name = entry.name
+            if name.startswith(".") or name.endswith((".tmp", ".part", ".rejected")):
+                continue
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+            if entry.is_file() and st.st_mtime <= cutoff:
+                ready.append(entry)
+        return ready
+
+    async def _process(self, path: Path) -> None:
+        try:
+            content = await worker_pool.offload(_read_text, path)
+        except OSError as exc:
+            logger.warning("Cannot read %s: %s", path.name, exc)
+            return
+        except UnicodeDecodeError as exc:
+            logger.error("%s is not UTF-8 text, leaving it as .rejected: %s", path.name, exc)
+            self.totals.failed += 1
+            try:
+                path.replace(path.with_name(path.name + ".rejected"))
+            except OSError as move_exc:
+                logger.warning("Cannot rename %s: %s", path.name, move_exc)
+            return
+        if path.suffix.lower() in _NDJSON_SUFFIXES:
+            stats = await self._sender.send_many(iter_ndjson(content.splitlines()))
+        else:
+            stats = SendStats()
+            await self._sender.send_one(content, {"filename": path.name}, stats)
+        for name in ("sent", "queued", "failed", "skipped"):
+            setattr(self.totals, name, getattr(self.totals, name) + getattr(stats, name))
+        logger.info("%s: sent=%d queued=%d skipped=%d",
+                    path.name, stats.sent, stats.queued, stats.skipped)
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+# ── entry point ──────────────────────────────────────────────────────
+
+
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="biome-cli", description="Headless Biome sender")
+    parser.add_argument("--api-url", help="backend base URL (default: from settings)")
+    parser.add_argument("--no-outbox", action="store_true",
+                        help="drop undeliverable clips instead of queueing them")
+    parser.add_argument("-c", "--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"max requests in flight (default {DEFAULT_CONCURRENCY})")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    send = sub.add_parser("send", help="send one clip")
+    send.add_argument("text", nargs="?")
+    send.add_argument("--file", type=Path, help="read the clip from a file")
+
+    batch = sub.add_parser("batch", help="send NDJSON records or lines")
+    batch.add_argument("path", nargs="?", default="-")
+    batch.add_argument("--lines", action="store_true",
+                       help="treat each non-empty line as a clip instead of NDJSON")
+    for p in (send, batch):
+        p.add_argument("--to", action="append", metavar="DEVICE_ID",
+                       help="send only to this device (repeatable)")
+
+    daemon = sub.add_parser("daemon", help="watch a spool directory")
+    daemon.add_argument("--spool", type=Path, default=None,
+                        help="spool directory (default ~/.biome/spool)")
+
+    sub.add_parser("flush", help="replay the offline outbox")
+
+    keys = sub.add_parser("keys", help="share the end-to-end group key between devices")
+    keys_sub = keys.add_subparsers(dest="keys_cmd", required=True)
+    keys_sub.add_parser("export", help="print the group key (created if missing)")
+    key_import = keys_sub.add_parser("import", help="store a key exported on another device")
+    key_import.add_argument("key", nargs="?", help="base64url key (default: read stdin)")
+    for p in keys_sub.choices.values():
+        p.add_argument("--group", help="key group (default: e2e_group from settings)")
+    return parser.parse_args(argv)
+
+
+def _run_keys(args: argparse.Namespace) -> int:
+    from e2e.keys import Keyring
+    from e2e.stream import E2EError
+
+    settings = SettingsStore()
+    settings.load()
+    group = args.group or settings.get("e2e_group", "default")
+    keyring = Keyring()
+    try:
+        if args.keys_cmd == "export":
+            entry = keyring.get_or_create(group)
+            print(json.dumps({"ok": True, "group": group, "key_id": entry.key_id.hex(),
+                              "key": keyring.export_key(group)}))
+            return 0
+        encoded = args.key if args.key is not None else sys.stdin.read()
+        entry = keyring.import_key(group, encoded)
+    except (E2EError, OSError) as exc:
+        print(json.dumps({"ok": False, "group": group, "error": str(exc)}))
+        return 1
+    print(json.dumps({"ok": True, "group": group, "key_id": entry.key_id.hex()}))
+    return 0
+
+
+async def _run(args: argparse.Namespace) -> int:
+    settings = SettingsStore()
+    settings.load()
+    base_url = args.api_url or settings.get("api_base_url", "http://localhost:8000")
+
+    client = build_client(
+        base_url,
+        () if args.api_url else settings.get("api_endpoints") or (),
+        hedge_small_clips=bool(settings.get("api_hedge_small_clips", False)),
+    )
+    if settings.get("e2e_enabled", False):
+        from e2e.client import EncryptingClient
+        from e2e.keys import Keyring
+        client = EncryptingClient(client, Keyring(), settings.get("e2e_group", "default"))
+    elif settings.get("delta_uploads", True):
+        from api.delta import DeltaClient
+        client = DeltaClient(client)
+    outbox = None if args.no_outbox and args.cmd != "daemon" else Outbox()
+    sender = HeadlessSender(client, outbox, concurrency=args.concurrency)
+
+    try:
+        if args.cmd == "send":
+            if args.file is not None:
+                try:
+                    text = _read_text(args.file)
+                except (OSError, UnicodeDecodeError) as exc:
+                    print(json.dumps({"ok": False, "error": f"{args.file}: {exc}"}))
+                    return 1
+                meta = {"filename": args.file.name}
+            else:
+                text = args.text if args.text is not None else sys.stdin.read()
+                meta = {}
+            stats = SendStats()
+            ok = await sender.send_one(text, target_metadata(meta, args.to), stats)
+            print(json.dumps({"ok": ok, **stats.to_json()}))
+            return 0 if ok else 1
+
+        if args.cmd == "batch":
+            try:
+                stream = sys.stdin if args.path == "-" else open(args.path, encoding="utf-8")
+                with stream:
+                    records = iter_lines(stream) if args.lines else iter_ndjson(stream)
+                    if args.to:
+                        records = ((text, target_metadata(meta, args.to)) for text, meta in records)
+                    stats = await sender.send_many(records)
+            except (OSError, UnicodeDecodeError) as exc:
+                print(json.dumps({"ok": False, "error": f"{args.path}: {exc}"}))
+                return 1
+            print(json.dumps({"ok": stats.queued == stats.failed == 0, **stats.to_json(),
+                              **_delta_json(client)}))
+            return 0 if stats.queued == stats.failed == 0 else 1
+
+        if args.cmd == "flush":
+            stats = await sender.flush_outbox()
+            remaining = outbox.count() if outbox is not None else 0
+            print(json.dumps({"ok": remaining == 0, "remaining": remaining, **stats.to_json()}))
+            return 0 if remaining == 0 else 1
+
+        daemon = SpoolDaemon(sender, client, args.spool or default_spool_dir())
+        metrics_export = metrics_exporter.configure()
+        metrics_export.start()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, daemon.stop)
+            except (NotImplementedError, RuntimeError):
+                pass   # Windows: Ctrl+C arrives as KeyboardInterrupt instead
+        try:
+            await daemon.run()
+        finally:
+            metrics_export.stop()
+        print(json.dumps({"ok": True, **daemon.totals.to_json(), **_delta_json(client)}))
+        return 0
+    finally:
+        await client.close()
+        worker_pool.shutdown()
+
+
+def _delta_json(client: Any) -> dict[str, Any]:
+    stats = getattr(client, "stats", None)
+    if stats is None or not stats.deltas_sent:
+        return {}
+    return {"deltas_sent": stats.deltas_sent, "delta_bytes_saved": stats.bytes_saved}
+
+
+def _configure_logging() -> None:
+    # stderr only unless BIOME_LOG_DIR asks for a file
+    logs.configure(default_level="WARNING").start(sys.stderr)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(sys.argv[1:] if argv is None else argv)
+    _configure_logging()
+    if args.cmd == "keys":
+        return _run_keys(args)
+    try:
+        return asyncio.run(_run(args))
+    except KeyboardInterrupt:
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,8 +14,15 @@ from typing import Callable, Optional
 from PySide6.QtCore import QObject, Signal, Slot
 from PySide6.QtWidgets import QApplication
 
+from metrics import registry as metrics
+
 logger = logging.getLogger(__name__)
 
+# "coalesced" counts change signals that repeat the text already seen
+_EVENTS = metrics.counter(
+    "clipboard_events", "Clipboard change signals by outcome", ("outcome",),
+)
+
 ClipboardCallback = Callable[[str], None]
 
 
@@ -56,13 +63,23 @@ class ClipboardWatcher(QObject):
                 pass
         logger.info("ClipboardWatcher stopped.")
 
+    def suppress(self, text: str) -> None:
+        """Treat *text* as already seen, before putting it on the clipboard."""
+        self._last_text = text
+
     @Slot()
     def _on_data_changed(self) -> None:
         if not self._enabled or self._clipboard is None:
             return
         text = self._clipboard.text()
-        if not text or text == self._last_text:
+        if not text:
+            _EVENTS.labels("empty").inc()
+            return
+        if text == self._last_text:
+            _EVENTS.labels("coalesced").inc()
             return
+        _EVENTS.labels("captured").inc()
         self._last_text = text
-        logger.debug("Clipboard changed: %s", text[:60])
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Clipboard changed: %s", text[:60])
         self.text_captured.emit(text)
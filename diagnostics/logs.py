@@ -0,0 +1,235 @@
+"""Non-blocking logging pipeline.
+
+Callers on the GUI/asyncio thread only build a record and put it on a
+queue (``QueueHandler``); a listener thread formats it — tracebacks
+included — and does the I/O.  Output goes to stderr and, optionally, to
+a size-rotated file.  A rate limit at the queue drops bursts of the
+same message (per logger and format string) before they cost anything
+further, and notes how many were dropped once the burst ends.
+
+Configured from the environment, like the other diagnostics:
+
+    BIOME_LOG_LEVEL=INFO           root level
+    BIOME_LOG_DIR=path             rotating file directory (the app
+                                   defaults to ~/.biome/logs; "-" or
+                                   "off" disables the file)
+    BIOME_LOG_JSON=1               JSON lines instead of text, in both
+                                   outputs
+    BIOME_LOG_RATE=20              records allowed per message per
+                                   BIOME_LOG_RATE_WINDOW_S (default 10);
+                                   0 disables the limit
+
+Errors and above are never rate limited.
+"""
+
+from __future__ import annotations
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional, TextIO
+
+TEXT_FORMAT = "%(asctime)s | %(levelname)-7s | %(name)s | %(message)s"
+DEFAULT_LOG_DIR = Path.home() / ".biome" / "logs"
+MAX_FILE_BYTES = 5 * 1024 * 1024
+BACKUP_COUNT = 5
+DEFAULT_RATE = 20
+DEFAULT_RATE_WINDOW_S = 10.0
+_QUEUE_SIZE = 10_000
+_MAX_KEYS = 1024
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, thread, msg[, exc]."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "msg": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = record.stack_info
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class RateLimitFilter(logging.Filter):
+    """Pass at most *rate* records per (logger, format string) per window.
+
+    The first record let through after a suppressed burst carries a
+    "(N similar messages suppressed)" suffix.
+    """
+
+    def __init__(self, rate: int = DEFAULT_RATE, window_s: float = DEFAULT_RATE_WINDOW_S) -> None:
+        super().__init__()
+        self.rate = rate
+        self.window_s = window_s
+        # key -> [window start, passed in window, suppressed since last pass]
+        self._buckets: dict[tuple[str, Any], list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate <= 0 or record.levelno >= logging.ERROR:
+            return True
+        key = (record.name, record.msg)
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= _MAX_KEYS:
+                    self._buckets.clear()
+                bucket = self._buckets[key] = [now, 0, 0]
+            elif now - bucket[0] >= self.window_s:
+                bucket[0], bucket[1] = now, 0
+            if bucket[1] >= self.rate:
+                bucket[2] += 1
+                return False
+            bucket[1] += 1
+            suppressed, bucket[2] = bucket[2], 0
+        if suppressed:
+            record.msg = f"{record.msg} ({suppressed} similar messages suppressed)"
+        return True
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Hand records to the listener without formatting them here.
+
+    The stock ``prepare`` renders the whole record, traceback included,
+    on the calling thread.  Only the message is merged (so later
+    mutation of the arguments cannot change what is logged); exception
+    formatting is left to the listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass    # never block a caller on logging
+
+
+@dataclass
+class LogPipeline:
+    level: int = logging.INFO
+    log_file: Optional[Path] = None
+    json_lines: bool = False
+    rate: int = DEFAULT_RATE
+    rate_window_s: float = DEFAULT_RATE_WINDOW_S
+    _listener: Optional[logging.handlers.QueueListener] = None
+    _handler: Optional[logging.Handler] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def start(self, stream: TextIO = sys.stderr) -> None:
+        """Route the root logger through the queue; idempotent."""
+        with self._lock:
+            if self._listener is not None:
+                return
+            formatter = JsonFormatter() if self.json_lines else logging.Formatter(TEXT_FORMAT)
+            outputs: list[logging.Handler] = [logging.StreamHandler(stream)]
+            if self.log_file is not None:
+                try:
+                    self.log_file.parent.mkdir(parents=True, exist_ok=True)
+                    outputs.append(logging.handlers.RotatingFileHandler(
+                        self.log_file, maxBytes=MAX_FILE_BYTES,
+                        backupCount=BACKUP_COUNT, encoding="utf-8", delay=True,
+                    ))
+                except OSError as exc:
+                    print(f"biome: cannot log to {self.log_file}: {exc}", file=sys.stderr)
+                    self.log_file = None
+            for output in outputs:
+                output.setFormatter(formatter)
+
+            records: queue.Queue = queue.Queue(_QUEUE_SIZE)
+            self._handler = _QueueHandler(records)
+            self._handler.addFilter(RateLimitFilter(self.rate, self.rate_window_s))
+            self._listener = logging.handlers.QueueListener(
+                records, *outputs, respect_handler_level=True,
+            )
+            root = logging.getLogger()
+            root.setLevel(self.level)
+            root.addHandler(self._handler)
+            self._listener.start()
+        atexit.register(self.stop)
+
+    def stop(self) -> None:
+        """Flush what is queued and fall back to direct stderr output."""
+        with self._lock:
+            if self._listener is None:
+                return
+            logging.getLogger().removeHandler(self._handler)
+            self._listener.stop()
+            for output in self._listener.handlers:
+                output.close()
+            self._listener = None
+            self._handler = None
+
+
+def configure(
+    *,
+    default_level: str = "INFO",
+    default_file: Optional[str] = None,
+    environ: dict[str, str] | None = None,
+) -> LogPipeline:
+    """Build a pipeline from ``BIOME_LOG_*`` env vars (not yet started).
+
+    *default_file* is the log file name used when ``BIOME_LOG_DIR`` is
+    unset; None means no file unless the variable asks for one.
+    """
+    environ = os.environ if environ is None else environ
+
+    level_name = environ.get("BIOME_LOG_LEVEL", default_level).upper()
+    level = getattr(logging, level_name, None)
+    if not isinstance(level, int):
+        level = getattr(logging, default_level)
+
+    log_dir = environ.get("BIOME_LOG_DIR", "")
+    log_file = None
+    if log_dir.lower() not in ("-", "off", "0"):
+        name = default_file or "biome.log"
+        if log_dir:
+            log_file = Path(log_dir).expanduser() / name
+        elif default_file is not None:
+            log_file = DEFAULT_LOG_DIR / name
+
+    rate = DEFAULT_RATE
+    raw = environ.get("BIOME_LOG_RATE", "")
+    if raw:
+        try:
+            rate = max(0, int(raw))
+        except ValueError:
+            pass
+    window = DEFAULT_RATE_WINDOW_S
+    raw = environ.get("BIOME_LOG_RATE_WINDOW_S", "")
+    if raw:
+        try:
+            window = max(0.1, float(raw))
+        except ValueError:
+            pass
+
+    return LogPipeline(
+        level=level,
+        log_file=log_file,
+        json_lines=environ.get("BIOME_LOG_JSON", "").lower() in ("1", "true", "yes", "on"),
+        rate=rate,
+        rate_window_s=window,
+    )
@@ -0,0 +1,279 @@
+"""Startup phase profiler.
+
+Enabled with ``--profile-startup[=PATH]`` or ``BIOME_PROFILE_STARTUP``
+(``1`` / ``-`` for stdout, anything else is a file path).  When enabled
+it records:
+
+  - wall time of each phase of ``app.run()`` (``begin`` marks the start
+    of the next phase and closes the previous one),
+  - per-module import cost, self and cumulative, like ``-X importtime``,
+  - time-to-interactive: the first event-loop turn after the window and
+    tray are shown,
+  - optionally a cProfile top list (``--profile-startup-cprofile`` /
+    ``BIOME_PROFILE_STARTUP_CPROFILE=1``).
+
+The report is a single JSON document (schema ``biome.startup/1``) so the
+pipeline benchmark can diff time-to-interactive across releases.  With
+``--profile-startup-exit`` / ``BIOME_PROFILE_STARTUP_EXIT=1`` the app
+quits right after writing it.
+
+When disabled every call is a cheap no-op.
+"""
+
+from __future__ import annotations
+
+import importlib.machinery
+import json
+import logging
+import os
+import platform
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = "biome.startup/1"
+_CPROFILE_TOP = 40
+_FLAG = "--profile-startup"
+_FLAG_CPROFILE = "--profile-startup-cprofile"
+_FLAG_EXIT = "--profile-startup-exit"
+
+_FILE_LOADERS = (
+    importlib.machinery.SourceFileLoader,
+    importlib.machinery.SourcelessFileLoader,
+    importlib.machinery.ExtensionFileLoader,
+)
+
+
+@dataclass
+class _Phase:
+    name: str
+    start: float
+    end: Optional[float] = None
+
+
+@dataclass
+class _ImportRecord:
+    module: str
+    cumulative: float = 0.0
+    children: float = 0.0
+
+
+@dataclass
+class StartupProfiler:
+    enabled: bool = False
+    output: str = "-"
+    use_cprofile: bool = False
+    exit_when_interactive: bool = False
+    origin: float = field(default_factory=time.perf_counter)
+    _phases: list[_Phase] = field(default_factory=list)
+    _imports: list[_ImportRecord] = field(default_factory=list)
+    _import_stack: list[_ImportRecord] = field(default_factory=list)
+    _interactive_at: Optional[float] = None
+    _finder: Any = None
+    _cprofile: Any = None
+
+    # ── phases ───────────────────────────────────────────────────────
+
+    def begin(self, name: str) -> None:
+        """Close the current phase (if any) and start ``name``."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self._phases and self._phases[-1].end is None:
+            self._phases[-1].end = now
+        self._phases.append(_Phase(name, now))
+
+    def mark_interactive(self) -> None:
+        if not self.enabled or self._interactive_at is not None:
+            return
+        self._interactive_at = time.perf_counter()
+        if self._phases and self._phases[-1].end is None:
+            self._phases[-1].end = self._interactive_at
+        self._stop_hooks()
+
+    # ── reporting ────────────────────────────────────────────────────
+
+    def report(self) -> dict[str, Any]:
+        def ms(t: float) -> float:
+            return round(t * 1000, 3)
+
+        imports = sorted(self._imports, key=lambda r: r.cumulative, reverse=True)
+        return {
+            "schema": SCHEMA,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "argv": sys.argv[1:],
+            "time_to_interactive_ms": (
+                ms(self._interactive_at - self.origin) if self._interactive_at else None
+            ),
+            "phases": [
+                {
+                    "name": p.name,
+                    "start_ms": ms(p.start - self.origin),
+                    "duration_ms": ms((p.end or time.perf_counter()) - p.start),
+                }
+                for p in self._phases
+            ],
+            "imports": [
+                {
+                    "module": r.module,
+                    "self_ms": ms(r.cumulative - r.children),
+                    "cumulative_ms": ms(r.cumulative),
+                }
+                for r in imports
+            ],
+            "cprofile": self._cprofile_rows(),
+        }
+
+    def emit(self) -> None:
+        if not self.enabled:
+            return
+        data = json.dumps(self.report(), indent=2)
+        if self.output in ("", "-", "1"):
+            sys.stdout.write(data + "\n")
+            sys.stdout.flush()
+        else:
+            with open(self.output, "w", encoding="utf-8") as f:
+                f.write(data + "\n")
+            logger.info("Startup profile written to %s", self.output)
+
+    # ── hooks ────────────────────────────────────────────────────────
+
+    def install(self) -> None:
+        if not self.enabled:
+            return
+        self._finder = _ImportTimer(self)
+        sys.meta_path.insert(0, self._finder)
+        if self.use_cprofile:
+            import cProfile
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    def _stop_hooks(self) -> None:
+        if self._finder is not None and self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+        self._finder = None
+        if self._cprofile is not None:
+            self._cprofile.disable()
+
+    def _cprofile_rows(self) -> Optional[list[dict[str, Any]]]:
+        if self._cprofile is None:
+            return None
+        import pstats
+
+        stats = pstats.Stats(self._cprofile)
+        rows = []
+        for (filename, line, func), (cc, nc, tt, ct, _) in stats.stats.items():  # type: ignore[attr-defined]
+            rows.append({
+                "function": f"{filename}:{line}({func})",
+                "ncalls": nc,
+                "tottime_ms": round(tt * 1000, 3),
+                "cumtime_ms": round(ct * 1000, 3),
+            })
+        rows.sort(key=lambda r: r["cumtime_ms"], reverse=True)
+        return rows[:_CPROFILE_TOP]
+
+
+class _ImportTimer:
+    """Meta-path finder that times ``exec_module`` of every new import.
+
+    The real loader is kept (only its bound ``exec_module`` is wrapped on
+    the per-module loader instance), so ``__loader__`` and
+    ``importlib.resources`` behave exactly as without profiling.
+    """
+
+    def __init__(self, profiler: StartupProfiler) -> None:
+        self._profiler = profiler
+        self._busy = False
+
+    def find_spec(self, fullname, path=None, target=None):
+        if self._busy:
+            return None
+        self._busy = True
+        try:
+            spec = None
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+        finally:
+            self._busy = False
+
+        loader = getattr(spec, "loader", None)
+        if loader is None or isinstance(loader, type):
+            return spec   # builtin / frozen importers are shared classes
+        if not isinstance(loader, _FILE_LOADERS):
+            return spec
+        self._wrap(loader, fullname)
+        return spec
+
+    def _wrap(self, loader, fullname: str) -> None:
+        profiler = self._profiler
+        original = loader.exec_module
+
+        def exec_module(module):
+            record = _ImportRecord(fullname)
+            stack = profiler._import_stack
+            stack.append(record)
+            t0 = time.perf_counter()
+            try:
+                return original(module)
+            finally:
+                record.cumulative = time.perf_counter() - t0
+                stack.pop()
+                if stack:
+                    stack[-1].children += record.cumulative
+                profiler._imports.append(record)
+
+        loader.exec_module = exec_module
+
+
+# ── process-wide instance ────────────────────────────────────────────
+
+_profiler = StartupProfiler()
+
+
+def configure(argv: list[str] | None = None, environ: dict[str, str] | None = None) -> StartupProfiler:
+    """Build the global profiler from CLI flags / env and install hooks.
+
+    Recognised flags are removed from ``argv`` in place.  Call this as
+    early as possible (``main.py``) so import costs are captured.
+    """
+    global _profiler
+    argv = sys.argv if argv is None else argv
+    environ = os.environ if environ is None else environ
+
+    output = environ.get("BIOME_PROFILE_STARTUP") or None
+    use_cprofile = environ.get("BIOME_PROFILE_STARTUP_CPROFILE", "") == "1"
+    exit_after = environ.get("BIOME_PROFILE_STARTUP_EXIT", "") == "1"
+
+    for arg in list(argv[1:]):
+        if arg == _FLAG_CPROFILE:
+            use_cprofile = True
+        elif arg == _FLAG_EXIT:
+            exit_after = True
+        elif arg == _FLAG:
+            output = output or "-"
+        elif arg.startswith(_FLAG + "="):
+            output = arg.split("=", 1)[1] or "-"
+        else:
+            continue
+        argv.remove(arg)
+
+    _profiler = StartupProfiler(
+        enabled=output is not None and output != "0",
+        output=output or "-",
+        use_cprofile=use_cprofile,
+        exit_when_interactive=exit_after,
+    )
+    _profiler.install()
+    return _profiler
+
+
+def get_profiler() -> StartupProfiler:
+    return _profiler
@@ -0,0 +1,213 @@
+"""Event-loop stall watchdog.
+
+asyncio and Qt share the main thread under ``qasync.QEventLoop``, so one
+slow callback freezes the UI and every in-flight request at once.  The
+watchdog schedules a heartbeat on the loop and runs a monitor thread
+that checks it.  When the heartbeat is later than the threshold the
+main thread is sampled with ``sys._current_frames()`` for as long as the
+stall lasts; when the loop recovers, the stall duration goes into a
+fixed-bucket histogram and the most frequently sampled stack is logged.
+
+Configured from the environment, like ``BIOME_LOG_LEVEL``:
+
+    BIOME_STALL_WATCHDOG=1            enable
+    BIOME_STALL_THRESHOLD_MS=250      stall threshold (default 250)
+    BIOME_STALL_REPORT=path.json      write a JSON report on exit
+
+When disabled every call is a cheap no-op.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = "biome.stalls/1"
+DEFAULT_THRESHOLD_MS = 250.0
+# histogram upper bounds (ms); the last bucket is open-ended
+BUCKETS_MS = (100, 250, 500, 1000, 2500, 5000, 10000)
+_RECENT_STALLS = 20
+_STACK_DEPTH = 30
+
+
+@dataclass
+class Stall:
+    started_at: float           # wall clock, for correlating with logs
+    duration_ms: float
+    samples: int
+    stack: list[str]
+
+
+@dataclass
+class StallWatchdog:
+    enabled: bool = False
+    threshold_ms: float = DEFAULT_THRESHOLD_MS
+    report_path: Optional[str] = None
+    _histogram: list[int] = field(default_factory=lambda: [0] * (len(BUCKETS_MS) + 1))
+    _recent: deque = field(default_factory=lambda: deque(maxlen=_RECENT_STALLS))
+    _worst_ms: float = 0.0
+    _last_beat: float = 0.0
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _handle: Optional[asyncio.TimerHandle] = None
+    _main_ident: Optional[int] = None
+    _thread: Optional[threading.Thread] = None
+    _stop: threading.Event = field(default_factory=threading.Event)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    @property
+    def heartbeat_s(self) -> float:
+        # beat well inside the threshold so lateness is measured, not the period
+        return max(0.01, self.threshold_ms / 4000)
+
+    # ── lifecycle ────────────────────────────────────────────────────
+
+    def start(self, loop: asyncio.AbstractEventLoop | None = None) -> None:
+        """Begin monitoring; call on the loop's (main) thread."""
+        if not self.enabled or self._thread is not None:
+            return
+        self._loop = loop or asyncio.get_event_loop()
+        self._main_ident = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._beat()
+        self._thread = threading.Thread(target=self._monitor, name="stall-watchdog", daemon=True)
+        self._thread.start()
+        logger.info("Stall watchdog running (threshold %.0f ms)", self.threshold_ms)
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._thread.join(timeout=1.0)
+        self._thread = None
+        if self.report_path:
+            with open(self.report_path, "w", encoding="utf-8") as f:
+                json.dump(self.report(), f, indent=2)
+            logger.info("Stall report written to %s", self.report_path)
+
+    # ── reporting ────────────────────────────────────────────────────
+
+    def summary(self) -> dict[str, Any]:
+        """Counts only — cheap enough for the IPC ``status`` reply."""
+        with self._lock:
+            return {
+                "threshold_ms": self.threshold_ms,
+                "stalls": sum(self._histogram),
+                "worst_ms": round(self._worst_ms, 1),
+                "histogram": self._histogram_dict(),
+            }
+
+    def report(self) -> dict[str, Any]:
+        with self._lock:
+            recent = [
+                {
+                    "started_at": s.started_at,
+                    "duration_ms": round(s.duration_ms, 1),
+                    "samples": s.samples,
+                    "stack": s.stack,
+                }
+                for s in self._recent
+            ]
+        return {"schema": SCHEMA, **self.summary(), "recent": recent}
+
+    # ── private ──────────────────────────────────────────────────────
+
+    def _beat(self) -> None:
+        self._last_beat = time.monotonic()
+        if not self._stop.is_set() and self._loop is not None:
+            self._handle = self._loop.call_later(self.heartbeat_s, self._beat)
+
+    def _monitor(self) -> None:
+        threshold = self.threshold_ms / 1000
+        poll = self.heartbeat_s / 2
+        while not self._stop.wait(poll):
+            late_since = self._last_beat + self.heartbeat_s
+            if time.monotonic() - late_since < threshold:
+                continue
+            self._sample_stall(late_since, poll)
+
+    def _sample_stall(self, late_since: float, poll: float) -> None:
+        """Sample the main thread until its heartbeat resumes."""
+        beat_at_start = self._last_beat
+        wall_start = time.time() - (time.monotonic() - late_since)
+        stacks: Counter[tuple[str, ...]] = Counter()
+        warned_long = False
+        while self._last_beat == beat_at_start and not self._stop.is_set():
+            frame = sys._current_frames().get(self._main_ident)
+            if frame is not None:
+                stacks[_format_stack(frame)] += 1
+            del frame
+            elapsed = time.monotonic() - late_since
+            if not warned_long and elapsed > 10 * self.threshold_ms / 1000:
+                warned_long = True
+                top = stacks.most_common(1)[0][0] if stacks else ()
+                logger.warning("Event loop stalled for %.0f ms and counting; main thread in:\n%s",
+                               elapsed * 1000, "".join(top))
+            self._stop.wait(poll)
+
+        duration_ms = (time.monotonic() - late_since) * 1000
+        if self._last_beat != beat_at_start:
+            # the loop ran again: the stall ended at (roughly) the new beat
+            duration_ms = (self._last_beat - late_since) * 1000
+        top, samples = stacks.most_common(1)[0] if stacks else ((), 0)
+        stall = Stall(wall_start, duration_ms, sum(stacks.values()), list(top))
+        with self._lock:
+            self._histogram[bisect.bisect_left(BUCKETS_MS, duration_ms)] += 1
+            self._worst_ms = max(self._worst_ms, duration_ms)
+            self._recent.append(stall)
+        logger.warning("Event loop stalled for %.0f ms (%d/%d samples in):\n%s",
+                       duration_ms, samples, stall.samples, "".join(top))
+
+    def _histogram_dict(self) -> dict[str, int]:
+        labels = [f"le_{b}" for b in BUCKETS_MS] + ["inf"]
+        return dict(zip(labels, self._histogram))
+
+
+def _format_stack(frame) -> tuple[str, ...]:
+    return tuple(traceback.format_stack(frame, limit=_STACK_DEPTH))
+
+
+# ── process-wide instance ────────────────────────────────────────────
+
+_watchdog = StallWatchdog()
+
+
+def configure(environ: dict[str, str] | None = None) -> StallWatchdog:
+    """Build the global watchdog from ``BIOME_STALL_*`` env vars."""
+    global _watchdog
+    environ = os.environ if environ is None else environ
+
+    enabled = environ.get("BIOME_STALL_WATCHDOG", "").lower() in ("1", "true", "yes", "on")
+    threshold = DEFAULT_THRESHOLD_MS
+    raw = environ.get("BIOME_STALL_THRESHOLD_MS", "")
+    if raw:
+        try:
+            threshold = max(10.0, float(raw))
+        except ValueError:
+            logger.warning("Ignoring invalid BIOME_STALL_THRESHOLD_MS=%r", raw)
+
+    _watchdog = StallWatchdog(
+        enabled=enabled,
+        threshold_ms=threshold,
+        report_path=environ.get("BIOME_STALL_REPORT") or None,
+    )
+    return _watchdog
+
+
+def get_watchdog() -> StallWatchdog:
+    return _watchdog
@@ -0,0 +1 @@
+"""Send scheduling shared by every send path."""
@@ -0,0 +1,320 @@
+"""Central send scheduler.
+
+Every send (tray menu, dashboard button, IPC ``send``, clipboard
+auto-send) is submitted here instead of spawning its own task:
+
+* at most ``max_in_flight`` sends run concurrently;
+* the MANUAL lane is always drained before the AUTO lane;
+* a new AUTO submission supersedes older AUTO jobs — queued ones are
+  dropped and in-flight ones cancelled, since only the newest clipboard
+  content is worth delivering;
+* once ``max_queued`` jobs are waiting, new work (and any send that
+  fails) is spilled into the outbox instead of piling up in memory.
+
+Pure asyncio — no Qt — so the headless CLI can use it too.  Callers are
+notified through the ``on_started`` / ``on_finished`` callbacks, which
+run on the event-loop thread.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum, IntEnum, auto
+from typing import Any, Awaitable, Callable, Optional
+
+from metrics import registry as metrics
+from outbox.store import Outbox
+from payloads.schema import SchemaError
+
+logger = logging.getLogger(__name__)
+
+SendFn = Callable[..., Awaitable[Any]]
+JobCallback = Callable[["DispatchJob"], None]
+
+DEFAULT_MAX_IN_FLIGHT = 4
+DEFAULT_MAX_QUEUED = 64
+_WAIT_SAMPLES = 256
+
+_JOBS = metrics.counter(
+    "dispatch_jobs", "Finished dispatch jobs by lane and status", ("lane", "status"),
+)
+_WAIT = metrics.histogram(
+    "dispatch_wait_seconds", "Time jobs spent queued before sending", ("lane",),
+)
+
+
+class Lane(IntEnum):
+    """Priority lanes; lower value is served first."""
+
+    MANUAL = 0
+    AUTO = 1
+
+
+class JobStatus(Enum):
+    PENDING = auto()
+    RUNNING = auto()
+    SENT = auto()
+    FAILED = auto()
+    SPILLED = auto()        # written to the outbox for later replay
+    SUPERSEDED = auto()     # newer clipboard content replaced this auto-send
+    CANCELLED = auto()
+
+    @property
+    def done(self) -> bool:
+        return self not in (JobStatus.PENDING, JobStatus.RUNNING)
+
+
+@dataclass(eq=False)
+class DispatchJob:
+    id: int
+    text: str
+    lane: Lane
+    metadata: dict[str, Any] = field(default_factory=dict)
+    status: JobStatus = JobStatus.PENDING
+    enqueued_at: float = field(default_factory=time.monotonic)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+
+    @property
+    def wait_ms(self) -> Optional[float]:
+        if self.started_at is None:
+            return None
+        return (self.started_at - self.enqueued_at) * 1000
+
+
+@dataclass
+class DispatchMetrics:
+    queued_manual: int
+    queued_auto: int
+    in_flight: int
+    submitted: int
+    sent: int
+    failed: int
+    spilled: int
+    superseded: int
+    wait_ms_p50: float
+    wait_ms_p95: float
+    wait_ms_max: float
+
+    @property
+    def queue_depth(self) -> int:
+        return self.queued_manual + self.queued_auto
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class DispatchScheduler:
+    """Bounded, prioritised send queue in front of ``send``.
+
+    ``send(text, metadata=...)`` is normally ``BiomeApiClient.send_clip``.
+    """
+
+    def __init__(
+        self,
+        send: SendFn,
+        *,
+        outbox: Optional[Outbox] = None,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        max_queued: int = DEFAULT_MAX_QUEUED,
+        on_started: Optional[JobCallback] = None,
+        on_finished: Optional[JobCallback] = None,
+    ) -> None:
+        self._send = send
+        self._outbox = outbox
+        self._max_in_flight = max(1, max_in_flight)
+        self._max_queued = max(0, max_queued)
+        self._on_started = on_started
+        self._on_finished = on_finished
+
+        self._lanes: dict[Lane, deque[DispatchJob]] = {lane: deque() for lane in Lane}
+        self._running: dict[DispatchJob, asyncio.Task] = {}
+        self._ids = itertools.count(1)
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+        self._counts = {"submitted": 0, "sent": 0, "failed": 0, "spilled": 0, "superseded": 0}
+        self._waits: deque[float] = deque(maxlen=_WAIT_SAMPLES)
+
+    # ── public API ───────────────────────────────────────────────────
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._running)
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(len(q) for q in self._lanes.values())
+
+    def submit(
+        self,
+        text: str,
+        *,
+        lane: Lane = Lane.MANUAL,
+        metadata: dict[str, Any] | None = None,
+    ) -> DispatchJob:
+        """Queue *text* for sending and return its job handle."""
+        job = DispatchJob(id=next(self._ids), text=text, lane=lane, metadata=dict(metadata or {}))
+        self._counts["submitted"] += 1
+
+        if lane is Lane.AUTO:
+            self._supersede_auto()
+
+        if self.in_flight >= self._max_in_flight and self.queue_depth >= self._max_queued:
+            logger.warning("Dispatch queue full (%d waiting) — spilling job %d", self.queue_depth, job.id)
+            self._spill(job, "dispatch queue full")
+            return job
+
+        self._lanes[lane].append(job)
+        self._idle.clear()
+        self._pump()
+        return job
+
+    def cancel(self, job: DispatchJob) -> None:
+        if job.status is JobStatus.PENDING:
+            self._lanes[job.lane].remove(job)
+            self._finish(job, JobStatus.CANCELLED)
+            self._check_idle()
+        elif job.status is JobStatus.RUNNING:
+            task = self._running.get(job)
+            if task is not None:
+                task.cancel()
+
+    def metrics(self) -> DispatchMetrics:
+        waits = sorted(self._waits)
+        return DispatchMetrics(
+            queued_manual=len(self._lanes[Lane.MANUAL]),
+            queued_auto=len(self._lanes[Lane.AUTO]),
+            in_flight=self.in_flight,
+            wait_ms_p50=round(_percentile(waits, 50), 2),
+            wait_ms_p95=round(_percentile(waits, 95), 2),
+            wait_ms_max=round(waits[-1], 2) if waits else 0.0,
+            **self._counts,
+        )
+
+    async def drain(self) -> None:
+        """Wait until nothing is queued or in flight."""
+        await self._idle.wait()
+
+    def close(self) -> None:
+        """Stop dispatching; queued and in-flight jobs go to the outbox.
+
+        Synchronous so it can run from ``aboutToQuit`` after the event
+        loop has stopped.  An in-flight send may already have reached
+        the backend; replaying it is the lesser evil than losing it.
+        """
+        for queue in self._lanes.values():
+            while queue:
+                self._spill(queue.popleft(), "shutdown")
+        for job, task in list(self._running.items()):
+            del self._running[job]
+            task.cancel()
+            self._spill(job, "shutdown")
+        self._idle.set()
+
+    # ── private ──────────────────────────────────────────────────────
+
+    def _supersede_auto(self) -> None:
+        queue = self._lanes[Lane.AUTO]
+        while queue:
+            self._counts["superseded"] += 1
+            self._finish(queue.popleft(), JobStatus.SUPERSEDED)
+        for job, task in list(self._running.items()):
+            if job.lane is Lane.AUTO:
+                job.status = JobStatus.SUPERSEDED
+                task.cancel()
+
+    def _next_job(self) -> Optional[DispatchJob]:
+        for lane in Lane:
+            if self._lanes[lane]:
+                return self._lanes[lane].popleft()
+        return None
+
+    def _pump(self) -> None:
+        loop = asyncio.get_event_loop()
+        while self.in_flight < self._max_in_flight:
+            job = self._next_job()
+            if job is None:
+                break
+            job.status = JobStatus.RUNNING
+            job.started_at = time.monotonic()
+            self._waits.append(job.wait_ms or 0.0)
+            _WAIT.labels(job.lane.name.lower()).observe((job.wait_ms or 0.0) / 1000)
+            task = loop.create_task(self._send(job.text, metadata=job.metadata or None))
+            # a done-callback (not try/finally) so tasks cancelled before
+            # their first step are accounted for too
+            task.add_done_callback(lambda t, job=job: self._on_task_done(job, t))
+            self._running[job] = task
+            self._notify(self._on_started, job)
+
+    def _on_task_done(self, job: DispatchJob, task: asyncio.Task) -> None:
+        if self._running.pop(job, None) is None:
+            return   # already settled by close()
+        if task.cancelled():
+            if job.status is JobStatus.SUPERSEDED:
+                self._counts["superseded"] += 1
+                self._finish(job, JobStatus.SUPERSEDED)
+            else:
+                self._finish(job, JobStatus.CANCELLED)
+        elif isinstance(task.exception(), SchemaError):
+            # replaying an invalid payload can never succeed — don't spill it
+            logger.error("Job %d rejected: %s", job.id, task.exception())
+            job.error = str(task.exception())
+            self._counts["failed"] += 1
+            self._finish(job, JobStatus.FAILED)
+        elif task.exception() is not None:
+            logger.warning("Send of job %d failed: %s", job.id, task.exception())
+            self._spill(job, str(task.exception()))
+        else:
+            job.result = task.result()
+            self._counts["sent"] += 1
+            self._finish(job, JobStatus.SENT)
+        self._pump()
+        self._check_idle()
+
+    def _spill(self, job: DispatchJob, reason: str) -> None:
+        job.error = reason
+        if self._outbox is None:
+            self._counts["failed"] += 1
+            self._finish(job, JobStatus.FAILED)
+            return
+        try:
+            self._outbox.enqueue(job.text, job.metadata)
+        except OSError as exc:
+            logger.error("Could not write job %d to the outbox: %s", job.id, exc)
+            job.error = f"{reason}; outbox write failed: {exc}"
+            self._counts["failed"] += 1
+            self._finish(job, JobStatus.FAILED)
+            return
+        self._counts["spilled"] += 1
+        self._finish(job, JobStatus.SPILLED)
+
+    def _finish(self, job: DispatchJob, status: JobStatus) -> None:
+        job.status = status
+        job.finished_at = time.monotonic()
+        _JOBS.labels(job.lane.name.lower(), status.name.lower()).inc()
+        self._notify(self._on_finished, job)
+
+    @staticmethod
+    def _notify(callback: Optional[JobCallback], job: DispatchJob) -> None:
+        if callback is None:
+            return
+        try:
+            callback(job)
+        except Exception:
+            logger.exception("Dispatch callback failed for job %d", job.id)
+
+    def _check_idle(self) -> None:
+        if not self._running and self.queue_depth == 0:
+            self._idle.set()
@@ -0,0 +1 @@
+"""Optional end-to-end encryption of clip payloads (needs ``cryptography``)."""
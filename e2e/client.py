@@ -0,0 +1,89 @@
+"""``BiomeApiClient`` wrapper that encrypts every clip before upload.
+
+The ciphertext is produced in the shared worker pool a batch of chunks
+at a time and streamed straight into the request body, so a
+multi-megabyte clip never exists as plaintext and full ciphertext at
+once and the event loop only sees short hand-offs.
+
+Content-derived metadata (domain, length, …) is *not* sent — it would
+leak what the encryption hides; only the routing field
+``targetDeviceIds`` goes along in ``X-Biome-Metadata``.  There is
+deliberately no plaintext fallback: if the backend rejects the
+encrypted upload the send fails and the dispatcher spills it to the
+outbox.
+"""
+
+from __future__ import annotations
+
+import itertools
+from typing import Any, AsyncIterator, Iterator
+
+from api.client import BiomeApiClient
+from api.devices import TARGETS_KEY
+from api.wire import metadata_header
+from workers.pool import offload
+
+from .keys import Keyring
+from .stream import CONTENT_TYPE, DEFAULT_CHUNK_SIZE, iter_encrypt
+
+# chunks sealed per worker hand-off (1 MiB at the default chunk size)
+_CHUNKS_PER_BATCH = 16
+
+
+def _take(chunks: Iterator[bytes], count: int) -> list[bytes]:
+    return list(itertools.islice(chunks, count))
+
+
+class EncryptingClient:
+    """Drop-in for ``BiomeApiClient`` in the send path."""
+
+    def __init__(
+        self,
+        client: BiomeApiClient,
+        keyring: Keyring,
+        group: str,
+        *,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        self._client = client
+        self._keyring = keyring
+        self._group = group
+        self._chunk_size = chunk_size
+
+    async def send_clip(
+        self,
+        text: str,
+        *,
+        metadata: dict[str, Any] | None = None,
+        idempotency_key: str | None = None,
+    ) -> dict[str, Any]:
+        key = self._keyring.get_or_create(self._group)
+        data = text.encode("utf-8")
+        chunks = iter_encrypt(key.key, key.key_id, data, self._chunk_size)
+
+        async def body() -> AsyncIterator[bytes]:
+            while True:
+                batch = await offload(_take, chunks, _CHUNKS_PER_BATCH)
+                if not batch:
+                    return
+                for sealed in batch:
+                    yield sealed
+
+        headers = {
+            "X-Biome-Kind": "text",
+            "X-Biome-Key-Id": key.key_id.hex(),
+            "X-Biome-Group": self._group,
+        }
+        if idempotency_key:
+            headers["Idempotency-Key"] = idempotency_key
+        targets = (metadata or {}).get(TARGETS_KEY)
+        encoded = metadata_header({TARGETS_KEY: targets}) if targets else None
+        if encoded is not None:
+            headers["X-Biome-Metadata"] = encoded
+        return await self._client.send_stream(body(), content_type=CONTENT_TYPE, headers=headers)
+
+    async def health_check(self) -> bool:
+        return await self._client.health_check()
+
+    async def close(self) -> None:
+        await self._client.close()
@@ -0,0 +1,147 @@
+"""Per-group key storage at ``~/.biome/keys/``.
+
+Every linked-device group shares one 256-bit key.  Each key lives in
+``<group>.json`` (mode 0600) next to its 8-byte key id, which travels
+in the stream header so the receiver can pick the right key.  Keys are
+exchanged out of band with ``export_key`` / ``import_key`` (base64url).
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import logging
+import os
+import re
+import secrets
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from .stream import KEY_ID_LEN, KEY_LEN, E2EError
+
+logger = logging.getLogger(__name__)
+
+_GROUP_RE = re.compile(r"^[A-Za-z0-9_.-]{1,64}$")
+
+
+def default_keys_dir() -> Path:
+    return Path.home() / ".biome" / "keys"
+
+
+def key_id_for(key: bytes) -> bytes:
+    return hashlib.sha256(b"biome-e2e-key-id\x00" + key).digest()[:KEY_ID_LEN]
+
+
+@dataclass(frozen=True)
+class GroupKey:
+    group: str
+    key: bytes
+    key_id: bytes
+
+    def __repr__(self) -> str:   # never print key material
+        return f"GroupKey(group={self.group!r}, key_id={self.key_id.hex()})"
+
+
+class Keyring:
+    """Load, create and look up group keys."""
+
+    def __init__(self, root: Path | None = None) -> None:
+        self._root = root or default_keys_dir()
+        self._by_group: dict[str, GroupKey] = {}
+        self._by_id: dict[bytes, GroupKey] = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    # ── public API ───────────────────────────────────────────────────
+
+    def get(self, group: str) -> Optional[GroupKey]:
+        self._ensure_loaded()
+        return self._by_group.get(group)
+
+    def get_or_create(self, group: str) -> GroupKey:
+        existing = self.get(group)
+        if existing is not None:
+            return existing
+        return self._store(group, secrets.token_bytes(KEY_LEN))
+
+    def lookup(self, key_id: bytes) -> Optional[bytes]:
+        """Key for a stream header's key id (``StreamDecryptor`` callback)."""
+        self._ensure_loaded()
+        found = self._by_id.get(key_id)
+        return found.key if found is not None else None
+
+    def export_key(self, group: str) -> str:
+        key = self.get(group)
+        if key is None:
+            raise E2EError(f"no key for group {group!r}")
+        return base64.urlsafe_b64encode(key.key).decode("ascii")
+
+    def import_key(self, group: str, encoded: str) -> GroupKey:
+        try:
+            raw = base64.urlsafe_b64decode(encoded.strip().encode("ascii"))
+        except (ValueError, UnicodeEncodeError) as exc:
+            raise E2EError(f"invalid key encoding: {exc}") from exc
+        if len(raw) != KEY_LEN:
+            raise E2EError(f"key must be {KEY_LEN} bytes")
+        return self._store(group, raw)
+
+    # ── private ──────────────────────────────────────────────────────
+
+    def _ensure_loaded(self) -> None:
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            if not self._root.exists():
+                return
+            for path in sorted(self._root.glob("*.json")):
+                try:
+                    raw = json.loads(path.read_text(encoding="utf-8"))
+                    key = base64.urlsafe_b64decode(raw["key"])
+                    entry = GroupKey(raw["group"], key, key_id_for(key))
+                except (OSError, ValueError, KeyError, TypeError) as exc:
+                    logger.warning("Skipping unreadable key file %s: %s", path.name, exc)
+                    continue
+                self._by_group[entry.group] = entry
+                self._by_id[entry.key_id] = entry
+
+    def _store(self, group: str, key: bytes) -> GroupKey:
+        if not _GROUP_RE.match(group):
+            raise E2EError(f"invalid group name {group!r}")
+        self._ensure_loaded()
+        entry = GroupKey(group, key, key_id_for(key))
+        record = {
+            "group": group,
+            "key": base64.urlsafe_b64encode(key).decode("ascii"),
+            "key_id": entry.key_id.hex(),
+            "created_at": time.time(),
+        }
+        self._root.mkdir(parents=True, exist_ok=True)
+        try:
+            os.chmod(self._root, 0o700)
+        except OSError:
+            pass
+        fd, tmp = tempfile.mkstemp(dir=self._root, prefix=".key-", suffix=".tmp")  # 0600
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(record, f)
+            os.replace(tmp, self._root / f"{group}.json")
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        with self._lock:
+            old = self._by_group.get(group)
+            if old is not None:
+                self._by_id.pop(old.key_id, None)
+            self._by_group[group] = entry
+            self._by_id[entry.key_id] = entry
+        logger.info("Stored key %s for group %s", entry.key_id.hex(), group)
+        return entry
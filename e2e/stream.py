@@ -0,0 +1,194 @@
+"""Chunked AES-256-GCM stream format (``BME1``).
+
+A STREAM construction (Hoang, Reyhanitabar, Rogaway, Vizár 2015): the
+payload is cut into fixed-size chunks, each sealed independently under
+a per-stream subkey with a nonce of ``zero prefix ‖ counter ‖ last-flag``::
+
+    header  = "BME1" | version u8 | key_id 8B | chunk_size u32 | salt 16B
+    subkey  = HKDF-SHA256(group key, salt, info="biome-e2e-stream" ‖ key_id)
+    chunk_i = AES-GCM(subkey, 0^7 ‖ u32(i) ‖ u8(last), chunk, aad=header)
+
+As in Tink's AesGcmHkdfStreaming, the random salt picks a fresh subkey
+for every stream, so nonces never repeat under one key however many
+streams share the long-lived group key.  The counter stops chunks being
+reordered or dropped, the last-flag stops truncation at a chunk
+boundary, and binding the header as associated data stops it being
+swapped.  Encryption and decryption work one chunk at a time, so
+neither side ever holds the whole plaintext next to the whole
+ciphertext, and each step is a GIL-releasing call that can run in
+``workers.pool``.
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+from typing import Callable, Iterable, Iterator, Optional, Union
+
+Buffer = Union[bytes, bytearray, memoryview]
+KeyLookup = Callable[[bytes], Optional[bytes]]
+
+MAGIC = b"BME1"
+VERSION = 2
+KEY_LEN = 32
+KEY_ID_LEN = 8
+SALT_LEN = 16
+TAG_LEN = 16
+DEFAULT_CHUNK_SIZE = 64 * 1024
+MAX_CHUNK_SIZE = 16 * 1024 * 1024
+CONTENT_TYPE = "application/vnd.biome.e2e.v1"
+
+_HEADER = struct.Struct(">4sB8sI16s")
+HEADER_LEN = _HEADER.size
+_NONCE_PREFIX = bytes(7)
+_NONCE_TAIL = struct.Struct(">IB")
+_HKDF_INFO = b"biome-e2e-stream\x00"
+_MAX_CHUNKS = 2**32 - 1
+
+
+class E2EError(ValueError):
+    """Malformed, tampered, truncated or undecryptable stream."""
+
+
+def _aead(key: bytes, key_id: bytes, salt: bytes):
+    """AES-GCM under the stream's subkey, derived from *key* and *salt*."""
+    try:
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+        from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+    except ImportError as exc:
+        raise E2EError("end-to-end encryption needs the 'cryptography' package") from exc
+    if len(key) != KEY_LEN:
+        raise E2EError(f"key must be {KEY_LEN} bytes")
+    hkdf = HKDF(algorithm=hashes.SHA256(), length=KEY_LEN, salt=salt, info=_HKDF_INFO + key_id)
+    return AESGCM(hkdf.derive(key))
+
+
+def _nonce(counter: int, last: bool) -> bytes:
+    return _NONCE_PREFIX + _NONCE_TAIL.pack(counter, 1 if last else 0)
+
+
+class StreamEncryptor:
+    """Seal a payload chunk by chunk; emit ``header`` first."""
+
+    def __init__(self, key: bytes, key_id: bytes, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        if len(key_id) != KEY_ID_LEN:
+            raise E2EError(f"key id must be {KEY_ID_LEN} bytes")
+        if not 0 < chunk_size <= MAX_CHUNK_SIZE:
+            raise E2EError(f"chunk size must be 1..{MAX_CHUNK_SIZE}")
+        salt = os.urandom(SALT_LEN)
+        self._aead = _aead(key, key_id, salt)
+        self.chunk_size = chunk_size
+        self.header = _HEADER.pack(MAGIC, VERSION, key_id, chunk_size, salt)
+        self._counter = 0
+        self._finished = False
+
+    def encrypt_chunk(self, chunk: Buffer, *, last: bool) -> bytes:
+        if self._finished:
+            raise E2EError("stream already finished")
+        if len(chunk) > self.chunk_size or (not last and len(chunk) != self.chunk_size):
+            raise E2EError("only the last chunk may be short")
+        if self._counter >= _MAX_CHUNKS:
+            raise E2EError("stream too long")
+        sealed = self._aead.encrypt(_nonce(self._counter, last), chunk, self.header)
+        self._counter += 1
+        self._finished = last
+        return sealed
+
+
+class StreamDecryptor:
+    """Open a stream whose header has been read; keys are found by id."""
+
+    def __init__(self, header: bytes, keys: KeyLookup) -> None:
+        if len(header) != HEADER_LEN:
+            raise E2EError("truncated header")
+        magic, version, key_id, chunk_size, salt = _HEADER.unpack(header)
+        if magic != MAGIC:
+            raise E2EError("not a BME1 stream")
+        if version != VERSION:
+            raise E2EError(f"unsupported stream version {version}")
+        if not 0 < chunk_size <= MAX_CHUNK_SIZE:
+            raise E2EError("invalid chunk size")
+        key = keys(key_id)
+        if key is None:
+            raise E2EError(f"no key for key id {key_id.hex()}")
+        self._aead = _aead(key, key_id, salt)
+        self._header = header
+        self.key_id = key_id
+        self.chunk_size = chunk_size
+        self.sealed_chunk_size = chunk_size + TAG_LEN
+        self._counter = 0
+        self.finished = False
+
+    def decrypt_chunk(self, sealed: Buffer, *, last: bool) -> bytes:
+        from cryptography.exceptions import InvalidTag
+
+        if self.finished:
+            raise E2EError("data after the last chunk")
+        try:
+            plain = self._aead.decrypt(_nonce(self._counter, last), sealed, self._header)
+        except InvalidTag:
+            raise E2EError(f"chunk {self._counter} failed authentication") from None
+        self._counter += 1
+        self.finished = last
+        return plain
+
+
+def iter_encrypt(
+    key: bytes,
+    key_id: bytes,
+    data: Buffer,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """Yield the header, then one sealed chunk per ``chunk_size`` of *data*.
+
+    *data* is sliced through a ``memoryview``, so no plaintext copy is
+    made beyond the chunk being sealed.
+    """
+    enc = StreamEncryptor(key, key_id, chunk_size)
+    yield enc.header
+    view = memoryview(data).cast("B")
+    total = len(view)
+    if total == 0:
+        yield enc.encrypt_chunk(b"", last=True)
+        return
+    for offset in range(0, total, chunk_size):
+        end = min(offset + chunk_size, total)
+        yield enc.encrypt_chunk(view[offset:end], last=end == total)
+
+
+def iter_decrypt(source: Iterable[Buffer], keys: KeyLookup) -> Iterator[bytes]:
+    """Yield plaintext chunks from an iterable of arbitrarily split input.
+
+    Raises ``E2EError`` on tampering, a wrong key or truncation — the
+    caller must discard anything already yielded in that case.
+    """
+    buf = bytearray()
+    dec: Optional[StreamDecryptor] = None
+    for piece in source:
+        buf += piece
+        if dec is None:
+            if len(buf) < HEADER_LEN:
+                continue
+            dec = StreamDecryptor(bytes(buf[:HEADER_LEN]), keys)
+            del buf[:HEADER_LEN]
+        # a full chunk is only known not to be the last one once more follows
+        unit = dec.sealed_chunk_size
+        while len(buf) > unit:
+            yield dec.decrypt_chunk(memoryview(buf)[:unit], last=False)
+            del buf[:unit]
+
+    if dec is None:
+        raise E2EError("truncated header")
+    if not TAG_LEN <= len(buf) <= dec.sealed_chunk_size:
+        raise E2EError("truncated stream")
+    yield dec.decrypt_chunk(bytes(buf), last=True)
+
+
+def encrypt_bytes(key: bytes, key_id: bytes, data: Buffer,
+                  chunk_size: int = DEFAULT_CHUNK_SIZE) -> bytes:
+    return b"".join(iter_encrypt(key, key_id, data, chunk_size))
+
+
+def decrypt_bytes(blob: Buffer, keys: KeyLookup) -> bytes:
+    return b"".join(iter_decrypt((blob,), keys))
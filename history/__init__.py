@@ -0,0 +1 @@
+"""Clip history persistence and search."""
@@ -0,0 +1,238 @@
+"""Substring / fuzzy search over the clip history.
+
+Queries of three or more characters go through the trigram FTS5 index:
+first as an exact substring phrase, then — if nothing matches — as a
+fuzzy OR of the query's trigrams, so typos and partial recall still
+surface the right clip.  Fuzzy candidates are the most recent
+``_FUZZY_CANDIDATES`` rows sharing any trigram, re-ranked by the share
+of query trigrams they contain (bm25 over every match is far too slow
+on common trigrams).  Shorter queries fall back to a ``LIKE`` scan
+ordered by recency, which stops as soon as ``limit`` rows are found.
+
+``HistorySearcher`` runs every query on a dedicated worker thread with
+its own read connection.  Starting a new search interrupts the one in
+flight (``sqlite3.Connection.interrupt``), so search-as-you-type never
+queues stale work behind the latest keystroke.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from .store import HistoryEntry, connect
+
+logger = logging.getLogger(__name__)
+
+_FUZZY_MAX_TRIGRAMS = 16
+_FUZZY_CANDIDATES = 2000
+_FUZZY_MIN_SCORE = 0.5
+
+
+@dataclass(frozen=True)
+class SearchQuery:
+    text: str = ""
+    kinds: frozenset[str] = field(default_factory=frozenset)
+    domain: Optional[str] = None
+    min_length: Optional[int] = None
+    max_length: Optional[int] = None
+    limit: int = 200
+
+
+@dataclass
+class SearchResult:
+    query: SearchQuery
+    entries: list[HistoryEntry]
+    fuzzy: bool = False
+
+
+# ── SQL building ─────────────────────────────────────────────────────
+
+def _fts_phrase(text: str) -> str:
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _trigrams(text: str) -> list[str]:
+    grams: list[str] = []
+    seen: set[str] = set()
+    for i in range(len(text) - 2):
+        gram = text[i:i + 3].lower()
+        if gram not in seen:
+            seen.add(gram)
+            grams.append(gram)
+    if len(grams) > _FUZZY_MAX_TRIGRAMS:
+        # keep an even spread across the query rather than just its head
+        step = len(grams) / _FUZZY_MAX_TRIGRAMS
+        grams = [grams[int(i * step)] for i in range(_FUZZY_MAX_TRIGRAMS)]
+    return grams
+
+
+def _fuzzy_expression(text: str) -> str:
+    return " OR ".join(_fts_phrase(g) for g in _trigrams(text))
+
+
+def _filters(query: SearchQuery) -> tuple[list[str], list[Any]]:
+    clauses: list[str] = []
+    params: list[Any] = []
+    if query.kinds:
+        kinds = sorted(query.kinds)
+        clauses.append(f"c.kind IN ({', '.join('?' * len(kinds))})")
+        params.extend(kinds)
+    if query.domain:
+        clauses.append("c.domain = ?")
+        params.append(query.domain.lower())
+    if query.min_length is not None:
+        clauses.append("c.length >= ?")
+        params.append(query.min_length)
+    if query.max_length is not None:
+        clauses.append("c.length <= ?")
+        params.append(query.max_length)
+    return clauses, params
+
+
+def build_sql(query: SearchQuery, *, fuzzy: bool = False) -> tuple[str, list[Any]]:
+    """Translate a query into SQL + parameters."""
+    clauses, params = _filters(query)
+    text = query.text.strip()
+
+    if len(text) >= 3 and fuzzy:
+        sql = (
+            "SELECT c.* FROM clips_fts f JOIN clips c ON c.id = f.rowid"
+            " WHERE clips_fts MATCH ?"
+        )
+        params.insert(0, _fuzzy_expression(text))
+        order = " ORDER BY f.rowid DESC"
+        limit = _FUZZY_CANDIDATES
+    elif len(text) >= 3:
+        sql = (
+            "SELECT c.* FROM clips c"
+            " WHERE c.id IN (SELECT rowid FROM clips_fts WHERE clips_fts MATCH ?)"
+        )
+        params.insert(0, _fts_phrase(text))
+        order = " ORDER BY c.id DESC"
+        limit = query.limit
+    else:
+        sql = "SELECT c.* FROM clips c WHERE 1"
+        order = " ORDER BY c.id DESC"
+        limit = query.limit
+        if text:
+            escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            clauses.insert(0, "c.content LIKE ? ESCAPE '\\'")
+            params.insert(0, f"%{escaped}%")
+
+    for clause in clauses:
+        sql += " AND " + clause
+    sql += order + " LIMIT ?"
+    params.append(limit)
+    return sql, params
+
+
+def run_query(conn: sqlite3.Connection, query: SearchQuery) -> SearchResult:
+    """Execute a query synchronously on ``conn``."""
+    sql, params = build_sql(query)
+    rows = conn.execute(sql, params).fetchall()
+    fuzzy = False
+    if not rows and len(query.text.strip()) >= 3:
+        sql, params = build_sql(query, fuzzy=True)
+        rows = _rank_fuzzy(query, conn.execute(sql, params).fetchall())
+        fuzzy = True
+    return SearchResult(
+        query=query,
+        entries=[HistoryEntry.from_row(r) for r in rows],
+        fuzzy=fuzzy,
+    )
+
+
+def _rank_fuzzy(query: SearchQuery, rows: list[sqlite3.Row]) -> list[sqlite3.Row]:
+    grams = _trigrams(query.text.strip())
+    scored = []
+    for row in rows:
+        content = row["content"].lower()
+        score = sum(1 for g in grams if g in content) / len(grams)
+        if score >= _FUZZY_MIN_SCORE:
+            scored.append((score, row["id"], row))
+    scored.sort(key=lambda s: (s[0], s[1]), reverse=True)
+    return [row for _, _, row in scored[:query.limit]]
+
+
+# ── async searcher ───────────────────────────────────────────────────
+
+class HistorySearcher:
+    """Runs history queries off the GUI thread; the latest search wins.
+
+    ``await search(query)`` raises ``asyncio.CancelledError`` when the
+    caller's task is cancelled or a newer search supersedes it.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="history-search")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    async def search(self, query: SearchQuery) -> SearchResult:
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+        self._interrupt()
+
+        loop = asyncio.get_running_loop()
+        fut = loop.run_in_executor(self._executor, self._run, query, generation)
+        try:
+            result = await fut
+        except asyncio.CancelledError:
+            self._interrupt()
+            raise
+        if result is None:
+            raise asyncio.CancelledError("superseded by a newer search")
+        return result
+
+    def cancel(self) -> None:
+        """Abandon whatever search is currently running."""
+        with self._lock:
+            self._generation += 1
+        self._interrupt()
+
+    def close(self) -> None:
+        """Stop the worker thread; safe to call more than once."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self.cancel()
+        self._executor.submit(self._close_conn)
+        self._executor.shutdown(wait=False)
+
+    # ── worker thread ────────────────────────────────────────────────
+
+    def _run(self, query: SearchQuery, generation: int) -> Optional[SearchResult]:
+        if generation != self._generation:
+            return None
+        if self._conn is None:
+            self._conn = connect(self._path, readonly=True)
+        try:
+            result = run_query(self._conn, query)
+        except sqlite3.OperationalError as exc:
+            if generation != self._generation:
+                return None  # interrupted by a newer search
+            logger.warning("History search failed: %s", exc)
+            raise
+        return result if generation == self._generation else None
+
+    def _close_conn(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _interrupt(self) -> None:
+        conn = self._conn
+        if conn is not None:
+            conn.interrupt()
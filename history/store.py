@@ -0,0 +1,182 @@
+"""Local clip history backed by SQLite.
+
+Stores every captured clip in ``~/.biome/history.db`` together with the
+classifier's kind and metadata.  A trigram FTS5 table mirrors the clip
+text (external-content, so the text is stored once) and is maintained
+incrementally by triggers on insert / delete.
+
+The store's own connection belongs to the GUI thread; searches run on a
+separate read connection owned by ``history.search.HistorySearcher``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from payloads.classifier import Payload
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS clips (
+    id          INTEGER PRIMARY KEY,
+    created_at  REAL    NOT NULL,
+    kind        TEXT    NOT NULL,
+    content     TEXT    NOT NULL,
+    domain      TEXT,
+    length      INTEGER NOT NULL,
+    metadata    TEXT
+);
+CREATE INDEX IF NOT EXISTS clips_kind   ON clips(kind, id);
+CREATE INDEX IF NOT EXISTS clips_domain ON clips(domain, id);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS clips_fts USING fts5(
+    content,
+    content='clips',
+    content_rowid='id',
+    tokenize='trigram'
+);
+
+CREATE TRIGGER IF NOT EXISTS clips_ai AFTER INSERT ON clips BEGIN
+    INSERT INTO clips_fts(rowid, content) VALUES (new.id, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS clips_ad AFTER DELETE ON clips BEGIN
+    INSERT INTO clips_fts(clips_fts, rowid, content)
+    VALUES ('delete', old.id, old.content);
+END;
+"""
+
+
+def default_history_path() -> Path:
+    return Path.home() / ".biome" / "history.db"
+
+
+def connect(path: Path, *, readonly: bool = False) -> sqlite3.Connection:
+    """Open a history database connection with the shared pragmas."""
+    if readonly:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+    else:
+        conn = sqlite3.connect(str(path))
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+@dataclass
+class HistoryEntry:
+    id: int
+    created_at: float
+    kind: str
+    content: str
+    domain: Optional[str]
+    length: int
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "HistoryEntry":
+        return cls(
+            id=row["id"],
+            created_at=row["created_at"],
+            kind=row["kind"],
+            content=row["content"],
+            domain=row["domain"],
+            length=row["length"],
+        )
+
+
+class HistoryStore:
+    """Append-mostly clip history at ``~/.biome/history.db``."""
+
+    def __init__(self, path: Path | None = None) -> None:
+        self._path = path or default_history_path()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    # ── lifecycle ────────────────────────────────────────────────────
+
+    def open(self) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = connect(self._path)
+        self._conn.executescript(_SCHEMA)
+        self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self._conn.commit()
+        logger.info("History opened at %s", self._path)
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    # ── writes ───────────────────────────────────────────────────────
+
+    def add(self, payload: Payload, *, created_at: float | None = None) -> int:
+        """Record a classified payload; the FTS index is updated by trigger."""
+        conn = self._require()
+        meta = dict(payload.metadata)
+        content = str(payload.data)
+        cur = conn.execute(
+            "INSERT INTO clips (created_at, kind, content, domain, length, metadata)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                created_at if created_at is not None else time.time(),
+                payload.kind.name.lower(),
+                content,
+                meta.pop("domain", None),
+                int(meta.pop("length", len(content))),
+                json.dumps(meta) if meta else None,
+            ),
+        )
+        conn.commit()
+        return int(cur.lastrowid)
+
+    def delete(self, clip_id: int) -> None:
+        conn = self._require()
+        conn.execute("DELETE FROM clips WHERE id = ?", (clip_id,))
+        conn.commit()
+
+    # ── reads ────────────────────────────────────────────────────────
+
+    def count(self) -> int:
+        return int(self._require().execute("SELECT count(*) FROM clips").fetchone()[0])
+
+    def get(self, clip_id: int) -> Optional[HistoryEntry]:
+        row = self._require().execute(
+            "SELECT * FROM clips WHERE id = ?", (clip_id,)
+        ).fetchone()
+        return HistoryEntry.from_row(row) if row else None
+
+    def metadata(self, clip_id: int) -> dict:
+        """The extra metadata stored with a clip (empty if none)."""
+        row = self._require().execute(
+            "SELECT metadata FROM clips WHERE id = ?", (clip_id,)
+        ).fetchone()
+        if row is None or not row["metadata"]:
+            return {}
+        try:
+            return json.loads(row["metadata"])
+        except json.JSONDecodeError:
+            return {}
+
+    def recent(self, limit: int = 50) -> list[HistoryEntry]:
+        rows = self._require().execute(
+            "SELECT * FROM clips ORDER BY id DESC LIMIT ?", (limit,)
+        ).fetchall()
+        return [HistoryEntry.from_row(r) for r in rows]
+
+    # ── private ──────────────────────────────────────────────────────
+
+    def _require(self) -> sqlite3.Connection:
+        if self._conn is None:
+            raise RuntimeError("HistoryStore.open() must be called first")
+        return self._conn
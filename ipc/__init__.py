@@ -0,0 +1 @@
+"""Single-instance local IPC."""
@@ -0,0 +1,130 @@
+"""Wire protocol and stdlib-only client for the single-instance socket.
+
+The running app listens on a per-user local socket (``QLocalServer``:
+a Unix domain socket at ``~/.biome/instance.sock`` on POSIX, a named
+pipe ``\\\\.\\pipe\\biome-<user>`` on Windows).  A second invocation
+connects with plain ``socket`` / file I/O — no Qt import — sends one
+JSON line and reads one JSON line back:
+
+    → {"v": 1, "cmd": "send", "args": {"text": "…"}}
+    ← {"ok": true, "queued": true}
+
+Commands: ``show``, ``send`` (``text``), ``send-file`` (``path``),
+``status`` and ``ping``.
+"""
+
+from __future__ import annotations
+
+import getpass
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import Any, Optional
+
+PROTOCOL_VERSION = 1
+COMMANDS = ("show", "send", "send-file", "status", "ping")
+MAX_MESSAGE_BYTES = 64 * 1024 * 1024
+DEFAULT_TIMEOUT = 2.0
+
+
+class IpcError(RuntimeError):
+    """The peer answered with something that is not a valid reply."""
+
+
+def _is_windows() -> bool:
+    return sys.platform == "win32"
+
+
+def server_name() -> str:
+    """Name to pass to ``QLocalServer.listen`` / ``removeServer``."""
+    if _is_windows():
+        try:
+            user = getpass.getuser()
+        except (KeyError, OSError):
+            user = "default"
+        return f"biome-{user}"
+    return str(Path.home() / ".biome" / "instance.sock")
+
+
+def _pipe_path(name: str) -> str:
+    return rf"\\.\pipe\{name}"
+
+
+def encode(message: dict[str, Any]) -> bytes:
+    return json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def decode(line: bytes) -> dict[str, Any]:
+    try:
+        message = json.loads(line.decode("utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise IpcError(f"malformed message: {exc}") from exc
+    if not isinstance(message, dict):
+        raise IpcError("message is not an object")
+    return message
+
+
+def make_request(cmd: str, args: dict[str, Any] | None = None) -> dict[str, Any]:
+    if cmd not in COMMANDS:
+        raise ValueError(f"unknown command {cmd!r}")
+    return {"v": PROTOCOL_VERSION, "cmd": cmd, "args": args or {}}
+
+
+def request(
+    cmd: str,
+    args: dict[str, Any] | None = None,
+    *,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> Optional[dict[str, Any]]:
+    """Send a command to the running instance.
+
+    Returns the reply, or None when no instance is listening.
+    """
+    payload = encode(make_request(cmd, args))
+    name = server_name()
+    if _is_windows():
+        return _request_pipe(name, payload)
+    return _request_unix(name, payload, timeout)
+
+
+def _request_unix(path: str, payload: bytes, timeout: float) -> Optional[dict[str, Any]]:
+    if not os.path.exists(path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        try:
+            sock.connect(path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            return None   # stale socket file from a crashed instance
+        sock.sendall(payload)
+        chunks: list[bytes] = []
+        size = 0
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            size += len(chunk)
+            if chunk.endswith(b"\n") or size > MAX_MESSAGE_BYTES:
+                break
+    finally:
+        sock.close()
+    if not chunks:
+        raise IpcError("instance closed the connection without replying")
+    return decode(b"".join(chunks).rstrip(b"\n"))
+
+
+def _request_pipe(name: str, payload: bytes) -> Optional[dict[str, Any]]:
+    try:
+        pipe = open(_pipe_path(name), "r+b", buffering=0)
+    except OSError:
+        return None
+    with pipe:
+        pipe.write(payload)
+        line = pipe.readline(MAX_MESSAGE_BYTES)
+    if not line:
+        raise IpcError("instance closed the connection without replying")
+    return decode(line.rstrip(b"\n"))
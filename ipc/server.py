@@ -0,0 +1,101 @@
+"""QLocalServer endpoint that receives forwarded commands.
+
+Created right after the QApplication so a second launch finds it before
+the (slower) theme and window setup has finished.  Each connection
+carries one request line; the handler's reply is written back and the
+connection closed.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Callable
+
+from PySide6.QtCore import QObject, Slot
+from PySide6.QtNetwork import QLocalServer, QLocalSocket
+
+from . import protocol
+
+logger = logging.getLogger(__name__)
+
+CommandHandler = Callable[[str, dict[str, Any]], dict[str, Any]]
+
+
+class InstanceServer(QObject):
+    """Single-instance lock + command endpoint."""
+
+    def __init__(self, handler: CommandHandler, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._handler = handler
+        self._server = QLocalServer(self)
+        self._server.setSocketOptions(QLocalServer.SocketOption.UserAccessOption)
+        self._server.newConnection.connect(self._on_new_connection)
+        self._buffers: dict[QLocalSocket, bytearray] = {}
+
+    def listen(self) -> bool:
+        """Claim the instance socket; False if another instance owns it."""
+        name = protocol.server_name()
+        if self._server.listen(name):
+            logger.info("Instance server listening on %s", name)
+            return True
+
+        if self._server.serverError() == QLocalSocket.LocalSocketError.AddressInUseError:
+            if protocol.request("ping", timeout=0.5) is not None:
+                return False
+            # nobody answers: stale socket left behind by a crash
+            QLocalServer.removeServer(name)
+            if self._server.listen(name):
+                logger.info("Instance server listening on %s (replaced stale socket)", name)
+                return True
+
+        logger.warning("Instance server could not listen: %s", self._server.errorString())
+        return True   # run without single-instance protection rather than not at all
+
+    def close(self) -> None:
+        self._server.close()
+
+    # ── private ──────────────────────────────────────────────────────
+
+    @Slot()
+    def _on_new_connection(self) -> None:
+        while self._server.hasPendingConnections():
+            sock = self._server.nextPendingConnection()
+            self._buffers[sock] = bytearray()
+            sock.readyRead.connect(lambda s=sock: self._on_ready_read(s))
+            sock.disconnected.connect(lambda s=sock: self._forget(s))
+
+    def _on_ready_read(self, sock: QLocalSocket) -> None:
+        buf = self._buffers.get(sock)
+        if buf is None:
+            return
+        buf += bytes(sock.readAll().data())
+        if len(buf) > protocol.MAX_MESSAGE_BYTES:
+            self._reply(sock, {"ok": False, "error": "message too large"})
+            return
+        if b"\n" not in buf:
+            return
+
+        line = bytes(buf[:buf.index(b"\n")])
+        try:
+            message = protocol.decode(line)
+            cmd = message.get("cmd")
+            if cmd not in protocol.COMMANDS:
+                raise protocol.IpcError(f"unknown command {cmd!r}")
+            args = message.get("args") or {}
+            reply = {"ok": True} if cmd == "ping" else self._handler(cmd, args)
+        except protocol.IpcError as exc:
+            reply = {"ok": False, "error": str(exc)}
+        except Exception as exc:
+            logger.exception("IPC command failed: %s", exc)
+            reply = {"ok": False, "error": str(exc)}
+        self._reply(sock, reply)
+
+    def _reply(self, sock: QLocalSocket, reply: dict[str, Any]) -> None:
+        self._buffers.pop(sock, None)
+        sock.write(protocol.encode(reply))
+        sock.flush()
+        sock.disconnectFromServer()
+
+    def _forget(self, sock: QLocalSocket) -> None:
+        self._buffers.pop(sock, None)
+        sock.deleteLater()
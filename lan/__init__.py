@@ -0,0 +1 @@
+"""Direct LAN delivery to linked devices, bypassing the cloud round trip."""
@@ -0,0 +1,155 @@
+"""UDP broadcast discovery of linked devices on the local network.
+
+Each device announces ``{device, port, key id}`` every few seconds to
+the broadcast address (or to explicit targets, which is how several
+instances find each other on loopback) and listens for its peers'
+announcements.  A newly seen peer is answered at once, so two devices
+find each other within one round trip rather than one interval.  Peers
+that fall silent for ``PEER_TTL_INTERVALS`` intervals are dropped;
+peers configured statically never are.
+
+Announcements carry the sender's clock; stale ones and any not newer
+than the last accepted from that device are dropped, so a replayed
+datagram cannot move a peer to another address.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import socket
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional
+
+from .protocol import DEFAULT_DISCOVERY_PORT, Announcement, decode_announcement, encode_announcement
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 5.0
+PEER_TTL_INTERVALS = 3
+BROADCAST = "255.255.255.255"
+
+
+@dataclass
+class Peer:
+    device: str
+    host: str
+    port: int
+    last_seen: float
+    static: bool = False
+
+    @property
+    def address(self) -> str:
+        return f"{self.host}:{self.port}"
+
+
+def parse_address(value: str, default_port: int) -> tuple[str, int]:
+    """``host[:port]`` → ``(host, port)``."""
+    host, sep, port = value.rpartition(":")
+    if not sep:
+        return value, default_port
+    try:
+        return host, int(port)
+    except ValueError as exc:
+        raise ValueError(f"invalid address {value!r}") from exc
+
+
+class Discovery(asyncio.DatagramProtocol):
+    """Announce ourselves and keep a table of live peers."""
+
+    def __init__(
+        self,
+        *,
+        auth: bytes,
+        announcement: Announcement,
+        port: int = DEFAULT_DISCOVERY_PORT,
+        targets: Iterable[tuple[str, int]] | None = None,
+        interval: float = DEFAULT_INTERVAL,
+        on_peer: Optional[Callable[[Peer], None]] = None,
+    ) -> None:
+        self._auth = auth
+        self._announcement = announcement
+        self._port = port
+        self._targets = list(targets) if targets is not None else [(BROADCAST, port)]
+        self._interval = interval
+        self._on_peer = on_peer
+        self._peers: dict[str, Peer] = {}
+        self._last_ts: dict[str, float] = {}      # device → newest announcement ts
+        self._transport: Optional[asyncio.DatagramTransport] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def address(self) -> Optional[tuple[str, int]]:
+        if self._transport is None:
+            return None
+        return self._transport.get_extra_info("sockname")[:2]
+
+    def peers(self) -> list[Peer]:
+        cutoff = time.monotonic() - self._interval * PEER_TTL_INTERVALS
+        for device in [d for d, p in self._peers.items() if not p.static and p.last_seen < cutoff]:
+            logger.info("LAN peer %s went away", device)
+            del self._peers[device]
+        return list(self._peers.values())
+
+    def add_static(self, device: str, host: str, port: int) -> None:
+        self._peers[device] = Peer(device, host, port, time.monotonic(), static=True)
+
+    async def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        options = {"allow_broadcast": True}
+        if hasattr(socket, "SO_REUSEPORT"):
+            options["reuse_port"] = True     # several instances on one host
+        self._transport, _ = await loop.create_datagram_endpoint(
+            lambda: self, local_addr=("0.0.0.0", self._port), **options,
+        )
+        self._task = loop.create_task(self._announce_loop())
+
+    def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+    # ── DatagramProtocol ─────────────────────────────────────────────
+
+    def datagram_received(self, data: bytes, addr: tuple) -> None:
+        found = decode_announcement(self._auth, self._announcement.key_id, data)
+        if found is None or found.device == self._announcement.device:
+            return
+        if found.ts <= self._last_ts.get(found.device, 0.0):
+            return      # replayed or reordered
+        self._last_ts[found.device] = found.ts
+        if any(p.static and (p.host, p.port) == (addr[0], found.port) for p in self._peers.values()):
+            return      # already configured by hand
+        peer = self._peers.get(found.device)
+        is_new = peer is None or (peer.host, peer.port) != (addr[0], found.port)
+        self._peers[found.device] = Peer(found.device, addr[0], found.port, time.monotonic())
+        if is_new:
+            logger.info("LAN peer %s at %s:%d", found.device, addr[0], found.port)
+            # peers announce from their discovery socket: answer it directly
+            self._send_announcement([addr[:2]])
+            if self._on_peer is not None:
+                self._on_peer(self._peers[found.device])
+
+    def error_received(self, exc: Exception) -> None:
+        logger.debug("Discovery socket error: %s", exc)
+
+    # ── private ──────────────────────────────────────────────────────
+
+    def _send_announcement(self, targets: list[tuple[str, int]]) -> None:
+        if self._transport is None:
+            return
+        datagram = encode_announcement(self._auth, self._announcement, time.time())
+        for target in targets:
+            try:
+                self._transport.sendto(datagram, target)
+            except OSError as exc:
+                logger.debug("Announcement to %s failed: %s", target, exc)
+
+    async def _announce_loop(self) -> None:
+        while True:
+            self._send_announcement(self._targets)
+            await asyncio.sleep(self._interval)
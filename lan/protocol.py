@@ -0,0 +1,201 @@
+"""Wire format of the LAN transport.
+
+Every message is one frame, authenticated with HMAC-SHA256::
+
+    frame = u32 length | type u8 | seq u64 | body | tag 32B
+    tag   = HMAC(key, type | seq | body)
+
+Keys derive from the linked devices' group key (``e2e.keys``), so only
+devices that share it can talk.  A connection opens with a handshake
+tagged with the group's auth key:
+
+    HELLO    client → server   {"v", "device", "nonce"}
+    WELCOME  server → client   {"v", "device", "nonce", "echo"}
+
+``echo`` returns the client's nonce, proving the server is live.  Every
+later frame is tagged with a session key mixing both nonces, so a
+recorded session cannot be replayed.  ``seq`` counts up from 1 in each
+direction and a frame out of sequence ends the connection.
+
+A CLIP body is a JSON header line followed by the clip bytes; the
+header carries ``id`` (the idempotency key), ``metadata`` and whether
+the bytes are sealed with ``e2e.stream``.  The receiver answers ACK
+``{"id", "status": "created" | "duplicate"}``.
+
+Handshake frames are read with a ``MAX_HANDSHAKE_FRAME`` cap, so an
+unauthenticated client cannot make the listener buffer a large frame
+before its tag is checked.
+
+Discovery announcements are single UDP datagrams of JSON with a ``mac``
+field keyed the same way, so peers from other groups are ignored.  Their
+``ts`` must be within ``ANNOUNCE_MAX_AGE`` of our clock, and newer than
+the last one seen from that device (``lan.discovery``), so a recorded
+datagram replayed from another host cannot repoint a peer.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+import json
+import secrets
+import struct
+import time
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any
+
+VERSION = 1
+TAG_LEN = 32
+NONCE_LEN = 16
+MAX_FRAME = 64 * 1024 * 1024
+MAX_HANDSHAKE_FRAME = 4 * 1024
+ANNOUNCE_MAX_AGE = 30.0     # seconds, either way, to allow for clock skew
+DEFAULT_PORT = 47318
+DEFAULT_DISCOVERY_PORT = 47317
+
+_PREFIX = struct.Struct(">IBQ")     # length, type, seq
+_AUTH_LABEL = b"biome-lan-v1 auth"
+_SESSION_LABEL = b"biome-lan-v1 session"
+
+
+class LanError(Exception):
+    """Protocol violation, failed authentication or an unreachable peer."""
+
+
+class FrameType(IntEnum):
+    HELLO = 1
+    WELCOME = 2
+    CLIP = 3
+    ACK = 4
+    ERROR = 5
+
+
+def auth_key(group_key: bytes) -> bytes:
+    return hmac.new(group_key, _AUTH_LABEL, hashlib.sha256).digest()
+
+
+def session_key(auth: bytes, client_nonce: bytes, server_nonce: bytes) -> bytes:
+    return hmac.new(auth, _SESSION_LABEL + client_nonce + server_nonce, hashlib.sha256).digest()
+
+
+def new_nonce() -> bytes:
+    return secrets.token_bytes(NONCE_LEN)
+
+
+def _tag(key: bytes, ftype: int, seq: int, body: bytes) -> bytes:
+    mac = hmac.new(key, struct.pack(">BQ", ftype, seq), hashlib.sha256)
+    mac.update(body)
+    return mac.digest()
+
+
+def encode_frame(key: bytes, ftype: FrameType, seq: int, body: bytes) -> bytes:
+    length = 1 + 8 + len(body) + TAG_LEN
+    if length > MAX_FRAME:
+        raise LanError(f"frame of {length} bytes exceeds {MAX_FRAME}")
+    return _PREFIX.pack(length, ftype, seq) + body + _tag(key, ftype, seq, body)
+
+
+async def read_frame(
+    reader: asyncio.StreamReader,
+    key: bytes,
+    expect_seq: int,
+    max_length: int = MAX_FRAME,
+) -> tuple[FrameType, bytes]:
+    """Read, authenticate and sequence-check one frame of at most *max_length*."""
+    try:
+        prefix = await reader.readexactly(_PREFIX.size)
+    except asyncio.IncompleteReadError as exc:
+        raise LanError("connection closed") from exc
+    length, ftype, seq = _PREFIX.unpack(prefix)
+    if not 1 + 8 + TAG_LEN <= length <= max_length:
+        raise LanError(f"bad frame length {length}")
+    try:
+        rest = await reader.readexactly(length - 1 - 8)
+    except asyncio.IncompleteReadError as exc:
+        raise LanError("truncated frame") from exc
+    body, tag = rest[:-TAG_LEN], rest[-TAG_LEN:]
+    if not hmac.compare_digest(tag, _tag(key, ftype, seq, body)):
+        raise LanError("frame failed authentication")
+    if seq != expect_seq:
+        raise LanError(f"frame out of sequence ({seq}, expected {expect_seq})")
+    try:
+        return FrameType(ftype), body
+    except ValueError as exc:
+        raise LanError(f"unknown frame type {ftype}") from exc
+
+
+def json_body(value: dict[str, Any]) -> bytes:
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+def parse_json(body: bytes) -> dict[str, Any]:
+    try:
+        value = json.loads(body)
+    except (UnicodeDecodeError, ValueError) as exc:
+        raise LanError(f"malformed frame body: {exc}") from exc
+    if not isinstance(value, dict):
+        raise LanError("frame body is not an object")
+    return value
+
+
+def clip_body(header: dict[str, Any], data: bytes) -> bytes:
+    return json_body(header) + b"\n" + data
+
+
+def parse_clip(body: bytes) -> tuple[dict[str, Any], bytes]:
+    head, sep, data = body.partition(b"\n")
+    if not sep:
+        raise LanError("clip frame has no header")
+    return parse_json(head), data
+
+
+# ── discovery ────────────────────────────────────────────────────────
+
+
+@dataclass(frozen=True)
+class Announcement:
+    device: str
+    port: int
+    key_id: str
+    ts: float = 0.0     # sender's wall clock; set on decoded announcements
+
+
+def encode_announcement(auth: bytes, announcement: Announcement, ts: float) -> bytes:
+    fields = {
+        "v": VERSION,
+        "device": announcement.device,
+        "port": announcement.port,
+        "kid": announcement.key_id,
+        "ts": round(ts, 3),
+    }
+    mac = hmac.new(auth, json_body(fields), hashlib.sha256).hexdigest()
+    return json_body({**fields, "mac": mac})
+
+
+def decode_announcement(
+    auth: bytes,
+    key_id: str,
+    datagram: bytes,
+    now: float | None = None,
+) -> Announcement | None:
+    """The announcement if it is well formed, fresh and from our group, else None."""
+    try:
+        fields = parse_json(datagram)
+    except LanError:
+        return None
+    mac = fields.pop("mac", None)
+    if fields.get("v") != VERSION or fields.get("kid") != key_id or not isinstance(mac, str):
+        return None
+    expected = hmac.new(auth, json_body(fields), hashlib.sha256).hexdigest()
+    if not hmac.compare_digest(mac, expected):
+        return None
+    device, port, ts = fields.get("device"), fields.get("port"), fields.get("ts")
+    if not isinstance(device, str) or not isinstance(port, int) or not 0 < port < 65536:
+        return None
+    if not isinstance(ts, (int, float)) or isinstance(ts, bool):
+        return None
+    if abs((time.time() if now is None else now) - ts) > ANNOUNCE_MAX_AGE:
+        return None
+    return Announcement(device, port, key_id, float(ts))
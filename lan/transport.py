@@ -0,0 +1,356 @@
+"""Direct device-to-device clip delivery over the LAN.
+
+``LanTransport`` runs a TCP server for clips from peers and sends clips
+to every peer ``Discovery`` (or the static ``lan_peers`` list) knows
+about, over one authenticated connection per peer kept open between
+sends.  A clip is meant for its ``targetDeviceIds`` or, without them,
+for the ``recipients`` the caller names (every other linked device).
+``send_clip`` answers for the clip only when all of those devices
+acknowledged it; otherwise it returns None after delivering to the
+peers it could reach, and the caller also sends it through the
+``BiomeApiClient`` under the same idempotency key, which receivers
+deduplicate on.
+
+Received clips are handed to ``on_clip(text, metadata, device)`` on the
+event loop; a clip id seen recently is acknowledged as a duplicate and
+not delivered twice.  A clip header that fails ``payloads.schema``
+validation is answered with ERROR and dropped.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, Optional
+
+from api.devices import TARGETS_KEY
+from api.wire import MAX_METADATA_HEADER, outgoing_metadata
+from e2e.keys import GroupKey, Keyring
+from metrics import registry as metrics
+from payloads.schema import SchemaError
+from workers.pool import offload
+
+from .discovery import DEFAULT_INTERVAL, Discovery, Peer, parse_address
+from .protocol import (
+    DEFAULT_DISCOVERY_PORT,
+    DEFAULT_PORT,
+    MAX_HANDSHAKE_FRAME,
+    VERSION,
+    Announcement,
+    FrameType,
+    LanError,
+    auth_key,
+    clip_body,
+    encode_frame,
+    json_body,
+    new_nonce,
+    parse_clip,
+    parse_json,
+    read_frame,
+    session_key,
+)
+
+logger = logging.getLogger(__name__)
+
+ClipCallback = Callable[[str, dict[str, Any], str], None]
+
+CONNECT_TIMEOUT = 0.5          # a LAN peer answers fast or not at all
+HANDSHAKE_TIMEOUT = 2.0
+ACK_TIMEOUT = 10.0
+_RECENT_IDS = 1024
+
+_CLIPS = metrics.counter(
+    "lan_clips", "Clips over the LAN transport by direction and outcome", ("direction", "outcome"),
+)
+
+
+def validate_clip_header(header: dict[str, Any]) -> tuple[str, dict[str, Any]]:
+    """``(clip id, metadata)`` of a peer's CLIP header; raises ``SchemaError``."""
+    clip_id, metadata = header.get("id"), header.get("metadata", {})
+    if not isinstance(clip_id, str) or not clip_id:
+        raise SchemaError("$.id", "must be a non-empty string")
+    if not isinstance(metadata, dict):
+        raise SchemaError("$.metadata", "must be an object")
+    encoded = outgoing_metadata(metadata)
+    if encoded is not None and len(encoded) > MAX_METADATA_HEADER:
+        raise SchemaError("$.metadata", "is too large")
+    return clip_id, metadata
+
+
+class _Connection:
+    """Client side of one authenticated session with a peer."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                 key: bytes, device: str) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.key = key
+        self.device = device
+        self.send_seq = 0
+        self.recv_seq = 0
+        self.lock = asyncio.Lock()
+
+    @classmethod
+    async def open(cls, peer: Peer, auth: bytes, device: str) -> "_Connection":
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(peer.host, peer.port), CONNECT_TIMEOUT,
+        )
+        try:
+            nonce = new_nonce()
+            hello = {"v": VERSION, "device": device, "nonce": nonce.hex()}
+            writer.write(encode_frame(auth, FrameType.HELLO, 0, json_body(hello)))
+            ftype, body = await asyncio.wait_for(
+                read_frame(reader, auth, 0, MAX_HANDSHAKE_FRAME), HANDSHAKE_TIMEOUT,
+            )
+            welcome = parse_json(body)
+            if ftype is not FrameType.WELCOME or welcome.get("echo") != nonce.hex():
+                raise LanError("bad handshake reply")
+            server_nonce = bytes.fromhex(str(welcome.get("nonce", "")))
+        except (asyncio.TimeoutError, ValueError, LanError) as exc:
+            writer.close()
+            raise LanError(f"handshake with {peer.address} failed: {exc}") from exc
+        return cls(reader, writer, session_key(auth, nonce, server_nonce), str(welcome.get("device")))
+
+    async def request(self, ftype: FrameType, body: bytes) -> tuple[FrameType, bytes]:
+        async with self.lock:
+            self.send_seq += 1
+            self.writer.write(encode_frame(self.key, ftype, self.send_seq, body))
+            await self.writer.drain()
+            self.recv_seq += 1
+            return await asyncio.wait_for(read_frame(self.reader, self.key, self.recv_seq), ACK_TIMEOUT)
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class LanTransport:
+    """Send clips straight to peers; receive theirs."""
+
+    def __init__(
+        self,
+        *,
+        device_id: str,
+        group_key: GroupKey,
+        keyring: Keyring | None = None,
+        host: str = "0.0.0.0",
+        port: int = DEFAULT_PORT,
+        discovery_port: int = DEFAULT_DISCOVERY_PORT,
+        discovery_targets: Iterable[str] | None = None,
+        discovery_interval: float = DEFAULT_INTERVAL,
+        static_peers: Iterable[str] = (),
+        seal: bool = False,
+        on_clip: ClipCallback | None = None,
+    ) -> None:
+        self._device = device_id or uuid.uuid4().hex
+        self._group_key = group_key
+        self._keyring = keyring
+        self._auth = auth_key(group_key.key)
+        self._host = host
+        self._port = port
+        self._seal = seal
+        self._on_clip = on_clip
+        self._discovery_port = discovery_port
+        self._discovery_targets = (
+            [parse_address(t, discovery_port) for t in discovery_targets]
+            if discovery_targets is not None else None
+        )
+        self._discovery_interval = discovery_interval
+        self._static_peers = [parse_address(p, DEFAULT_PORT) for p in static_peers]
+        self._server: Optional[asyncio.Server] = None
+        self._discovery: Optional[Discovery] = None
+        self._connections: dict[str, _Connection] = {}
+        self._inbound: dict[asyncio.StreamWriter, asyncio.Task] = {}
+        self._recent: OrderedDict[str, None] = OrderedDict()
+
+    # ── lifecycle ────────────────────────────────────────────────────
+
+    @property
+    def device_id(self) -> str:
+        return self._device
+
+    @property
+    def port(self) -> int:
+        """The TCP port actually bound (useful with ``port=0``)."""
+        if self._server is None or not self._server.sockets:
+            return self._port
+        return self._server.sockets[0].getsockname()[1]
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._serve, self._host, self._port)
+        self._discovery = Discovery(
+            auth=self._auth,
+            announcement=Announcement(self._device, self.port, self._group_key.key_id.hex()),
+            port=self._discovery_port,
+            targets=self._discovery_targets,
+            interval=self._discovery_interval,
+        )
+        for index, (host, port) in enumerate(self._static_peers):
+            self._discovery.add_static(f"static-{index}", host, port)
+        try:
+            await self._discovery.start()
+        except OSError as exc:
+            logger.warning("LAN discovery unavailable (%s); using static peers only", exc)
+        logger.info("LAN transport listening on port %d", self.port)
+
+    async def close(self) -> None:
+        if self._discovery is not None:
+            self._discovery.close()
+        for connection in self._connections.values():
+            connection.close()
+        self._connections.clear()
+        for writer in list(self._inbound):
+            writer.close()
+        if self._inbound:
+            # closed sockets end the handlers; cancelling them would not be clean
+            await asyncio.wait(list(self._inbound.values()), timeout=1.0)
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def peers(self) -> list[Peer]:
+        return self._discovery.peers() if self._discovery is not None else []
+
+    # ── sending ──────────────────────────────────────────────────────
+
+    async def send_clip(
+        self,
+        text: str,
+        *,
+        metadata: dict[str, Any] | None = None,
+        idempotency_key: str | None = None,
+        recipients: Iterable[str] = (),
+    ) -> Optional[dict[str, Any]]:
+        """Deliver *text* to the reachable peers it is meant for.
+
+        Returns None unless every intended device acknowledged it; with
+        no targets and no *recipients* that is never the case.
+        """
+        wanted = set((metadata or {}).get(TARGETS_KEY) or ()) or set(recipients)
+        peers = self.peers()
+        if (metadata or {}).get(TARGETS_KEY):
+            peers = [p for p in peers if p.device in wanted]
+        if not peers:
+            return None
+        clip_id = idempotency_key or uuid.uuid4().hex
+        data = text.encode("utf-8")
+        if self._seal:
+            from e2e.stream import encrypt_bytes
+            data = await offload(encrypt_bytes, self._group_key.key, self._group_key.key_id, data)
+        body = clip_body({"id": clip_id, "metadata": metadata or {}, "sealed": self._seal}, data)
+
+        results = await asyncio.gather(*(self._deliver(peer, body) for peer in peers))
+        delivered = [device for device in results if device is not None]
+        if not delivered:
+            _CLIPS.labels("out", "unreachable").inc()
+            logger.info("No LAN peer took the clip; falling back to the API")
+            return None
+        if not wanted or not wanted.issubset(delivered):
+            _CLIPS.labels("out", "partial").inc()
+            logger.debug("LAN reached %d of the clip's devices; sending it through the API too",
+                         len(delivered))
+            return None
+        _CLIPS.labels("out", "sent").inc()
+        return {"id": clip_id, "via": "lan", "peers": delivered}
+
+    async def _deliver(self, peer: Peer, body: bytes) -> Optional[str]:
+        # a kept-alive connection may have gone stale: retry once on a new one
+        for attempt in range(2):
+            connection = self._connections.get(peer.address)
+            try:
+                if connection is None:
+                    connection = await _Connection.open(peer, self._auth, self._device)
+                    # another send may have connected meanwhile; keep one
+                    existing = self._connections.setdefault(peer.address, connection)
+                    if existing is not connection:
+                        connection.close()
+                        connection = existing
+                ftype, reply = await connection.request(FrameType.CLIP, body)
+            except (OSError, asyncio.TimeoutError, LanError) as exc:
+                self._drop(peer.address)
+                if attempt or connection is None:
+                    logger.debug("LAN send to %s failed: %s", peer.address, exc)
+                    return None
+                continue
+            if ftype is FrameType.ACK:
+                return connection.device
+            logger.warning("LAN peer %s refused the clip: %s", peer.address, reply[:200])
+            return None
+        return None
+
+    def _drop(self, address: str) -> None:
+        connection = self._connections.pop(address, None)
+        if connection is not None:
+            connection.close()
+
+    # ── receiving ────────────────────────────────────────────────────
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        peer = writer.get_extra_info("peername")
+        self._inbound[writer] = asyncio.current_task()
+        try:
+            ftype, body = await asyncio.wait_for(
+                read_frame(reader, self._auth, 0, MAX_HANDSHAKE_FRAME), HANDSHAKE_TIMEOUT,
+            )
+            hello = parse_json(body)
+            if ftype is not FrameType.HELLO or hello.get("v") != VERSION:
+                raise LanError("expected HELLO")
+            client_nonce = bytes.fromhex(str(hello.get("nonce", "")))
+            device = str(hello.get("device", ""))
+            nonce = new_nonce()
+            welcome = {"v": VERSION, "device": self._device, "nonce": nonce.hex(), "echo": client_nonce.hex()}
+            writer.write(encode_frame(self._auth, FrameType.WELCOME, 0, json_body(welcome)))
+            key = session_key(self._auth, client_nonce, nonce)
+
+            seq = 0
+            while True:
+                seq += 1
+                ftype, body = await read_frame(reader, key, seq)
+                if ftype is not FrameType.CLIP:
+                    raise LanError(f"unexpected {ftype.name} frame")
+                try:
+                    reply_type, reply = FrameType.ACK, await self._receive(body, device)
+                except LanError as exc:
+                    _CLIPS.labels("in", "refused").inc()
+                    reply_type, reply = FrameType.ERROR, {"error": str(exc)}
+                writer.write(encode_frame(key, reply_type, seq, json_body(reply)))
+                await writer.drain()
+        except (LanError, ValueError, asyncio.TimeoutError, ConnectionError) as exc:
+            logger.debug("LAN connection from %s ended: %s", peer, exc)
+        finally:
+            self._inbound.pop(writer, None)
+            writer.close()
+
+    async def _receive(self, body: bytes, device: str) -> dict[str, Any]:
+        header, data = parse_clip(body)
+        try:
+            clip_id, metadata = validate_clip_header(header)
+        except SchemaError as exc:
+            raise LanError(f"invalid clip: {exc}") from exc
+        if clip_id in self._recent:
+            _CLIPS.labels("in", "duplicate").inc()
+            return {"id": clip_id, "status": "duplicate"}
+        if header.get("sealed"):
+            if self._keyring is None:
+                raise LanError("cannot open sealed clips")
+            from e2e.stream import E2EError, decrypt_bytes
+            try:
+                data = await offload(decrypt_bytes, data, self._keyring.lookup)
+            except E2EError as exc:
+                raise LanError(str(exc)) from exc
+        try:
+            text = data.decode("utf-8")
+        except UnicodeDecodeError as exc:
+            raise LanError("clip is not UTF-8 text") from exc
+        self._recent[clip_id] = None
+        if len(self._recent) > _RECENT_IDS:
+            self._recent.popitem(last=False)
+        _CLIPS.labels("in", "received").inc()
+        if self._on_clip is not None:
+            try:
+                self._on_clip(text, metadata, device)
+            except Exception:
+                logger.exception("LAN clip callback failed")
+        return {"id": clip_id, "status": "created"}
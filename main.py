@@ -1,6 +1,78 @@
-"""Launch the Biome desktop client."""
+"""Launch the Biome desktop client.
+
+    python main.py [--minimized]          start (or show the running app)
+    python main.py send [TEXT]            send TEXT (or stdin) via the app
+    python main.py send-file PATH         send a text file's contents
+        --to DEVICE_ID (repeatable)       only to these devices, not the
+                                          tray's "Send to" selection
+    python main.py status                 print the running app's status
+
+If an instance is already running the command is forwarded to it over
+the local IPC socket and this process exits without importing Qt.
+"""
+
+if __name__ == "__main__":
+    # only in the launched process: spawn workers re-import this module
+    # as ``__mp_main__`` and must not install the import timer again
+    from diagnostics import startup
+
+    startup.configure()
+
+import argparse  # noqa: E402
+import json  # noqa: E402
+import os  # noqa: E402
+import sys  # noqa: E402
+
+from ipc import protocol  # noqa: E402
+
+
+def _parse_args(argv: list[str]) -> tuple[str, dict]:
+    parser = argparse.ArgumentParser(prog="biome")
+    parser.add_argument("--minimized", action="store_true", help="start in the tray")
+    sub = parser.add_subparsers(dest="cmd")
+    sub.add_parser("show")
+    send = sub.add_parser("send")
+    send.add_argument("text", nargs="?")
+    send_file = sub.add_parser("send-file")
+    send_file.add_argument("path")
+    for p in (send, send_file):
+        p.add_argument("--to", action="append", metavar="DEVICE_ID", help="target device (repeatable)")
+    sub.add_parser("status")
+    # Qt may receive its own arguments (-platform, -style …)
+    args, _ = parser.parse_known_args(argv)
+
+    cmd = args.cmd or "show"
+    payload: dict = {}
+    if cmd == "send":
+        text = args.text if args.text is not None else sys.stdin.read()
+        payload = {"text": text}
+    elif cmd == "send-file":
+        payload = {"path": os.path.abspath(args.path)}
+    if getattr(args, "to", None):
+        payload["targets"] = args.to
+    return cmd, payload
+
+
+def main() -> int:
+    cmd, payload = _parse_args(sys.argv[1:])
+    try:
+        reply = protocol.request(cmd, payload)
+    except (protocol.IpcError, OSError) as exc:
+        # an instance is running but did not answer (stalled or crashed)
+        print(json.dumps({"ok": False, "error": str(exc) or type(exc).__name__}))
+        return 1
+    if reply is not None:
+        if cmd != "show":
+            print(json.dumps(reply))
+        return 0 if reply.get("ok") else 1
+    if cmd == "status":
+        print(json.dumps({"ok": False, "running": False}))
+        return 1
+
+    from app import run
+    run(initial_command=None if cmd == "show" else (cmd, payload))
+    return 0
 
-from app import run
 
 if __name__ == "__main__":
-    run()
+    sys.exit(main())
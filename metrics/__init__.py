@@ -0,0 +1 @@
+"""In-process metrics and their Prometheus / JSON export."""
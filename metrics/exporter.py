@@ -0,0 +1,165 @@
+"""Publish the metrics registry for scraping.
+
+Two optional outlets, configured from the environment like the stall
+watchdog:
+
+    BIOME_METRICS_TEXTFILE=path.prom   rewrite a Prometheus text file
+                                       (for node_exporter's textfile
+                                       collector)
+    BIOME_METRICS_INTERVAL_S=15        how often to rewrite it
+    BIOME_METRICS_PORT=9464            serve /metrics and /metrics.json
+                                       on 127.0.0.1
+
+Both run on daemon threads and never touch the event loop.  With
+neither set, ``configure`` returns an exporter whose ``start``/``stop``
+do nothing.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+
+from .registry import REGISTRY, Registry
+
+logger = logging.getLogger(__name__)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_INTERVAL_S = 15.0
+
+
+def write_textfile(path: Path, registry: Registry = REGISTRY) -> None:
+    """Atomically replace *path* so a collector never reads half a file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(registry.render_prometheus(), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _handler(registry: Registry) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 — http.server naming
+            path = self.path.split("?", 1)[0]
+            if path == "/metrics":
+                body = registry.render_prometheus().encode("utf-8")
+                content_type = PROMETHEUS_CONTENT_TYPE
+            elif path == "/metrics.json":
+                body = json.dumps(registry.snapshot()).encode("utf-8")
+                content_type = "application/json"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args) -> None:
+            logger.debug("metrics %s", format % args)
+
+    return Handler
+
+
+@dataclass
+class MetricsExporter:
+    textfile: Optional[Path] = None
+    interval_s: float = DEFAULT_INTERVAL_S
+    port: int = 0
+    registry: Registry = REGISTRY
+    _server: Optional[ThreadingHTTPServer] = None
+    _threads: list[threading.Thread] = field(default_factory=list)
+    _stop: threading.Event = field(default_factory=threading.Event)
+
+    @property
+    def enabled(self) -> bool:
+        return self.textfile is not None or self.port > 0
+
+    @property
+    def address(self) -> Optional[tuple[str, int]]:
+        return self._server.server_address[:2] if self._server is not None else None
+
+    def start(self) -> None:
+        if not self.enabled or self._threads:
+            return
+        self._stop.clear()
+        if self.textfile is not None:
+            thread = threading.Thread(target=self._write_loop, name="metrics-textfile", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+            logger.info("Writing metrics to %s every %.0f s", self.textfile, self.interval_s)
+        if self.port > 0:
+            try:
+                self._server = ThreadingHTTPServer(("127.0.0.1", self.port), _handler(self.registry))
+            except OSError as exc:
+                logger.warning("Metrics endpoint unavailable on port %d: %s", self.port, exc)
+            else:
+                self._server.daemon_threads = True
+                thread = threading.Thread(
+                    target=self._server.serve_forever, name="metrics-http", daemon=True,
+                )
+                thread.start()
+                self._threads.append(thread)
+                logger.info("Serving metrics on http://127.0.0.1:%d/metrics", self.address[1])
+
+    def stop(self) -> None:
+        """Stop both outlets; the text file gets one last write."""
+        if not self._threads:
+            return
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+        self._threads.clear()
+        if self.textfile is not None:
+            self._write()
+
+    def _write_loop(self) -> None:
+        while True:
+            self._write()
+            if self._stop.wait(self.interval_s):
+                return
+
+    def _write(self) -> None:
+        try:
+            write_textfile(self.textfile, self.registry)
+        except OSError as exc:
+            logger.warning("Could not write metrics to %s: %s", self.textfile, exc)
+        except Exception:      # keep _write_loop alive for the next interval
+            logger.exception("Could not render metrics for %s", self.textfile)
+
+
+def configure(environ: dict[str, str] | None = None) -> MetricsExporter:
+    """Build an exporter from ``BIOME_METRICS_*`` env vars."""
+    environ = os.environ if environ is None else environ
+
+    textfile = environ.get("BIOME_METRICS_TEXTFILE") or None
+    interval = DEFAULT_INTERVAL_S
+    raw = environ.get("BIOME_METRICS_INTERVAL_S", "")
+    if raw:
+        try:
+            interval = max(1.0, float(raw))
+        except ValueError:
+            logger.warning("Ignoring invalid BIOME_METRICS_INTERVAL_S=%r", raw)
+    port = 0
+    raw = environ.get("BIOME_METRICS_PORT", "")
+    if raw:
+        try:
+            port = int(raw)
+        except ValueError:
+            logger.warning("Ignoring invalid BIOME_METRICS_PORT=%r", raw)
+
+    return MetricsExporter(
+        textfile=Path(textfile).expanduser() if textfile else None,
+        interval_s=interval,
+        port=max(0, port),
+    )
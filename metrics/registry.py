@@ -0,0 +1,324 @@
+"""In-process metrics: counters, gauges and fixed-bucket histograms.
+
+Hot paths (every send, every clipboard event) must not contend on a
+lock, so counters and histograms keep one cell per thread: a thread
+finds its own cell through ``threading.local`` and bumps it without
+synchronisation, and a scrape sums the cells.  The lock is only taken
+when a thread touches a metric for the first time or a new label set is
+created.  Reads are eventually consistent, which is all a scrape needs.
+
+Metrics live in a ``Registry`` (``REGISTRY`` by default) and render as
+Prometheus text exposition format 0.0.4 or as a JSON snapshot.
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+from typing import Callable, Iterable, Optional, Union
+
+Number = Union[int, float]
+LabelValues = tuple[str, ...]
+
+# seconds; suits HTTP round trips and UI-thread work alike
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: Number) -> str:
+    if isinstance(value, float):
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+        if value.is_integer():
+            return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _Cells:
+    """One mutable list per thread; ``total`` sums them position-wise."""
+
+    __slots__ = ("_size", "_cells", "_local", "_lock")
+
+    def __init__(self, size: int) -> None:
+        self._size = size
+        self._cells: list[list[Number]] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def mine(self) -> list[Number]:
+        try:
+            return self._local.cell
+        except AttributeError:
+            cell: list[Number] = [0] * self._size
+            with self._lock:
+                self._cells.append(cell)
+            self._local.cell = cell
+            return cell
+
+    def total(self) -> list[Number]:
+        with self._lock:
+            cells = list(self._cells)
+        sums: list[Number] = [0] * self._size
+        for cell in cells:
+            for i, value in enumerate(cell):
+                sums[i] += value
+        return sums
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._children: dict[LabelValues, object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str):
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}")
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _items(self) -> list[tuple[LabelValues, object]]:
+        """Children sorted by label values, copied under the lock so
+        ``labels()`` on another thread can't change the dict mid-scrape."""
+        with self._lock:
+            items = list(self._children.items())
+        return sorted(items)
+
+    def _default(self):
+        if self.labelnames:
+            raise ValueError(f"{self.name} needs labels {self.labelnames}")
+        return self.labels()
+
+    def samples(self) -> list[tuple[str, str, Number]]:
+        """``(suffix, label string, value)`` rows for the exposition."""
+        raise NotImplementedError
+
+
+class _CounterChild:
+    __slots__ = ("_cells",)
+
+    def __init__(self) -> None:
+        self._cells = _Cells(1)
+
+    def inc(self, amount: Number = 1) -> None:
+        self._cells.mine()[0] += amount
+
+    @property
+    def value(self) -> Number:
+        return self._cells.total()[0]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> None:
+        # text format 0.0.4 names the counter family by its sample name
+        super().__init__(name if name.endswith("_total") else name + "_total", help, labelnames)
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: Number = 1) -> None:
+        self._default().inc(amount)
+
+    @property
+    def value(self) -> Number:
+        return self._default().value
+
+    def samples(self) -> list[tuple[str, str, Number]]:
+        return [("", _format_labels(self.labelnames, values), child.value)
+                for values, child in self._items()]
+
+
+class _GaugeChild:
+    __slots__ = ("_value",)
+
+    def __init__(self) -> None:
+        self._value: Number = 0
+
+    def set(self, value: Number) -> None:
+        self._value = value          # a single store; no lock needed
+
+    @property
+    def value(self) -> Number:
+        return self._value
+
+
+class Gauge(_Metric):
+    """A settable value, or one computed at scrape time by *fn*."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = (),
+                 fn: Optional[Callable[[], Number]] = None) -> None:
+        super().__init__(name, help, labelnames)
+        self._fn = fn
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def set(self, value: Number) -> None:
+        self._default().set(value)
+
+    def set_function(self, fn: Optional[Callable[[], Number]]) -> None:
+        self._fn = fn
+
+    @property
+    def value(self) -> Number:
+        return self._fn() if self._fn is not None else self._default().value
+
+    def samples(self) -> list[tuple[str, str, Number]]:
+        if self._fn is not None:
+            try:
+                return [("", "", self._fn())]
+            except Exception:        # a broken callback must not break the scrape
+                return []
+        return [("", _format_labels(self.labelnames, values), child.value)
+                for values, child in self._items()]
+
+
+class _HistogramChild:
+    __slots__ = ("_bounds", "_cells")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self._bounds = bounds
+        # per bucket counts, +Inf bucket, sum, count
+        self._cells = _Cells(len(bounds) + 3)
+
+    def observe(self, value: float) -> None:
+        cell = self._cells.mine()
+        cell[bisect.bisect_left(self._bounds, value)] += 1
+        cell[-2] += value
+        cell[-1] += 1
+
+    def snapshot(self) -> tuple[list[int], float, int]:
+        totals = self._cells.total()
+        return totals[:-2], totals[-2], totals[-1]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = (),
+                 buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default().observe(value)
+
+    def samples(self) -> list[tuple[str, str, Number]]:
+        rows: list[tuple[str, str, Number]] = []
+        for values, child in self._items():
+            counts, total, count = child.snapshot()
+            cumulative = 0
+            for bound, bucket in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket
+                le = 'le="' + _format_value(float(bound)) + '"'
+                rows.append(("_bucket", _format_labels(self.labelnames, values, le), cumulative))
+            labels = _format_labels(self.labelnames, values)
+            rows.append(("_sum", labels, total))
+            rows.append(("_count", labels, count))
+        return rows
+
+
+class Registry:
+    """Named metrics; ``counter``/``gauge``/``histogram`` get or create."""
+
+    def __init__(self, prefix: str = "biome_") -> None:
+        self._prefix = prefix
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name: str, help: str, **kwargs):
+        full = self._prefix + name
+        metric = self._metrics.get(full)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(full)
+                if metric is None:
+                    metric = self._metrics[full] = cls(full, help, **kwargs)
+        if not isinstance(metric, cls):
+            raise ValueError(f"{full} is already registered as a {metric.kind}")
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._get(Counter, name, help, labelnames=labelnames)
+
+    def gauge(self, name: str, help: str, labelnames: tuple[str, ...] = (),
+              fn: Optional[Callable[[], Number]] = None) -> Gauge:
+        gauge = self._get(Gauge, name, help, labelnames=labelnames)
+        if fn is not None:
+            gauge.set_function(fn)
+        return gauge
+
+    def histogram(self, name: str, help: str, labelnames: tuple[str, ...] = (),
+                  buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, help, labelnames=labelnames, buckets=buckets)
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines: list[str] = []
+        for metric in metrics:
+            name = metric.name
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for suffix, labels, value in metric.samples():
+                lines.append(f"{name}{suffix}{labels} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> dict[str, list[dict]]:
+        """JSON-friendly ``{name: [{"labels": {...}, "value"|"buckets": ...}]}``."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        result: dict[str, list[dict]] = {}
+        for metric in metrics:
+            rows: list[dict] = []
+            if isinstance(metric, Histogram):
+                for values, child in metric._items():
+                    counts, total, count = child.snapshot()
+                    rows.append({
+                        "labels": dict(zip(metric.labelnames, values)),
+                        "buckets": dict(zip([str(b) for b in metric.buckets] + ["+Inf"], counts)),
+                        "sum": total,
+                        "count": count,
+                    })
+            elif isinstance(metric, Gauge) and metric._fn is not None:
+                rows.extend({"labels": {}, "value": v} for _, _, v in metric.samples())
+            else:
+                for values, child in metric._items():
+                    rows.append({"labels": dict(zip(metric.labelnames, values)), "value": child.value})
+            result[metric.name] = rows
+        return result
+
+
+REGISTRY = Registry()
+
+counter = REGISTRY.counter
+gauge = REGISTRY.gauge
+histogram = REGISTRY.histogram
@@ -0,0 +1 @@
+"""Offline outbox for payloads that could not be delivered."""
@@ -0,0 +1,450 @@
+"""Drain the outbox once the backend is reachable again.
+
+``OutboxReconciler`` replays queued items without reordering anyone's
+clips or hammering a server that has just come back:
+
+* Items are grouped into lanes by the devices they go to
+  (``targetDeviceIds``), FIFO within each; items sharing any device
+  share a lane.  Up to ``parallelism`` lanes drain at once, but a lane
+  is only ever held by one worker, so every device receives its clips
+  in the order they were queued.  A broadcast (no targets) reaches
+  every device, so it is a barrier: it waits for everything queued
+  before it, and everything after it waits for it.
+* A lane sends up to ``batch_size`` items per ``POST /api/clips/batch``.
+  When batching is unavailable (no endpoint, or E2E on) items go one by
+  one.
+* Every item is sent with its id as the idempotency key.  A 409 or a
+  ``"duplicate"`` batch result means the server already has it, and it
+  is dropped from the outbox like a successful send.
+* Items the server refuses outright (400/413/422, schema violations) are
+  set aside as ``*.rejected`` so they cannot block their lane.
+* A transport error, 408/429 or 5xx pauses every lane.  The reconciler
+  probes health with exponential backoff and resumes on its own, or
+  when ``set_online(True)`` reports connectivity from elsewhere.  The
+  backoff carries over between pauses and only resets once a batch
+  settles, so a server that is healthy but keeps failing sends is not
+  retried every second.
+* 401/403 needs the user to fix their credentials, not a retry: the
+  drain stops and ``kick`` does nothing until ``set_authorized(True)``
+  (a send that went through) lifts the block.
+
+Progress is published through ``on_progress`` (at most every 100 ms
+plus on every state change) for the tray, Dashboard and Settings.
+Pure asyncio, so ``cli.py`` uses it too.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum, auto
+from typing import Any, Awaitable, Callable, Optional
+
+import httpx
+
+from api.devices import TARGETS_KEY
+from api.wire import batch_entry
+from payloads.schema import SchemaError
+from workers.pool import offload
+
+from .store import Outbox, OutboxItem
+
+logger = logging.getLogger(__name__)
+
+SendFn = Callable[..., Awaitable[Any]]
+BatchFn = Callable[[list[dict[str, Any]]], Awaitable[Optional[list[dict[str, Any]]]]]
+HealthFn = Callable[[], Awaitable[bool]]
+ProgressCallback = Callable[["ReconcileProgress"], None]
+
+DEFAULT_PARALLELISM = 4
+DEFAULT_BATCH_SIZE = 50
+PROBE_MIN_SECONDS = 1.0
+PROBE_MAX_SECONDS = 30.0
+PROGRESS_INTERVAL = 0.1
+
+_DUPLICATE = frozenset({409})
+_REJECTED = frozenset({400, 413, 422})
+_NO_BATCH = frozenset({404, 405, 501})
+_AUTH = frozenset({401, 403})
+
+
+class _Outcome(Enum):
+    SENT = auto()
+    DUPLICATE = auto()
+    REJECTED = auto()
+    RETRY = auto()
+
+
+class _Offline(Exception):
+    """The backend is unreachable — pause and retry the lane later."""
+
+
+class _AuthRequired(Exception):
+    """The backend refused our credentials — stop until the user acts."""
+
+
+@dataclass
+class ReconcileProgress:
+    pending: int = 0         # items left in the outbox
+    total: int = 0           # items picked up by the current drain
+    sent: int = 0
+    duplicates: int = 0      # already on the server (idempotency key)
+    rejected: int = 0
+    running: bool = False
+    paused: bool = False
+    auth_required: bool = False     # stopped on 401/403
+
+    @property
+    def done(self) -> int:
+        return self.sent + self.duplicates + self.rejected
+
+    def describe(self) -> str:
+        if self.auth_required:
+            return f"sign-in required — {self.pending} pending"
+        if self.running and self.paused:
+            return f"paused while offline — {self.pending} pending"
+        if self.running:
+            return f"sending {self.done}/{self.total}"
+        if self.pending == 0:
+            return "empty"
+        return f"{self.pending} pending item{'s' if self.pending != 1 else ''}"
+
+
+def item_targets(item: OutboxItem) -> frozenset[str]:
+    """Devices an item goes to; empty for a broadcast to every device."""
+    targets = (item.metadata or {}).get(TARGETS_KEY) or ()
+    return frozenset(str(t) for t in targets)
+
+
+@dataclass
+class _Lane:
+    devices: Optional[set[str]]     # None: a run of broadcasts
+    items: deque[OutboxItem]
+
+
+def plan_lanes(items: list[OutboxItem]) -> list[list[_Lane]]:
+    """Split FIFO *items* into phases of lanes that may drain in parallel."""
+    phases: list[list[_Lane]] = []
+    current: list[_Lane] = []
+    for item in items:
+        targets = item_targets(item)
+        broadcast_run = len(current) == 1 and current[0].devices is None
+        if not targets:
+            if not broadcast_run:
+                if current:
+                    phases.append(current)
+                current = [_Lane(None, deque())]
+            current[0].items.append(item)
+            continue
+        if broadcast_run:
+            phases.append(current)
+            current = []
+        overlapping = [lane for lane in current if lane.devices & targets]
+        lane = _Lane(set(targets), deque())
+        for other in overlapping:
+            # disjoint until now, so their relative order does not matter
+            current.remove(other)
+            lane.devices |= other.devices
+            lane.items.extend(other.items)
+        lane.items.append(item)
+        current.append(lane)
+    if current:
+        phases.append(current)
+    return phases
+
+
+class OutboxReconciler:
+    """Ordered, parallel, resumable replay of ``Outbox`` items."""
+
+    def __init__(
+        self,
+        send: SendFn,
+        *,
+        outbox: Outbox,
+        send_batch: BatchFn | None = None,
+        health: HealthFn | None = None,
+        parallelism: int = DEFAULT_PARALLELISM,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        pause_when_offline: bool = True,
+        on_progress: ProgressCallback | None = None,
+    ) -> None:
+        self._send = send
+        self._send_batch = send_batch
+        self._health = health
+        self._outbox = outbox
+        self._parallelism = max(1, parallelism)
+        self._batch_size = max(1, batch_size)
+        self._pause_when_offline = pause_when_offline
+        self._on_progress = on_progress
+
+        self._progress = ReconcileProgress(pending=outbox.count())
+        self._online = asyncio.Event()
+        self._online.set()
+        self._task: Optional[asyncio.Task] = None
+        self._probe_task: Optional[asyncio.Task] = None
+        self._rescan = False
+        self._gave_up = False
+        self._auth_blocked = False
+        self._probe_delay = PROBE_MIN_SECONDS
+        self._last_notify = 0.0
+
+    # ── public API ───────────────────────────────────────────────────
+
+    @property
+    def progress(self) -> ReconcileProgress:
+        return self._progress
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def kick(self) -> None:
+        """Start a drain, or make the running one rescan when it finishes."""
+        if self._auth_blocked:
+            return
+        if self.running:
+            self._rescan = True
+            return
+        self._task = asyncio.get_running_loop().create_task(self.drain())
+
+    def set_online(self, online: bool) -> None:
+        """Connectivity reported from elsewhere (health check, a send)."""
+        if online and not self._online.is_set():
+            logger.info("Backend reachable again — resuming outbox drain")
+            self._online.set()
+            self._progress.paused = False
+            self._notify(force=True)
+        elif not online and self._online.is_set() and self.running:
+            self._pause()
+
+    def set_authorized(self, authorized: bool) -> None:
+        """Credentials were accepted elsewhere (a send went through)."""
+        if authorized and self._auth_blocked:
+            logger.info("Backend accepted credentials again — outbox drain unblocked")
+            self._auth_blocked = False
+            self._progress.auth_required = False
+            self._notify(force=True)
+
+    async def drain(self) -> ReconcileProgress:
+        """Replay everything currently in the outbox; returns the totals.
+
+        With ``pause_when_offline=False`` the drain gives up at the first
+        connectivity failure instead of waiting.
+        """
+        progress = self._progress = ReconcileProgress(running=True)
+        self._gave_up = False
+        self._auth_blocked = False
+        seen: set[str] = set()
+        try:
+            while True:
+                self._rescan = False
+                items = [i for i in await offload(self._outbox.pending) if i.id not in seen]
+                seen.update(item.id for item in items)
+                progress.total += len(items)
+                progress.pending = progress.total - progress.done
+                self._notify(force=True)
+                if items:
+                    await self._drain_pass(items)
+                if self._gave_up or not (items and self._rescan):
+                    break
+        finally:
+            if self._probe_task is not None:
+                self._probe_task.cancel()
+                self._probe_task = None
+            self._online.set()       # the next drain starts by trying
+            progress.running = False
+            progress.paused = False
+            progress.auth_required = self._auth_blocked
+            progress.pending = self._outbox.count()
+            self._notify(force=True)
+        logger.info(
+            "Outbox drain: %d sent, %d already on server, %d rejected, %d left",
+            progress.sent, progress.duplicates, progress.rejected, progress.pending,
+        )
+        return progress
+
+    def close(self) -> None:
+        """Stop draining; unsent items stay in the outbox."""
+        for task in (self._task, self._probe_task):
+            if task is not None and not task.done():
+                task.cancel()
+
+    # ── lanes ────────────────────────────────────────────────────────
+
+    async def _drain_pass(self, items: list[OutboxItem]) -> None:
+        for lanes in plan_lanes(items):
+            await self._drain_phase(lanes)
+            if self._gave_up or any(lane.items for lane in lanes):
+                return     # a later phase must not overtake what is left
+
+    async def _drain_phase(self, lanes: list[_Lane]) -> None:
+        ready: asyncio.Queue[_Lane] = asyncio.Queue()
+        for lane in lanes:
+            ready.put_nowait(lane)
+
+        async def worker() -> None:
+            while not self._gave_up:
+                try:
+                    lane = ready.get_nowait().items
+                except asyncio.QueueEmpty:
+                    return
+                while lane and not self._gave_up:
+                    await self._online.wait()
+                    try:
+                        if not await self._advance(lane):
+                            break     # the rest waits for the next drain
+                    except _AuthRequired as exc:
+                        if not self._auth_blocked:
+                            logger.error("Backend refused credentials (%s) — outbox drain stopped", exc)
+                        self._auth_blocked = self._gave_up = True
+                        return
+                    except _Offline:
+                        if not self._pause_when_offline:
+                            self._gave_up = True
+                            return
+                        self._pause()
+
+        workers = min(self._parallelism, len(lanes))
+        await asyncio.gather(*(worker() for _ in range(workers)))
+
+    async def _advance(self, lane: deque[OutboxItem]) -> bool:
+        """Settle the next batch at the head of *lane*, in order.
+
+        Items leave the lane only once settled, so after an ``_Offline``
+        the lane resumes exactly where it stopped.  Returns False when
+        the server left part of a batch unanswered.
+        """
+        batch = list(itertools.islice(lane, self._batch_size))
+        results = None
+        if self._send_batch is not None and len(batch) > 1:
+            results = await self._try_batch(batch)
+        if results is not None:
+            for item in batch:
+                outcome = results.get(item.id, _Outcome.RETRY)
+                if outcome is _Outcome.RETRY:
+                    return False
+                await self._settle(item, outcome)
+                lane.popleft()
+            self._probe_delay = PROBE_MIN_SECONDS
+            return True
+
+        for item in batch:
+            await self._settle(item, await self._send_one(item))
+            lane.popleft()
+        self._probe_delay = PROBE_MIN_SECONDS
+        return True
+
+    async def _try_batch(self, batch: list[OutboxItem]) -> Optional[dict[str, _Outcome]]:
+        entries = []
+        for item in batch:
+            try:
+                entries.append(batch_entry(item.text, item.metadata or None, item.id))
+            except SchemaError:
+                return None      # let the one-by-one path reject it in order
+        try:
+            raw = await self._send_batch(entries)
+        except httpx.HTTPStatusError as exc:
+            status = exc.response.status_code
+            if status in _NO_BATCH:
+                logger.info("Server has no batch endpoint (%d); replaying one by one", status)
+                self._send_batch = None
+                return None
+            raise self._classify_error(exc) from exc
+        except httpx.HTTPError as exc:
+            raise _Offline(str(exc)) from exc
+        if raw is None:
+            return None
+        outcomes = {
+            "created": _Outcome.SENT,
+            "duplicate": _Outcome.DUPLICATE,
+            "rejected": _Outcome.REJECTED,
+        }
+        return {
+            r.get("idempotencyKey"): outcomes.get(r.get("status"), _Outcome.RETRY)
+            for r in raw if isinstance(r, dict)
+        }
+
+    async def _send_one(self, item: OutboxItem) -> _Outcome:
+        try:
+            await self._send(item.text, metadata=item.metadata or None, idempotency_key=item.id)
+        except SchemaError as exc:
+            item.last_error = str(exc)
+            return _Outcome.REJECTED
+        except httpx.HTTPStatusError as exc:
+            status = exc.response.status_code
+            if status in _DUPLICATE:
+                return _Outcome.DUPLICATE
+            if status in _REJECTED:
+                item.last_error = f"HTTP {status}"
+                return _Outcome.REJECTED
+            raise self._classify_error(exc) from exc
+        except httpx.HTTPError as exc:
+            raise _Offline(str(exc)) from exc
+        return _Outcome.SENT
+
+    @staticmethod
+    def _classify_error(exc: httpx.HTTPStatusError) -> Exception:
+        # anything that is not the item's fault stops or pauses the whole drain
+        status = exc.response.status_code
+        if status in _AUTH:
+            return _AuthRequired(f"HTTP {status}")
+        return _Offline(f"HTTP {status}")
+
+    async def _settle(self, item: OutboxItem, outcome: _Outcome) -> None:
+        progress = self._progress
+        if outcome is _Outcome.REJECTED:
+            logger.error("Outbox item %s rejected: %s", item.id[:8], item.last_error)
+            await offload(self._outbox.reject, item, item.last_error or "rejected")
+            progress.rejected += 1
+        else:
+            await offload(self._outbox.remove, item)
+            if outcome is _Outcome.DUPLICATE:
+                progress.duplicates += 1
+            else:
+                progress.sent += 1
+        progress.pending = max(0, progress.pending - 1)
+        self._notify()
+
+    # ── connectivity ─────────────────────────────────────────────────
+
+    def _pause(self) -> None:
+        if not self._online.is_set():
+            return
+        logger.warning("Backend unreachable — pausing outbox drain")
+        self._online.clear()
+        self._progress.paused = True
+        self._notify(force=True)
+        if self._health is not None and (self._probe_task is None or self._probe_task.done()):
+            self._probe_task = asyncio.get_running_loop().create_task(self._probe())
+
+    async def _probe(self) -> None:
+        while not self._online.is_set():
+            delay = self._probe_delay
+            self._probe_delay = min(delay * 2, PROBE_MAX_SECONDS)
+            await asyncio.sleep(delay)
+            try:
+                healthy = await self._health()
+            except Exception:   # a probe must never kill the drain
+                logger.debug("Health probe failed", exc_info=True)
+                healthy = False
+            if healthy:
+                self.set_online(True)
+                return
+
+    # ── progress ─────────────────────────────────────────────────────
+
+    def _notify(self, force: bool = False) -> None:
+        if self._on_progress is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_notify < PROGRESS_INTERVAL:
+            return
+        self._last_notify = now
+        try:
+            self._on_progress(self._progress)
+        except Exception:
+            logger.exception("Outbox progress callback failed")
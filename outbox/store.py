@@ -0,0 +1,143 @@
+"""File-per-item outbox at ``~/.biome/outbox/``.
+
+Each undelivered payload is one JSON file named
+``<created_ns>-<id>.json`` so a sorted directory listing is FIFO order
+and the Settings page can count items with a plain glob.  Files are
+written atomically (temp file + ``os.replace``).  The item ``id`` doubles
+as the idempotency key when the item is replayed.
+
+Pure Python — usable from the GUI and from the headless ``cli.py``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def default_outbox_dir() -> Path:
+    return Path.home() / ".biome" / "outbox"
+
+
+@dataclass
+class OutboxItem:
+    id: str
+    created_at: float
+    text: str
+    metadata: dict[str, Any] = field(default_factory=dict)
+    attempts: int = 0
+    last_error: Optional[str] = None
+    path: Optional[Path] = field(default=None, compare=False)
+
+    def to_json(self) -> dict[str, Any]:
+        data = asdict(self)
+        data.pop("path")
+        return data
+
+
+class Outbox:
+    """Durable FIFO of payloads waiting for the backend."""
+
+    def __init__(self, root: Path | None = None) -> None:
+        self._root = root or default_outbox_dir()
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    # ── writes ───────────────────────────────────────────────────────
+
+    def enqueue(self, text: str, metadata: dict[str, Any] | None = None) -> OutboxItem:
+        now_ns = time.time_ns()
+        item = OutboxItem(
+            id=uuid.uuid4().hex,
+            created_at=now_ns / 1e9,
+            text=text,
+            metadata=dict(metadata or {}),
+        )
+        item.path = self._root / f"{now_ns:020d}-{item.id}.json"
+        self._write(item)
+        logger.info("Queued payload %s in outbox (%d chars)", item.id[:8], len(text))
+        return item
+
+    def record_failure(self, item: OutboxItem, error: str) -> None:
+        item.attempts += 1
+        item.last_error = error
+        self._write(item)
+
+    def reject(self, item: OutboxItem, error: str) -> None:
+        """Set an item that can never be delivered aside as ``*.rejected``."""
+        if item.path is None:
+            return
+        item.attempts += 1
+        item.last_error = error
+        self._write(item)
+        try:
+            item.path.replace(item.path.with_suffix(".rejected"))
+        except OSError as exc:
+            logger.warning("Could not set aside outbox item %s: %s", item.id[:8], exc)
+
+    def remove(self, item: OutboxItem) -> None:
+        if item.path is None:
+            return
+        try:
+            item.path.unlink()
+        except FileNotFoundError:
+            pass
+
+    # ── reads ────────────────────────────────────────────────────────
+
+    def paths(self) -> list[Path]:
+        if not self._root.exists():
+            return []
+        return sorted(self._root.glob("*.json"))
+
+    def count(self) -> int:
+        return len(self.paths())
+
+    def pending(self, limit: int | None = None) -> list[OutboxItem]:
+        items: list[OutboxItem] = []
+        for path in self.paths():
+            item = self.load(path)
+            if item is not None:
+                items.append(item)
+                if limit is not None and len(items) >= limit:
+                    break
+        return items
+
+    def load(self, path: Path) -> Optional[OutboxItem]:
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                raw = json.load(f)
+            item = OutboxItem(**raw)
+        except (OSError, json.JSONDecodeError, TypeError) as exc:
+            logger.warning("Skipping unreadable outbox item %s: %s", path.name, exc)
+            return None
+        item.path = path
+        return item
+
+    # ── private ──────────────────────────────────────────────────────
+
+    def _write(self, item: OutboxItem) -> None:
+        assert item.path is not None
+        self._root.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self._root, prefix=".item-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(item.to_json(), f)
+            os.replace(tmp, item.path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
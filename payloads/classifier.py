@@ -11,6 +11,8 @@ from dataclasses import dataclass
 from enum import Enum, auto
 from typing import Optional
 
+from metrics import registry as metrics
+
 
 class PayloadKind(Enum):
     TEXT = auto()
@@ -34,6 +36,10 @@ class PayloadDecision:
 
 _URL_RE = re.compile(r"^https?://\S+$", re.IGNORECASE)
 
+_CLASSIFIED = metrics.counter(
+    "payloads_classified", "Clipboard payloads by classified kind", ("kind",),
+)
+
 
 class PayloadClassifier:
     """Classify raw clipboard data into a typed Payload."""
@@ -42,12 +48,14 @@ class PayloadClassifier:
         if isinstance(raw, str):
             text = raw.strip()
             if not text:
+                _CLASSIFIED.labels("empty").inc()
                 return None
             kind = PayloadKind.TEXT
             meta: dict[str, object] = {"length": len(text)}
             if _URL_RE.match(text):
                 kind = PayloadKind.URL
                 meta["domain"] = self._extract_domain(text)
+            _CLASSIFIED.labels(kind.name.lower()).inc()
             return Payload(kind=kind, data=text, metadata=meta)
         return None
 
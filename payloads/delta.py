@@ -0,0 +1,473 @@
+"""Delta encoding of a clip against a recently acknowledged one.
+
+Copying a large document, editing a line and copying it again should not
+re-upload the whole document.  ``DeltaEncoder`` remembers the last few
+clips the backend acknowledged and, when new content resembles one of
+them, produces an rsync-style binary diff against it:
+
+1. **Pick a base.**  Each remembered clip keeps a bottom-k MinHash
+   sketch of its content-defined chunks, cut where the rolling weak sum
+   over a ``CDC_WINDOW``-byte window hits a fixed bit pattern — so an
+   edit only changes the chunks around it, even in a single-line or
+   minified document.  The new content's sketch gives a Jaccard
+   estimate against every base in O(k); the most similar one above
+   ``MIN_SIMILARITY`` is used.
+2. **Diff.**  The base is cut into fixed blocks with a weak (rsync's
+   rolling sum) and strong (BLAKE2b-64) checksum.  A window slides over
+   the new content, updating the weak sum in O(1) per byte; weak hits
+   are confirmed with the strong hash, then matches are extended block-
+   and byte-wise.  Unmatched bytes become literals.
+
+Sketching (``sketch``) and diffing (``diff``) are pure-Python loops
+that hold the GIL and belong in the process pool; sketches use BLAKE2b
+rather than ``hash()`` so they agree across processes.  Comparing
+sketches (``DeltaEncoder.plan``) is cheap and runs in the thread pool.
+
+Wire format (``BMD1``)::
+
+    "BMD1" | base sha256 32B | target sha256 32B | varint target_len | ops…
+    op COPY   = 0x01 varint base_offset varint length
+    op INSERT = 0x02 varint length, bytes
+
+The target digest lets the server verify the reconstruction.  Pure
+Python + hashlib; no Qt or network code.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import itertools
+import math
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Union
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+MAGIC = b"BMD1"
+CONTENT_TYPE = "application/vnd.biome.delta.v1"
+_OP_COPY = 0x01
+_OP_INSERT = 0x02
+
+MIN_BLOCK = 512
+CDC_WINDOW = 32
+CDC_MIN_CHUNK = 64
+CDC_MAX_CHUNK = 4096
+_CDC_MASK = (1 << 9) - 1           # ~512-byte average chunks
+MAX_BLOCK = 16 * 1024
+SKETCH_SIZE = 128
+MIN_SIMILARITY = 0.5
+MIN_DELTA_INPUT = 4 * 1024         # smaller clips are not worth diffing
+MAX_DELTA_RATIO = 0.5              # send a delta only if it is < half the full size
+DEFAULT_MAX_BASES = 16
+DEFAULT_MAX_BASE_BYTES = 32 * 1024 * 1024
+
+
+class DeltaError(ValueError):
+    """Malformed delta or a base that does not match it."""
+
+
+def sha256(data: Buffer) -> bytes:
+    return hashlib.sha256(data).digest()
+
+
+def block_size_for(length: int) -> int:
+    """Power of two near sqrt(length), clamped — rsync's rule of thumb."""
+    if length <= 0:
+        return MIN_BLOCK
+    size = 1 << (math.isqrt(length).bit_length() - 1)
+    return max(MIN_BLOCK, min(MAX_BLOCK, size))
+
+
+def chunk_boundaries(data: bytes) -> list[int]:
+    """End offsets of the content-defined chunks of *data*.
+
+    A chunk ends where the low bits of the rolling weak sum ``b`` (see
+    ``weak_sums``) over the last ``CDC_WINDOW`` bytes are all set, within
+    ``CDC_MIN_CHUNK``..``CDC_MAX_CHUNK``.
+    """
+    n = len(data)
+    if n <= CDC_WINDOW:
+        return [n] if n else []
+    window = CDC_WINDOW
+    a, b = weak_sums(data[:window])
+    cuts: list[int] = []
+    last, end = 0, window
+    for leaving, entering in zip(data, data[window:]):
+        if (b & _CDC_MASK == _CDC_MASK and end - last >= CDC_MIN_CHUNK) or end - last >= CDC_MAX_CHUNK:
+            cuts.append(end)
+            last = end
+        a = (a - leaving + entering) & 0xFFFF
+        b = (b - window * leaving + a) & 0xFFFF
+        end += 1
+    if last < n:
+        cuts.append(n)
+    return cuts
+
+
+def sketch(data: Buffer, k: int = SKETCH_SIZE) -> frozenset[int]:
+    """Bottom-k MinHash sketch over content-defined chunks."""
+    data = bytes(data)
+    hashes = set()
+    start = 0
+    for end in chunk_boundaries(data):
+        digest = hashlib.blake2b(data[start:end], digest_size=8).digest()
+        hashes.add(int.from_bytes(digest, "big"))
+        start = end
+    return frozenset(heapq.nsmallest(k, hashes))
+
+
+def similarity(a: frozenset[int], b: frozenset[int], k: int = SKETCH_SIZE) -> float:
+    """Jaccard estimate from two bottom-k sketches."""
+    if not a or not b:
+        return 0.0
+    union_bottom = heapq.nsmallest(k, a | b)
+    shared = sum(1 for h in union_bottom if h in a and h in b)
+    return shared / len(union_bottom)
+
+
+# ── varints ──────────────────────────────────────────────────────────
+
+
+def _put_varint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _get_varint(data: memoryview, pos: int) -> tuple[int, int]:
+    value = shift = 0
+    while True:
+        if pos >= len(data):
+            raise DeltaError("truncated varint")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+        if shift > 63:
+            raise DeltaError("varint too long")
+
+
+# ── signatures and diffing ───────────────────────────────────────────
+
+
+def weak_sums(block: Buffer) -> tuple[int, int]:
+    """rsync's weak checksum halves (a, b) of *block*, mod 2**16.
+
+    ``a`` is the byte sum and ``b`` the position-weighted sum; sliding
+    the window one byte only needs the byte leaving and the one entering
+    (see ``make_delta``).
+    """
+    view = memoryview(block).cast("B")
+    a = sum(view)
+    b = sum(itertools.accumulate(view))     # == sum((size - k) * x_k)
+    return a & 0xFFFF, b & 0xFFFF
+
+
+@dataclass
+class Signature:
+    block_size: int
+    weak: dict[int, list[int]]     # weak sum (b << 16 | a) → block indices
+    strong: list[bytes]
+
+
+def signature(base: Buffer, block_size: int | None = None) -> Signature:
+    view = memoryview(base).cast("B")
+    size = block_size or block_size_for(len(view))
+    weak: dict[int, list[int]] = {}
+    strong: list[bytes] = []
+    for index, offset in enumerate(range(0, len(view) - size + 1, size)):
+        block = view[offset:offset + size]
+        a, b = weak_sums(block)
+        weak.setdefault(b << 16 | a, []).append(index)
+        strong.append(hashlib.blake2b(block, digest_size=8).digest())
+    return Signature(size, weak, strong)
+
+
+def make_delta(
+    base: Buffer,
+    target: Buffer,
+    sig: Signature | None = None,
+    limit: int | None = None,
+) -> Optional[bytes]:
+    """Encode *target* as COPY/INSERT operations against *base*.
+
+    With *limit*, gives up and returns None as soon as the delta is
+    certain to exceed that many bytes.
+    """
+    bv = memoryview(base).cast("B")
+    tv = memoryview(target).cast("B")
+    sig = sig or signature(bv)
+    size = sig.block_size
+    n, nb = len(tv), len(bv)
+
+    out = bytearray(MAGIC)
+    out += sha256(bv)
+    out += sha256(tv)
+    _put_varint(out, n)
+
+    pending_copy: Optional[list[int]] = None     # [offset, length], merged while contiguous
+
+    def flush_copy() -> None:
+        nonlocal pending_copy
+        if pending_copy is not None:
+            out.append(_OP_COPY)
+            _put_varint(out, pending_copy[0])
+            _put_varint(out, pending_copy[1])
+            pending_copy = None
+
+    def emit_literal(start: int, end: int) -> None:
+        nonlocal out
+        if end > start:
+            flush_copy()
+            out.append(_OP_INSERT)
+            _put_varint(out, end - start)
+            out += tv[start:end]
+
+    def emit_copy(offset: int, length: int) -> None:
+        nonlocal pending_copy
+        if pending_copy is not None and pending_copy[0] + pending_copy[1] == offset:
+            pending_copy[1] += length
+        else:
+            flush_copy()
+            pending_copy = [offset, length]
+
+    weak_index = sig.weak
+    budget = n + len(out) if limit is None else limit
+    i = literal_start = 0
+    a = b = 0
+    fresh = True        # the window sums must be recomputed at i
+    while i + size <= n:
+        if fresh:
+            a, b = weak_sums(tv[i:i + size])
+            fresh = False
+        offset = -1
+        candidates = weak_index.get(b << 16 | a)
+        if candidates:
+            strong = hashlib.blake2b(tv[i:i + size], digest_size=8).digest()
+            for index in candidates:
+                if sig.strong[index] == strong:
+                    offset = index * size
+                    break
+        if offset < 0:
+            if len(out) + (i - literal_start) > budget:
+                return None
+            if i + size < n:
+                leaving, entering = tv[i], tv[i + size]
+                a = (a - leaving + entering) & 0xFFFF
+                b = (b - size * leaving + a) & 0xFFFF
+            i += 1
+            continue
+
+        # grow the match backwards into the pending literal, then forwards
+        start = i
+        while start > literal_start and offset > 0 and tv[start - 1] == bv[offset - 1]:
+            start -= 1
+            offset -= 1
+        end = i + size
+        base_end = offset + (end - start)
+        while end + size <= n and base_end + size <= nb and tv[end:end + size] == bv[base_end:base_end + size]:
+            end += size
+            base_end += size
+        while end < n and base_end < nb and tv[end] == bv[base_end]:
+            end += 1
+            base_end += 1
+
+        emit_literal(literal_start, start)
+        emit_copy(offset, end - start)
+        i = literal_start = end
+        fresh = True
+
+    emit_literal(literal_start, n)
+    flush_copy()
+    if len(out) > budget:
+        return None
+    return bytes(out)
+
+
+def delta_base_digest(delta: Buffer) -> bytes:
+    view = memoryview(delta)
+    if len(view) < 68 or view[:4] != MAGIC:
+        raise DeltaError("not a BMD1 delta")
+    return bytes(view[4:36])
+
+
+def apply_delta(base: Buffer, delta: Buffer) -> bytes:
+    """Rebuild the target; verifies both digests."""
+    bv = memoryview(base).cast("B")
+    dv = memoryview(delta).cast("B")
+    if delta_base_digest(dv) != sha256(bv):
+        raise DeltaError("delta was made against a different base")
+    target_digest = bytes(dv[36:68])
+    target_len, pos = _get_varint(dv, 68)
+
+    out = bytearray()
+    while pos < len(dv):
+        op = dv[pos]
+        pos += 1
+        if op == _OP_COPY:
+            offset, pos = _get_varint(dv, pos)
+            length, pos = _get_varint(dv, pos)
+            if offset + length > len(bv):
+                raise DeltaError("copy out of range")
+            out += bv[offset:offset + length]
+        elif op == _OP_INSERT:
+            length, pos = _get_varint(dv, pos)
+            if pos + length > len(dv):
+                raise DeltaError("truncated literal")
+            out += dv[pos:pos + length]
+            pos += length
+        else:
+            raise DeltaError(f"unknown op 0x{op:02x}")
+        if len(out) > target_len:
+            raise DeltaError("delta overruns target length")
+
+    if len(out) != target_len or sha256(out) != target_digest:
+        raise DeltaError("reconstruction does not match the target digest")
+    return bytes(out)
+
+
+# ── recent bases ─────────────────────────────────────────────────────
+
+
+@dataclass
+class DeltaResult:
+    base_digest: bytes
+    delta: bytes
+    full_size: int
+    similarity: float
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.full_size - len(self.delta)
+
+
+@dataclass
+class DeltaPlan:
+    """A chosen base and the content to diff against it (picklable)."""
+
+    base_digest: bytes
+    base: bytes
+    signature: Signature
+    target: bytes
+    similarity: float
+
+
+def diff(plan: DeltaPlan) -> Optional[DeltaResult]:
+    """Run the diff for *plan*; None if it is not worth sending.
+
+    Module-level so it can run in the process pool.
+    """
+    limit = math.ceil(len(plan.target) * MAX_DELTA_RATIO) - 1
+    delta = make_delta(plan.base, plan.target, plan.signature, limit)
+    if delta is None:
+        return None
+    return DeltaResult(plan.base_digest, delta, len(plan.target), plan.similarity)
+
+
+@dataclass
+class DeltaStats:
+    attempts: int = 0
+    deltas_sent: int = 0
+    fallbacks: int = 0           # server lacked the base
+    bytes_full: int = 0          # what the delta sends would have cost in full
+    bytes_sent: int = 0
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.bytes_full - self.bytes_sent
+
+
+class _Base:
+    __slots__ = ("content", "sketch", "_signature")
+
+    def __init__(self, content: bytes, content_sketch: frozenset[int] | None = None) -> None:
+        self.content = content
+        self.sketch = content_sketch if content_sketch is not None else sketch(content)
+        self._signature: Optional[Signature] = None
+
+    @property
+    def signature(self) -> Signature:
+        if self._signature is None:
+            self._signature = signature(self.content)
+        return self._signature
+
+
+class DeltaEncoder:
+    """LRU of acknowledged clips + base selection + diffing.
+
+    Thread-safe: ``encode`` is meant to run in the worker pool.
+    """
+
+    def __init__(
+        self,
+        max_bases: int = DEFAULT_MAX_BASES,
+        max_bytes: int = DEFAULT_MAX_BASE_BYTES,
+    ) -> None:
+        self._max_bases = max_bases
+        self._max_bytes = max_bytes
+        self._bases: OrderedDict[bytes, _Base] = OrderedDict()
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def remember(self, content: bytes, content_sketch: frozenset[int] | None = None) -> bytes:
+        """Record content the server acknowledged; returns its digest.
+
+        Pass *content_sketch* if ``sketch(content)`` was already computed.
+        """
+        digest = sha256(content)
+        if len(content) < MIN_DELTA_INPUT or len(content) > self._max_bytes:
+            return digest
+        base = _Base(content, content_sketch)
+        with self._lock:
+            old = self._bases.pop(digest, None)
+            if old is not None:
+                self._total -= len(old.content)
+            self._bases[digest] = base
+            self._total += len(content)
+            while len(self._bases) > self._max_bases or self._total > self._max_bytes:
+                _, evicted = self._bases.popitem(last=False)
+                self._total -= len(evicted.content)
+        return digest
+
+    def __len__(self) -> int:
+        return len(self._bases)
+
+    def forget(self, digest: bytes) -> None:
+        with self._lock:
+            base = self._bases.pop(digest, None)
+            if base is not None:
+                self._total -= len(base.content)
+
+    def encode(self, content: bytes) -> Optional[DeltaResult]:
+        """A worthwhile delta for *content*, or None to send it in full."""
+        plan = self.plan(content)
+        return diff(plan) if plan is not None else None
+
+    def plan(self, content: bytes, content_sketch: frozenset[int] | None = None) -> Optional[DeltaPlan]:
+        """Pick the most similar base for *content*, or None."""
+        if len(content) < MIN_DELTA_INPUT:
+            return None
+        with self._lock:
+            bases = list(self._bases.items())
+        if not bases:
+            return None
+
+        new_sketch = content_sketch if content_sketch is not None else sketch(content)
+        best: Optional[tuple[float, bytes, _Base]] = None
+        for digest, base in bases:
+            if not 0.5 <= len(content) / len(base.content) <= 2.0:
+                continue
+            score = similarity(new_sketch, base.sketch)
+            if score >= MIN_SIMILARITY and (best is None or score > best[0]):
+                best = (score, digest, base)
+        if best is None:
+            return None
+
+        score, digest, base = best
+        return DeltaPlan(digest, base.content, base.signature, content, score)
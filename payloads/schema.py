@@ -0,0 +1,181 @@
+"""Clip document validation compiled from ``schemas/clip-document.json``.
+
+The schema is turned into the source of a plain Python function once,
+at import, so a check is a handful of ``isinstance`` / ``in`` tests with
+no per-call walk over the schema.  Two validators are built from it:
+
+* ``validate_clip_document`` — the full Firestore document, as the
+  backend returns it.
+* ``validate_outgoing_clip`` — what this client produces before upload.
+  Only ``kind`` is required; ``storagePath``, ``senderDeviceId``,
+  ``status`` and ``createdAt`` are assigned by the backend.
+
+Both raise ``SchemaError`` with a JSON path on the first violation.  The
+compiler covers the draft-07 subset the repo's schemas use and refuses
+anything else, so a schema change can never be silently unchecked.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import Any, Callable
+
+SCHEMA_PATH = Path(__file__).resolve().parent.parent / "schemas" / "clip-document.json"
+
+Validator = Callable[[Any], None]
+
+_ANNOTATIONS = frozenset({"$schema", "$id", "$comment", "title", "description", "default", "examples"})
+_KEYWORDS = frozenset({
+    "type", "enum", "format", "minLength", "maxLength",
+    "required", "properties", "additionalProperties",
+})
+_TYPE_TESTS = {
+    "string": "isinstance({v}, str)",
+    "integer": "(isinstance({v}, int) and not isinstance({v}, bool))",
+    "number": "(isinstance({v}, (int, float)) and not isinstance({v}, bool))",
+    "boolean": "isinstance({v}, bool)",
+    "object": "isinstance({v}, dict)",
+    "array": "isinstance({v}, list)",
+    "null": "{v} is None",
+}
+_FORMATS = {
+    # RFC 3339 date-time
+    "date-time": re.compile(
+        r"\d{4}-\d{2}-\d{2}[Tt ]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:[Zz]|[+-]\d{2}:\d{2})\Z"
+    ).match,
+}
+
+
+class SchemaError(ValueError):
+    """A document does not match the schema."""
+
+    def __init__(self, path: str, message: str) -> None:
+        super().__init__(f"{path}: {message}")
+        self.path = path
+
+
+class _Compiler:
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+        self.namespace: dict[str, Any] = {"SchemaError": SchemaError, "_MISSING": object()}
+        self._counter = 0
+
+    def _name(self, prefix: str) -> str:
+        self._counter += 1
+        return f"{prefix}{self._counter}"
+
+    def const(self, value: Any) -> str:
+        name = self._name("_c")
+        self.namespace[name] = value
+        return name
+
+    def emit(self, indent: int, line: str) -> None:
+        self.lines.append("    " * indent + line)
+
+    def fail(self, indent: int, path: str, message: str) -> None:
+        self.emit(indent, f"raise SchemaError({path!r}, {message!r})")
+
+    def body(self, schema: dict[str, Any], var: str, path: str, indent: int) -> None:
+        start = len(self.lines)
+        self.node(schema, var, path, indent)
+        if len(self.lines) == start:
+            self.emit(indent, "pass")
+
+    def node(self, schema: dict[str, Any], var: str, path: str, indent: int) -> None:
+        unknown = set(schema) - _KEYWORDS - _ANNOTATIONS
+        if unknown:
+            raise ValueError(f"{path}: unsupported schema keywords {sorted(unknown)}")
+
+        types = schema.get("type")
+        if types is not None:
+            types = [types] if isinstance(types, str) else list(types)
+            tests = [_TYPE_TESTS[t].format(v=var) for t in types]
+            test = tests[0] if len(tests) == 1 else "(" + " or ".join(tests) + ")"
+            self.emit(indent, f"if not {test}:")
+            self.fail(indent + 1, path, f"expected {' or '.join(types)}")
+
+        if "enum" in schema:
+            values = schema["enum"]
+            pool = frozenset(values) if all(isinstance(v, str) for v in values) else tuple(values)
+            self.emit(indent, f"if {var} not in {self.const(pool)}:")
+            self.fail(indent + 1, path, f"must be one of {', '.join(map(str, values))}")
+
+        string_checks = [k for k in ("format", "minLength", "maxLength") if k in schema]
+        if string_checks:
+            guarded = types == ["string"]
+            if not guarded:
+                self.emit(indent, f"if isinstance({var}, str):")
+            inner = indent if guarded else indent + 1
+            if "format" in schema:
+                matcher = _FORMATS.get(schema["format"])
+                if matcher is None:
+                    raise ValueError(f"{path}: unsupported format {schema['format']!r}")
+                self.emit(inner, f"if {self.const(matcher)}({var}) is None:")
+                self.fail(inner + 1, path, f"not a valid {schema['format']}")
+            if "minLength" in schema:
+                self.emit(inner, f"if len({var}) < {int(schema['minLength'])}:")
+                self.fail(inner + 1, path, f"shorter than {schema['minLength']}")
+            if "maxLength" in schema:
+                self.emit(inner, f"if len({var}) > {int(schema['maxLength'])}:")
+                self.fail(inner + 1, path, f"longer than {schema['maxLength']}")
+
+        object_checks = [k for k in ("required", "properties", "additionalProperties") if k in schema]
+        if object_checks:
+            guarded = types == ["object"]
+            if not guarded:
+                self.emit(indent, f"if isinstance({var}, dict):")
+            inner = indent if guarded else indent + 1
+            for key in schema.get("required", ()):
+                self.emit(inner, f"if {key!r} not in {var}:")
+                self.fail(inner + 1, f"{path}.{key}", "is required")
+            properties = schema.get("properties", {})
+            for key, sub in properties.items():
+                child = self._name("v")
+                self.emit(inner, f"{child} = {var}.get({key!r}, _MISSING)")
+                self.emit(inner, f"if {child} is not _MISSING:")
+                self.body(sub, child, f"{path}.{key}", inner + 1)
+            additional = schema.get("additionalProperties", True)
+            if additional is False:
+                allowed = self.const(frozenset(properties))
+                self.emit(inner, f"for _key in {var}:")
+                self.emit(inner + 1, f"if _key not in {allowed}:")
+                self.emit(inner + 2, f"raise SchemaError({path!r} + '.' + str(_key), 'is not allowed')")
+            elif additional is not True:
+                raise ValueError(f"{path}: only boolean additionalProperties is supported")
+
+
+def compile_validator(schema: dict[str, Any], *, name: str = "validate") -> Validator:
+    """Generate, compile and return a validator function for *schema*."""
+    compiler = _Compiler()
+    compiler.emit(0, f"def {name}(doc):")
+    compiler.body(schema, "doc", "$", 1)
+    source = "\n".join(compiler.lines) + "\n"
+    exec(compile(source, f"<schema:{name}>", "exec"), compiler.namespace)
+    fn = compiler.namespace[name]
+    fn.__source__ = source
+    return fn
+
+
+def load_schema(path: Path = SCHEMA_PATH) -> dict[str, Any]:
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+CLIP_DOCUMENT_SCHEMA = load_schema()
+OUTGOING_REQUIRED = ("kind",)
+
+validate_clip_document = compile_validator(CLIP_DOCUMENT_SCHEMA, name="validate_clip_document")
+validate_outgoing_clip = compile_validator(
+    {**CLIP_DOCUMENT_SCHEMA, "required": list(OUTGOING_REQUIRED)},
+    name="validate_outgoing_clip",
+)
+
+
+def outgoing_draft(kind: str, metadata_json: str | None = None) -> dict[str, Any]:
+    """The client-side part of a clip document, as the upload describes it."""
+    draft: dict[str, Any] = {"kind": kind}
+    if metadata_json is not None:
+        draft["metadata"] = metadata_json
+    return draft
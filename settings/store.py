@@ -17,10 +17,27 @@ logger = logging.getLogger(__name__)
 _DEFAULTS: dict[str, Any] = {
     "device_id": "",
     "api_base_url": "http://localhost:8000",
+    "api_endpoints": [],
+    "api_hedge_small_clips": False,
     "firebase_config_path": "",
     "auto_send_text": False,
     "auto_send_urls": False,
     "speedboost_enabled": True,
+    "history_enabled": True,
+    "blob_cache_max_mb": 512,
+    "start_minimized": False,
+    "dispatch_max_in_flight": 4,
+    "dispatch_max_queued": 64,
+    "outbox_parallelism": 4,
+    "outbox_batch_size": 50,
+    "delta_uploads": True,
+    "e2e_enabled": False,
+    "e2e_group": "default",
+    "lan_enabled": False,
+    "lan_port": 47318,
+    "lan_discovery_port": 47317,
+    "lan_peers": [],
+    "send_targets": [],          # device ids; empty sends to every device
 }
 
 
@@ -0,0 +1,113 @@
+"""Build the prebuilt Qt resource bundle ``assets/biome.rcc``.
+
+Run at packaging time (needs PySide6, incl. ``pyside6-rcc``)::
+
+    python tools/build_assets.py
+
+Rasterises every SVG under ``icons/`` at each logical size the UI uses
+times the common device-pixel ratios, paints the tray state icons, and
+compiles them together with ``fonts/*.ttf`` and a manifest into a binary
+``.rcc`` that ``ui.assets`` registers at startup.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QRectF, Qt  # noqa: E402
+from PySide6.QtGui import QGuiApplication, QImage, QPainter  # noqa: E402
+from PySide6.QtSvg import QSvgRenderer  # noqa: E402
+
+from ui.assets import BUNDLE_PATH, MANIFEST_VERSION  # noqa: E402
+
+# logical icon sizes used by the widgets (QToolButton / QPushButton icons)
+ICON_SIZES = (16, 18, 22, 28)
+TRAY_SIZES = (16, 20, 24, 32, 40, 48, 64)
+DEVICE_PIXEL_RATIOS = (1.0, 1.25, 1.5, 2.0)
+
+
+def _pixel_sizes(logical: tuple[int, ...]) -> list[int]:
+    return sorted({round(size * dpr) for size in logical for dpr in DEVICE_PIXEL_RATIOS})
+
+
+def _render_svg(svg: Path, px: int, out: Path) -> None:
+    renderer = QSvgRenderer(str(svg))
+    image = QImage(px, px, QImage.Format.Format_ARGB32_Premultiplied)
+    image.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    renderer.render(painter, QRectF(0, 0, px, px))
+    painter.end()
+    out.parent.mkdir(parents=True, exist_ok=True)
+    image.save(str(out), "PNG")
+
+
+def main() -> None:
+    app = QGuiApplication(sys.argv)  # noqa: F841 — needed for QPainter / fonts
+
+    from tray.service import _STATE_COLOURS, paint_state_pixmap
+
+    staging = Path(tempfile.mkdtemp(prefix="biome-assets-"))
+    files: list[str] = []
+    manifest: dict = {"version": MANIFEST_VERSION, "icons": {}, "tray": {}, "fonts": []}
+
+    try:
+        icon_px = _pixel_sizes(ICON_SIZES)
+        for svg in sorted((ROOT / "icons").glob("*.svg")):
+            for px in icon_px:
+                rel = f"icons/{svg.stem}/{px}.png"
+                _render_svg(svg, px, staging / rel)
+                files.append(rel)
+            manifest["icons"][svg.stem] = icon_px
+
+        for state, colour in _STATE_COLOURS.items():
+            name = state.name.lower()
+            for px in TRAY_SIZES:
+                rel = f"tray/{name}/{px}.png"
+                (staging / rel).parent.mkdir(parents=True, exist_ok=True)
+                paint_state_pixmap(colour, px).save(str(staging / rel), "PNG")
+                files.append(rel)
+            manifest["tray"][name] = list(TRAY_SIZES)
+
+        for ttf in sorted((ROOT / "fonts").glob("*.ttf")):
+            rel = f"fonts/{ttf.name}"
+            (staging / rel).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(ttf, staging / rel)
+            files.append(rel)
+            manifest["fonts"].append(ttf.name)
+
+        (staging / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        files.append("manifest.json")
+
+        qrc = staging / "biome.qrc"
+        entries = "\n".join(f"    <file>{escape(f)}</file>" for f in files)
+        qrc.write_text(
+            f'<RCC>\n  <qresource prefix="/biome">\n{entries}\n  </qresource>\n</RCC>\n',
+            encoding="utf-8",
+        )
+
+        BUNDLE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        rcc = shutil.which("pyside6-rcc") or "pyside6-rcc"
+        subprocess.run(
+            [rcc, "--binary", "--no-compress", str(qrc), "-o", str(BUNDLE_PATH)],
+            check=True,
+        )
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+    print(f"wrote {BUNDLE_PATH} ({BUNDLE_PATH.stat().st_size / 1024:.0f} KiB, {len(files)} files)")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,22 +2,48 @@
 
 Uses QSystemTrayIcon (natively supported on Windows).  The tray owns
 five visual states (idle, waiting, sending, sent, error) that map to
-coloured circle icons using theme token colours.
+coloured circle icons using theme token colours.  The icons are painted
+at packaging time into the asset bundle (``ui.assets``); they are only
+painted at runtime when running without one.
+
+The displayed state is derived rather than set by each send: while any
+send is in flight (``begin_send`` / ``end_send`` reference count) the
+tray shows SENDING; when the last one finishes its result (SENT/ERROR)
+is held for ``RESULT_HOLD_MS`` on a single restartable timer, then the
+base state (IDLE/WAITING) returns.  An error outranks successes within
+one burst; a send that starts after the result was shown begins a new
+burst.  Icon and tooltip writes are
+coalesced to at most one per ``REFRESH_MS``.
+
+The "Send to" submenu lists the linked devices handed to
+``set_devices``; ticking devices narrows later sends to them, and
+"All devices" (the default) clears the selection.
 """
 
 from __future__ import annotations
 
 import logging
+import time
+from collections import deque
 from enum import Enum, auto
 
-from PySide6.QtCore import QObject, Qt, Signal, Slot
+from PySide6.QtCore import QObject, Qt, QTimer, Signal, Slot
 from PySide6.QtGui import QAction, QColor, QFont, QIcon, QPainter, QPixmap
 from PySide6.QtWidgets import QMenu, QSystemTrayIcon
 
-from ui import theme
+from metrics import registry as metrics
+from ui import assets, theme
 
 logger = logging.getLogger(__name__)
 
+RESULT_HOLD_MS = 2000
+REFRESH_MS = 100
+THROUGHPUT_WINDOW_S = 60.0
+
+_STATE_CHANGES = metrics.counter(
+    "tray_state_changes", "Tray icon transitions by new state", ("state",),
+)
+
 
 class TrayState(Enum):
     IDLE = auto()
@@ -37,8 +63,8 @@ _STATE_COLOURS: dict[TrayState, str] = {
 }
 
 
-def _make_icon(colour: str, size: int = 64) -> QIcon:
-    """Generate a simple coloured circle icon as a fallback."""
+def paint_state_pixmap(colour: str, size: int = 64) -> QPixmap:
+    """Paint the coloured "B" circle used for a tray state."""
     pixmap = QPixmap(size, size)
     pixmap.fill(QColor("transparent"))
     painter = QPainter(pixmap)
@@ -50,7 +76,15 @@ def _make_icon(colour: str, size: int = 64) -> QIcon:
     painter.setFont(QFont("Segoe UI", int(size * 0.35), QFont.Weight.Bold))
     painter.drawText(pixmap.rect(), Qt.AlignmentFlag.AlignCenter, "B")
     painter.end()
-    return QIcon(pixmap)
+    return pixmap
+
+
+def _make_icon(state: TrayState) -> QIcon:
+    """Prebuilt icon from the asset bundle, else paint one at runtime."""
+    bundled = assets.tray_icon(state.name.lower())
+    if bundled is not None:
+        return bundled
+    return QIcon(paint_state_pixmap(_STATE_COLOURS[state]))
 
 
 class TrayService(QObject):
@@ -62,24 +96,46 @@ class TrayService(QObject):
     send_requested()
     show_requested()
     quit_requested()
+    targets_changed(list)       — selected device ids; empty means all
+    targets_menu_opened()
     """
 
     state_changed = Signal(object)
     send_requested = Signal()
     show_requested = Signal()
     quit_requested = Signal()
+    targets_changed = Signal(list)
+    targets_menu_opened = Signal()
 
     def __init__(self, parent: QObject | None = None) -> None:
         super().__init__(parent)
 
-        self._state = TrayState.IDLE
+        self._state = TrayState.IDLE          # what the icon currently shows
+        self._base = TrayState.IDLE           # IDLE / WAITING when nothing is sending
+        self._result: TrayState | None = None  # SENT / ERROR held after sends
+        self._result_shown = False             # the burst's result reached the icon
+        self._in_flight = 0
+        self._outbox_depth = 0
+        self._completed: deque[float] = deque()
+        self._tooltip = "Biome — idle"
+        self._targets: list[str] = []
+
+        self._result_timer = QTimer(self)
+        self._result_timer.setSingleShot(True)
+        self._result_timer.setInterval(RESULT_HOLD_MS)
+        self._result_timer.timeout.connect(self._on_result_expired)
+
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(REFRESH_MS)
+        self._refresh_timer.timeout.connect(self._refresh)
+
         self._icons: dict[TrayState, QIcon] = {
-            state: _make_icon(colour)
-            for state, colour in _STATE_COLOURS.items()
+            state: _make_icon(state) for state in _STATE_COLOURS
         }
 
         self._tray = QSystemTrayIcon(self._icons[TrayState.IDLE], parent)
-        self._tray.setToolTip("Biome — idle")
+        self._tray.setToolTip(self._tooltip)
         self._tray.activated.connect(self._on_activated)
 
         # ── context menu (styled by global QSS QMenu rules) ─────────
@@ -89,6 +145,11 @@ class TrayService(QObject):
         self._send_action.triggered.connect(self.send_requested.emit)
         menu.addAction(self._send_action)
 
+        self._targets_menu = QMenu("Send to", menu)
+        self._targets_menu.aboutToShow.connect(self.targets_menu_opened.emit)
+        menu.addMenu(self._targets_menu)
+        self.set_devices([])
+
         menu.addSeparator()
 
         show_action = QAction("Show Window", menu)
@@ -111,16 +172,87 @@ class TrayService(QObject):
 
     @property
     def state(self) -> TrayState:
-        return self._state
+        return self._derive_state()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
 
     def set_state(self, new_state: TrayState) -> None:
-        if new_state == self._state:
+        """Set the base state, or show SENT / ERROR as a transient result."""
+        if new_state in (TrayState.SENT, TrayState.ERROR):
+            self._show_result(new_state)
+            return
+        if new_state == TrayState.SENDING:
+            logger.debug("set_state(SENDING) ignored — use begin_send()")
             return
-        self._state = new_state
-        icon = self._icons.get(new_state, self._icons[TrayState.IDLE])
-        self._tray.setIcon(icon)
-        self._tray.setToolTip(f"Biome — {new_state.name.lower()}")
-        self.state_changed.emit(new_state)
+        self._base = new_state
+        self._result = None
+        self._result_timer.stop()
+        self._schedule_refresh()
+
+    def begin_send(self) -> None:
+        if self._in_flight == 0 and self._result_shown:
+            # a new burst: the last one's result must not outlive it
+            self._result = None
+            self._result_timer.stop()
+        self._in_flight += 1
+        self._schedule_refresh()
+
+    def end_send(self, result: TrayState | None = None) -> None:
+        """Finish one send; ``result`` is SENT, ERROR or None (cancelled)."""
+        if self._in_flight == 0:
+            logger.debug("end_send() without matching begin_send()")
+        self._in_flight = max(0, self._in_flight - 1)
+        if result == TrayState.SENT:
+            self._completed.append(time.monotonic())
+        if result is not None:
+            self._show_result(result)
+        else:
+            self._schedule_refresh()
+
+    def set_outbox_depth(self, depth: int) -> None:
+        if depth != self._outbox_depth:
+            self._outbox_depth = depth
+            self._schedule_refresh()
+
+    def throughput_per_minute(self) -> float:
+        cutoff = time.monotonic() - THROUGHPUT_WINDOW_S
+        while self._completed and self._completed[0] < cutoff:
+            self._completed.popleft()
+        return len(self._completed) * 60.0 / THROUGHPUT_WINDOW_S
+
+    @property
+    def targets(self) -> list[str]:
+        return list(self._targets)
+
+    def set_devices(self, devices: list[tuple[str, str]], selected: list[str] | None = None) -> None:
+        """Rebuild "Send to" from ``(device id, name)`` pairs.
+
+        *selected* replaces the current selection; ids no longer listed
+        are dropped from it either way.
+        """
+        known = {device_id for device_id, _ in devices}
+        wanted = self._targets if selected is None else selected
+        self._targets = [t for t in wanted if t in known]
+
+        self._targets_menu.clear()
+        all_action = QAction("All devices", self._targets_menu)
+        all_action.setCheckable(True)
+        all_action.setChecked(not self._targets)
+        all_action.triggered.connect(self._on_all_devices)
+        self._targets_menu.addAction(all_action)
+        if not devices:
+            all_action.setEnabled(False)
+            return
+        self._targets_menu.addSeparator()
+        for device_id, name in devices:
+            action = QAction(name, self._targets_menu)
+            action.setCheckable(True)
+            action.setChecked(device_id in self._targets)
+            action.setData(device_id)
+            action.toggled.connect(self._on_target_toggled)
+            self._targets_menu.addAction(action)
 
     def notify(self, title: str, message: str) -> None:
         if self._tray.supportsMessages():
@@ -131,6 +263,83 @@ class TrayService(QObject):
 
     # ── private ──────────────────────────────────────────────────────
 
+    def _show_result(self, result: TrayState) -> None:
+        # an error anywhere in a burst outranks later successes
+        if self._result != TrayState.ERROR:
+            self._result = result
+            self._result_shown = False
+        self._base = TrayState.IDLE
+        if self._in_flight == 0:
+            self._result_timer.start()    # restarts: one pending timer at most
+        self._schedule_refresh()
+
+    @Slot()
+    def _on_result_expired(self) -> None:
+        if self._in_flight:
+            return
+        self._result = None
+        self._schedule_refresh()
+
+    def _derive_state(self) -> TrayState:
+        if self._in_flight:
+            return TrayState.SENDING
+        if self._result is not None:
+            return self._result
+        return self._base
+
+    def _schedule_refresh(self) -> None:
+        if not self._refresh_timer.isActive():
+            self._refresh_timer.start()
+
+    def _tooltip_text(self, state: TrayState) -> str:
+        lines = [f"Biome — {state.name.lower()}"]
+        if self._in_flight:
+            lines[0] += f" ({self._in_flight} in flight)"
+        if self._outbox_depth:
+            lines.append(f"Outbox: {self._outbox_depth} queued")
+        rate = self.throughput_per_minute()
+        if rate:
+            lines.append(f"Throughput: {rate:.0f} clips/min")
+        return "\n".join(lines)
+
+    @Slot()
+    def _refresh(self) -> None:
+        state = self._derive_state()
+        if state in (TrayState.SENT, TrayState.ERROR):
+            self._result_shown = True
+        if state != self._state:
+            self._state = state
+            _STATE_CHANGES.labels(state.name.lower()).inc()
+            self._tray.setIcon(self._icons.get(state, self._icons[TrayState.IDLE]))
+            self.state_changed.emit(state)
+        tooltip = self._tooltip_text(state)
+        if tooltip != self._tooltip:
+            self._tooltip = tooltip
+            self._tray.setToolTip(tooltip)
+
+    @Slot()
+    def _on_all_devices(self) -> None:
+        self._set_targets([])
+
+    @Slot(bool)
+    def _on_target_toggled(self, checked: bool) -> None:
+        device_id = self.sender().data()
+        targets = [t for t in self._targets if t != device_id]
+        if checked:
+            targets.append(device_id)
+        self._set_targets(targets)
+
+    def _set_targets(self, targets: list[str]) -> None:
+        self._targets = targets
+        for action in self._targets_menu.actions():
+            if action.isSeparator():
+                continue
+            device_id = action.data()
+            action.blockSignals(True)
+            action.setChecked(device_id in targets if device_id else not targets)
+            action.blockSignals(False)
+        self.targets_changed.emit(list(targets))
+
     @Slot(QSystemTrayIcon.ActivationReason)
     def _on_activated(self, reason: QSystemTrayIcon.ActivationReason) -> None:
         if reason == QSystemTrayIcon.ActivationReason.DoubleClick:
@@ -0,0 +1,116 @@
+"""Activity log model — fixed-capacity ring buffer behind a QListView.
+
+``append`` only enqueues; queued messages are flushed at most once per
+frame with a single ``rowsRemoved`` (oldest rows falling off the end)
+and a single ``rowsInserted`` (new rows at the top).  Bursts larger than
+the capacity collapse into one model reset.  Timestamps are captured at
+enqueue time but only formatted when a row is actually painted.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Optional
+
+from PySide6.QtCore import (
+    QAbstractListModel,
+    QModelIndex,
+    QPersistentModelIndex,
+    Qt,
+    QTimer,
+)
+
+FRAME_INTERVAL_MS = 16
+
+
+class ActivityLogModel(QAbstractListModel):
+    """Newest-first log of at most ``capacity`` messages."""
+
+    def __init__(self, capacity: int = 200, parent=None) -> None:
+        super().__init__(parent)
+        self._capacity = capacity
+        self._buf: list[Optional[tuple[float, str]]] = [None] * capacity
+        self._head = 0          # next slot to write
+        self._size = 0
+        self._pending: deque[tuple[float, str]] = deque(maxlen=capacity)
+        self._dropped = 0
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(FRAME_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self.flush)
+
+    # ── public API ───────────────────────────────────────────────────
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def dropped(self) -> int:
+        """Messages discarded before ever being shown (burst > capacity)."""
+        return self._dropped
+
+    def append(self, message: str) -> None:
+        if len(self._pending) == self._capacity:
+            self._dropped += 1
+        self._pending.append((time.time(), message))
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def flush(self) -> None:
+        self._flush_timer.stop()
+        n = len(self._pending)
+        if n == 0:
+            return
+
+        if n >= self._capacity:
+            self.beginResetModel()
+            self._write_pending()
+            self._size = self._capacity
+            self.endResetModel()
+            return
+
+        overflow = self._size + n - self._capacity
+        if overflow > 0:
+            self.beginRemoveRows(QModelIndex(), self._size - overflow, self._size - 1)
+            self._size -= overflow
+            self.endRemoveRows()
+
+        self.beginInsertRows(QModelIndex(), 0, n - 1)
+        self._write_pending()
+        self._size += n
+        self.endInsertRows()
+
+    def messages(self) -> list[str]:
+        """Current rows, newest first (for tests / export)."""
+        return [self._row(r)[1] for r in range(self._size)]
+
+    # ── Qt model interface ───────────────────────────────────────────
+
+    def rowCount(self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()) -> int:  # noqa: N802
+        return 0 if parent.isValid() else self._size
+
+    def data(self, index: QModelIndex | QPersistentModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        row = index.row()
+        if not 0 <= row < self._size:
+            return None
+        ts, message = self._row(row)
+        return f"[{datetime.fromtimestamp(ts):%H:%M:%S}]  {message}"
+
+    # ── private ──────────────────────────────────────────────────────
+
+    def _row(self, row: int) -> tuple[float, str]:
+        return self._buf[(self._head - 1 - row) % self._capacity]  # type: ignore[return-value]
+
+    def _write_pending(self) -> None:
+        buf, cap, head = self._buf, self._capacity, self._head
+        for item in self._pending:
+            buf[head] = item
+            head = (head + 1) % cap
+        self._head = head
+        self._pending.clear()
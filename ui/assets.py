@@ -0,0 +1,117 @@
+"""Icon / font loading from the prebuilt Qt resource bundle.
+
+``tools/build_assets.py`` compiles ``icons/``, ``fonts/`` and the tray
+state icons into ``assets/biome.rcc`` at packaging time, with every SVG
+pre-rasterised at each size the UI uses times the common device-pixel
+ratios (1, 1.25, 1.5, 2).  At runtime the bundle is memory-mapped by
+``QResource`` and:
+
+  - ``icon(name)`` returns one shared ``QIcon`` per name, backed by the
+    PNG rasters, so no SVG is parsed on startup and every widget using
+    the same icon shares the same pixmap cache;
+  - ``register_fonts()`` registers the bundled fonts from the manifest
+    instead of globbing ``fonts/`` on disk;
+  - ``tray_icon(state)`` returns the pre-painted tray state icon.
+
+Without a bundle (running from a source checkout) everything falls back
+to the loose files, so the build step is an optimisation, not a
+requirement.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+from typing import Optional
+
+from PySide6.QtCore import QFile, QIODevice, QResource, QSize
+from PySide6.QtGui import QFontDatabase, QIcon
+
+logger = logging.getLogger(__name__)
+
+_ROOT = Path(__file__).resolve().parent.parent
+BUNDLE_PATH = _ROOT / "assets" / "biome.rcc"
+RESOURCE_PREFIX = ":/biome"
+MANIFEST_VERSION = 1
+
+_manifest: Optional[dict] = None
+_loaded = False
+_icon_cache: dict[str, QIcon] = {}
+_tray_cache: dict[str, QIcon] = {}
+
+
+def load_bundle(path: Path = BUNDLE_PATH) -> bool:
+    """Register the resource bundle once; return True if it is usable."""
+    global _manifest, _loaded
+    if _loaded:
+        return _manifest is not None
+    _loaded = True
+
+    if not path.exists():
+        logger.debug("No asset bundle at %s — using loose files", path)
+        return False
+    if not QResource.registerResource(str(path)):
+        logger.warning("Failed to register asset bundle %s", path)
+        return False
+
+    f = QFile(f"{RESOURCE_PREFIX}/manifest.json")
+    if not f.open(QIODevice.OpenModeFlag.ReadOnly):
+        logger.warning("Asset bundle has no manifest — ignoring it")
+        return False
+    try:
+        manifest = json.loads(bytes(f.readAll().data()).decode("utf-8"))
+    finally:
+        f.close()
+    if manifest.get("version") != MANIFEST_VERSION:
+        logger.warning("Asset bundle manifest version mismatch — ignoring it")
+        return False
+
+    _manifest = manifest
+    return True
+
+
+def icon(name: str, svg_fallback: str | None = None) -> QIcon:
+    """Shared QIcon for ``name`` (bundle rasters, else the loose SVG)."""
+    cached = _icon_cache.get(name)
+    if cached is not None:
+        return cached
+
+    qicon = QIcon()
+    sizes = (_manifest or {}).get("icons", {}).get(name) if load_bundle() else None
+    if sizes:
+        for px in sizes:
+            qicon.addFile(f"{RESOURCE_PREFIX}/icons/{name}/{px}.png", QSize(px, px))
+    elif svg_fallback is not None:
+        qicon = QIcon(svg_fallback)
+    _icon_cache[name] = qicon
+    return qicon
+
+
+def tray_icon(state: str) -> Optional[QIcon]:
+    """Pre-painted tray icon for a ``TrayState`` name, if bundled."""
+    cached = _tray_cache.get(state)
+    if cached is not None:
+        return cached
+    if not load_bundle():
+        return None
+    sizes = (_manifest or {}).get("tray", {}).get(state)
+    if not sizes:
+        return None
+    qicon = QIcon()
+    for px in sizes:
+        qicon.addFile(f"{RESOURCE_PREFIX}/tray/{state}/{px}.png", QSize(px, px))
+    _tray_cache[state] = qicon
+    return qicon
+
+
+def register_fonts(fonts_dir: str) -> int:
+    """Register bundled fonts; falls back to globbing ``fonts_dir``."""
+    if load_bundle() and _manifest is not None:
+        files = [f"{RESOURCE_PREFIX}/fonts/{name}" for name in _manifest.get("fonts", [])]
+    else:
+        path = Path(fonts_dir)
+        files = [str(p) for p in sorted(path.glob("*.ttf"))] if path.exists() else []
+    for font in files:
+        QFontDatabase.addApplicationFont(font)
+    return len(files)
@@ -1,12 +1,19 @@
 """Main application window — frameless, with custom title bar.
 
 Composes the TitleBar, Sidebar, and a QStackedWidget holding the
-Dashboard and Settings pages.
+Dashboard, History and Settings pages.
+
+Pages are built lazily: the stack starts with empty placeholder widgets
+and each page's module is imported and instantiated the first time it
+is navigated to (the initial page on first show).  ``page_created``
+lets the composition root wire services into a page once it exists.
 """
 
 from __future__ import annotations
 
-from PySide6.QtCore import Qt, Slot
+from typing import Callable, Optional
+
+from PySide6.QtCore import Qt, Signal, Slot
 from PySide6.QtWidgets import (
     QHBoxLayout,
     QMainWindow,
@@ -18,12 +25,44 @@ from PySide6.QtWidgets import (
 from . import theme
 from .titlebar import TitleBar
 from .sidebar import Sidebar
-from .pages.dashboard import DashboardPage
-from .pages.settings import SettingsPage
+
+DASHBOARD_PAGE = 0
+HISTORY_PAGE = 1
+SETTINGS_PAGE = 2
+
+
+def _build_dashboard() -> QWidget:
+    from .pages.dashboard import DashboardPage
+    return DashboardPage()
+
+
+def _build_history() -> QWidget:
+    from .pages.history import HistoryPage
+    return HistoryPage()
+
+
+def _build_settings() -> QWidget:
+    from .pages.settings import SettingsPage
+    return SettingsPage()
+
+
+_PAGE_FACTORIES: list[Callable[[], QWidget]] = [
+    _build_dashboard,   # DASHBOARD_PAGE
+    _build_history,     # HISTORY_PAGE
+    _build_settings,    # SETTINGS_PAGE
+]
 
 
 class MainWindow(QMainWindow):
-    """Root window hosting title bar, sidebar navigation, and page stack."""
+    """Root window hosting title bar, sidebar navigation, and page stack.
+
+    Signals
+    -------
+    page_created(int, QWidget)
+        A page was instantiated on first use.
+    """
+
+    page_created = Signal(int, object)
 
     def __init__(self) -> None:
         super().__init__()
@@ -60,25 +99,62 @@ class MainWindow(QMainWindow):
         body_layout.addWidget(self._sidebar)
 
         self._stack = QStackedWidget()
-
-        self.dashboard_page = DashboardPage()
-        self.settings_page = SettingsPage()
-
-        self._stack.addWidget(self.dashboard_page)   # index 0
-        self._stack.addWidget(self.settings_page)     # index 1
+        self._pages: list[Optional[QWidget]] = [None] * len(_PAGE_FACTORIES)
+        for _ in _PAGE_FACTORIES:
+            self._stack.addWidget(QWidget())   # placeholder until first use
 
         body_layout.addWidget(self._stack, stretch=1)
         outer.addWidget(body, stretch=1)
 
+    # ── pages ────────────────────────────────────────────────────────
+
+    def page(self, index: int) -> QWidget:
+        """Return the page at ``index``, building it on first access."""
+        built = self._pages[index]
+        if built is not None:
+            return built
+
+        page = _PAGE_FACTORIES[index]()
+        current = self._stack.currentIndex()
+        stub = self._stack.widget(index)
+        self._stack.removeWidget(stub)
+        stub.deleteLater()
+        self._stack.insertWidget(index, page)
+        self._stack.setCurrentIndex(current)
+        self._pages[index] = page
+        self.page_created.emit(index, page)
+        return page
+
+    def built_page(self, index: int) -> Optional[QWidget]:
+        """Return the page at ``index`` only if it already exists."""
+        return self._pages[index]
+
+    @property
+    def dashboard_page(self):
+        return self.page(DASHBOARD_PAGE)
+
+    @property
+    def history_page(self):
+        return self.page(HISTORY_PAGE)
+
+    @property
+    def settings_page(self):
+        return self.page(SETTINGS_PAGE)
+
     # ── navigation ───────────────────────────────────────────────────
 
     @Slot(int)
     def _switch_page(self, index: int) -> None:
         if 0 <= index < self._stack.count():
+            self.page(index)
             self._stack.setCurrentIndex(index)
 
     # ── window lifecycle ─────────────────────────────────────────────
 
+    def showEvent(self, event) -> None:  # noqa: N802
+        self.page(self._stack.currentIndex())
+        super().showEvent(event)
+
     def closeEvent(self, event) -> None:  # noqa: N802
         """Hide to tray instead of quitting (if tray is active)."""
         event.accept()
@@ -1,65 +1,82 @@
 """SpeedBoost overlay — transparent topmost animation.
 
-Shows a column of teal chevrons that animate sequentially during
+Shows a column of teal chevrons that light up in sequence during
 clipboard dispatch.  The window is frameless, transparent, always-on-top,
 and click-through.
 
-Performance fix: chevrons use ``QGraphicsOpacityEffect`` instead of
-rebuilding QSS every frame.
+Performance: one widget, one ``paintEvent`` and one frame timer.  The
+chevron glyph is rendered once into a pixmap and blitted with a
+per-chevron opacity; there are no child widgets or graphics effects
+(which each rendered offscreen every frame).  Opacity is a pure function
+of elapsed time, so dropped frames never slow the animation down.
+
+Behaviour:
+  - ``start()`` only shows the overlay after ``SHOW_DELAY_MS``; sends
+    that finish sooner never flash it.
+  - While a send runs longer than ``STALL_AFTER_MS`` without
+    ``notify_progress()`` (the app calls it for upload progress and
+    finished sends) the animation freezes at a dim level instead of
+    spinning forever.
+  - The clock stops while the app is suspended/hidden or the window is
+    not exposed (e.g. the screen is locked).
 """
 
 from __future__ import annotations
 
-from PySide6.QtCore import (
-    Property,
-    QEasingCurve,
-    QPropertyAnimation,
-    QSequentialAnimationGroup,
-    Qt,
-)
-from PySide6.QtGui import QColor, QFont, QPainter
-from PySide6.QtWidgets import (
-    QGraphicsOpacityEffect,
-    QLabel,
-    QVBoxLayout,
-    QWidget,
-)
+from PySide6.QtCore import QElapsedTimer, QPointF, Qt, QTimer, Slot
+from PySide6.QtGui import QColor, QFont, QGuiApplication, QPainter, QPixmap
+from PySide6.QtWidgets import QWidget
 
 from . import theme
 
 CHEVRON_COUNT = 5
 CHEVRON_CHAR = "❯"
+CHEVRON_HEIGHT = 48
+MARGIN = 10
 
+SHOW_DELAY_MS = 150
+STALL_AFTER_MS = 15_000
+FRAME_MS = 16
+UNEXPOSED_POLL_MS = 500
 
-class _Chevron(QLabel):
-    """Single animated chevron using a QGraphicsOpacityEffect."""
+FADE_IN_MS = 280          # per chevron, top to bottom
+FADE_OUT_MS = 200         # per chevron, bottom to top
+CYCLE_MS = CHEVRON_COUNT * (FADE_IN_MS + FADE_OUT_MS)
+MIN_OPACITY = 0.15
 
-    def __init__(self, parent: QWidget | None = None) -> None:
-        super().__init__(CHEVRON_CHAR, parent)
-        self.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.setFont(QFont("Segoe UI", 28, QFont.Weight.Bold))
-        self.setStyleSheet(f"color: {theme.PRIMARY}; background: transparent;")
-
-        self._effect = QGraphicsOpacityEffect(self)
-        self._effect.setOpacity(0.15)
-        self.setGraphicsEffect(self._effect)
 
-    # ── animated property ────────────────────────────────────────────
+def _in_out_quad(t: float) -> float:
+    return 2 * t * t if t < 0.5 else 1 - (-2 * t + 2) ** 2 / 2
 
-    def get_opacity(self) -> float:
-        return self._effect.opacity()
 
-    def set_opacity(self, value: float) -> None:
-        self._effect.setOpacity(value)
+def chevron_opacity(index: int, elapsed_ms: float) -> float:
+    """Opacity of chevron ``index`` at ``elapsed_ms`` into the animation.
 
-    opacity = Property(float, get_opacity, set_opacity)
+    One cycle fades the chevrons in one after another, then fades them
+    out in reverse order — the same sequence the old per-label
+    animation group played.
+    """
+    t = elapsed_ms % CYCLE_MS
+    fade_in_start = index * FADE_IN_MS
+    fade_out_start = CHEVRON_COUNT * FADE_IN_MS + (CHEVRON_COUNT - 1 - index) * FADE_OUT_MS
+    if t < fade_in_start:
+        level = 0.0
+    elif t < fade_in_start + FADE_IN_MS:
+        level = _in_out_quad((t - fade_in_start) / FADE_IN_MS)
+    elif t < fade_out_start:
+        level = 1.0
+    elif t < fade_out_start + FADE_OUT_MS:
+        level = 1.0 - _in_out_quad((t - fade_out_start) / FADE_OUT_MS)
+    else:
+        level = 0.0
+    return MIN_OPACITY + (1.0 - MIN_OPACITY) * level
 
 
 class SpeedBoostOverlay(QWidget):
     """Transparent overlay with animated chevrons.
 
     Call ``start()`` to begin the animation and ``stop()`` to hide.
-    Supports ``demo=True`` for a single play-through.
+    Supports ``demo=True`` for a single, immediately shown play-through.
     """
 
     def __init__(self, parent: QWidget | None = None) -> None:
@@ -74,36 +91,165 @@ class SpeedBoostOverlay(QWidget):
         self.setAttribute(Qt.WidgetAttribute.WA_ShowWithoutActivating)
         self.setWindowFlag(Qt.WindowType.WindowTransparentForInput, True)
 
-        self.setFixedSize(60, CHEVRON_COUNT * 48 + 20)
+        self.setFixedSize(60, CHEVRON_COUNT * CHEVRON_HEIGHT + 2 * MARGIN)
+
+        self._glyph: QPixmap | None = None
+        self._opacities = [MIN_OPACITY] * CHEVRON_COUNT
+
+        self._clock = QElapsedTimer()
+        self._paused_ms = 0.0          # animation time accumulated before a pause
+        self._since_progress = QElapsedTimer()
 
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(0, 10, 0, 10)
-        layout.setSpacing(0)
+        self._frame_timer = QTimer(self)
+        self._frame_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._frame_timer.setInterval(FRAME_MS)
+        self._frame_timer.timeout.connect(self._on_frame)
 
-        self._chevrons: list[_Chevron] = []
-        for _ in range(CHEVRON_COUNT):
-            chev = _Chevron(self)
-            self._chevrons.append(chev)
-            layout.addWidget(chev)
+        self._show_timer = QTimer(self)
+        self._show_timer.setSingleShot(True)
+        self._show_timer.setInterval(SHOW_DELAY_MS)
+        self._show_timer.timeout.connect(self._reveal)
 
-        self._group: QSequentialAnimationGroup | None = None
+        self._active = False
         self._demo = False
+        self._stalled = False
+        self._suspended = False
+
+        app = QGuiApplication.instance()
+        if app is not None:
+            app.applicationStateChanged.connect(self._on_app_state_changed)
 
     # ── public ───────────────────────────────────────────────────────
 
     def start(self, *, demo: bool = False) -> None:
+        """Begin (or keep) animating; shown after the show delay."""
         self._demo = demo
-        self._position_bottom_right()
-        self.show()
-        self._animate()
+        self._since_progress.start()
+        self._set_stalled(False)
+        if self._active:
+            return
+        self._active = True
+        self._paused_ms = 0.0
+        if demo:
+            self._reveal()
+        else:
+            self._show_timer.start()
 
     def stop(self) -> None:
-        if self._group:
-            self._group.stop()
-            self._group = None
+        self._active = False
+        self._show_timer.stop()
+        self._frame_timer.stop()
+        self._clock.invalidate()
         self.hide()
 
-    # ── private ──────────────────────────────────────────────────────
+    def notify_progress(self) -> None:
+        """The send made progress — reset the stall detector."""
+        self._since_progress.restart()
+        self._set_stalled(False)
+
+    # ── painting ─────────────────────────────────────────────────────
+
+    def paintEvent(self, event) -> None:  # noqa: N802
+        glyph = self._chevron_pixmap()
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        dpr = glyph.devicePixelRatio()
+        x = (self.width() - glyph.width() / dpr) / 2
+        y_off = (CHEVRON_HEIGHT - glyph.height() / dpr) / 2
+        for i, opacity in enumerate(self._opacities):
+            painter.setOpacity(opacity)
+            painter.drawPixmap(QPointF(x, MARGIN + i * CHEVRON_HEIGHT + y_off), glyph)
+        painter.end()
+
+    def _chevron_pixmap(self) -> QPixmap:
+        dpr = self.devicePixelRatioF()
+        if self._glyph is not None and self._glyph.devicePixelRatio() == dpr:
+            return self._glyph
+        font = QFont("Segoe UI", 28, QFont.Weight.Bold)
+        size = CHEVRON_HEIGHT
+        pixmap = QPixmap(int(size * dpr), int(size * dpr))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.TextAntialiasing)
+        painter.setFont(font)
+        painter.setPen(QColor(theme.PRIMARY))
+        painter.drawText(0, 0, size, size, Qt.AlignmentFlag.AlignCenter, CHEVRON_CHAR)
+        painter.end()
+        self._glyph = pixmap
+        return pixmap
+
+    # ── animation clock ──────────────────────────────────────────────
+
+    def _elapsed_ms(self) -> float:
+        running = self._clock.elapsed() if self._clock.isValid() else 0
+        return self._paused_ms + running
+
+    @Slot()
+    def _reveal(self) -> None:
+        if not self._active:
+            return
+        self._position_bottom_right()
+        self.show()
+        self._resume_clock()
+
+    def _resume_clock(self) -> None:
+        if not self._active or self._stalled or self._suspended or not self.isVisible():
+            return
+        if not self._clock.isValid():
+            self._clock.start()
+        self._frame_timer.setInterval(FRAME_MS)
+        self._frame_timer.start()
+
+    def _pause_clock(self) -> None:
+        if self._clock.isValid():
+            self._paused_ms += self._clock.elapsed()
+            self._clock.invalidate()
+        self._frame_timer.stop()
+
+    @Slot()
+    def _on_frame(self) -> None:
+        handle = self.windowHandle()
+        if handle is not None and not handle.isExposed():
+            # locked screen / occluded: keep polling slowly, paint nothing
+            self._frame_timer.setInterval(UNEXPOSED_POLL_MS)
+            return
+        self._frame_timer.setInterval(FRAME_MS)
+
+        if not self._demo and self._since_progress.elapsed() > STALL_AFTER_MS:
+            self._set_stalled(True)
+            return
+
+        elapsed = self._elapsed_ms()
+        if self._demo and elapsed >= CYCLE_MS:
+            self.stop()
+            return
+        opacities = [chevron_opacity(i, elapsed) for i in range(CHEVRON_COUNT)]
+        if any(abs(a - b) > 0.004 for a, b in zip(opacities, self._opacities)):
+            self._opacities = opacities
+            self.update()
+
+    def _set_stalled(self, stalled: bool) -> None:
+        if stalled == self._stalled:
+            return
+        self._stalled = stalled
+        if stalled:
+            self._pause_clock()
+            self._opacities = [MIN_OPACITY] * CHEVRON_COUNT
+            self.update()
+        else:
+            self._resume_clock()
+
+    @Slot(Qt.ApplicationState)
+    def _on_app_state_changed(self, state: Qt.ApplicationState) -> None:
+        self._suspended = state in (
+            Qt.ApplicationState.ApplicationSuspended,
+            Qt.ApplicationState.ApplicationHidden,
+        )
+        if self._suspended:
+            self._pause_clock()
+        else:
+            self._resume_clock()
 
     def _position_bottom_right(self) -> None:
         from PySide6.QtWidgets import QApplication
@@ -114,32 +260,3 @@ class SpeedBoostOverlay(QWidget):
             x = geo.right() - self.width() - 24
             y = geo.bottom() - self.height() - 24
             self.move(x, y)
-
-    def _animate(self) -> None:
-        if self._group:
-            self._group.stop()
-
-        self._group = QSequentialAnimationGroup(self)
-
-        for chev in self._chevrons:
-            anim = QPropertyAnimation(chev, b"opacity")
-            anim.setDuration(280)
-            anim.setStartValue(0.15)
-            anim.setEndValue(1.0)
-            anim.setEasingCurve(QEasingCurve.Type.InOutQuad)
-            self._group.addAnimation(anim)
-
-        for chev in reversed(self._chevrons):
-            anim = QPropertyAnimation(chev, b"opacity")
-            anim.setDuration(200)
-            anim.setStartValue(1.0)
-            anim.setEndValue(0.15)
-            anim.setEasingCurve(QEasingCurve.Type.InOutQuad)
-            self._group.addAnimation(anim)
-
-        if self._demo:
-            self._group.finished.connect(self.stop)
-        else:
-            self._group.setLoopCount(-1)
-
-        self._group.start()
@@ -3,23 +3,20 @@
 Layout (top → bottom):
   - Page heading + subheading
   - "Clipboard Dispatch" card with send button
-  - Status cards row (connection, last sent)
+  - Status cards row (connection, last sent, outbox)
   - Activity log
 """
 
 from __future__ import annotations
 
 import logging
-from datetime import datetime
 
 from PySide6.QtCore import Qt, Slot
-from PySide6.QtGui import QIcon
 from PySide6.QtWidgets import (
     QGroupBox,
     QHBoxLayout,
     QLabel,
-    QListWidget,
-    QListWidgetItem,
+    QListView,
     QPushButton,
     QScrollArea,
     QSizePolicy,
@@ -28,6 +25,7 @@ from PySide6.QtWidgets import (
 )
 
 from .. import theme
+from ..activity_log import ActivityLogModel
 
 logger = logging.getLogger(__name__)
 
@@ -38,8 +36,9 @@ class DashboardPage(QWidget):
     def __init__(self, parent: QWidget | None = None) -> None:
         super().__init__(parent)
 
-        self._api_client = None
+        self._dispatcher = None
         self._clipboard_watcher = None
+        self._send_metadata = None
 
         root = QVBoxLayout(self)
         root.setContentsMargins(32, 24, 32, 24)
@@ -78,7 +77,7 @@ class DashboardPage(QWidget):
 
         self._send_btn = QPushButton("  Send Clipboard")
         self._send_btn.setProperty("class", "primary")
-        self._send_btn.setIcon(QIcon(theme.icon_path("send")))
+        self._send_btn.setIcon(theme.icon("send"))
         self._send_btn.setFixedHeight(42)
         self._send_btn.setCursor(Qt.CursorShape.PointingHandCursor)
         self._send_btn.clicked.connect(self._on_send_clicked)
@@ -108,6 +107,15 @@ class DashboardPage(QWidget):
         last_card.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
         row.addWidget(last_card)
 
+        # outbox card
+        outbox_card = QGroupBox("Outbox")
+        oc_lay = QVBoxLayout(outbox_card)
+        self._outbox_label = QLabel("Empty")
+        self._outbox_label.setProperty("class", "card-value")
+        oc_lay.addWidget(self._outbox_label)
+        outbox_card.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
+        row.addWidget(outbox_card)
+
         body_lay.addLayout(row)
 
         # ── activity log ─────────────────────────────────────────────
@@ -115,7 +123,11 @@ class DashboardPage(QWidget):
         log_header.setProperty("class", "card-title")
         body_lay.addWidget(log_header)
 
-        self._activity_list = QListWidget()
+        self._activity = ActivityLogModel(capacity=200, parent=self)
+        self._activity_list = QListView()
+        self._activity_list.setObjectName("activity_log")
+        self._activity_list.setModel(self._activity)
+        self._activity_list.setUniformItemSizes(True)
         self._activity_list.setMinimumHeight(140)
         body_lay.addWidget(self._activity_list)
 
@@ -125,9 +137,17 @@ class DashboardPage(QWidget):
 
     # ── public API ───────────────────────────────────────────────────
 
-    def set_services(self, *, api_client, clipboard_watcher) -> None:
-        self._api_client = api_client
+    def set_activity_model(self, model: ActivityLogModel) -> None:
+        """Show a log owned elsewhere (so entries survive lazy page creation)."""
+        self._activity = model
+        self._activity_list.setModel(model)
+
+    def set_services(self, *, dispatcher, clipboard_watcher, send_metadata=None) -> None:
+        """*send_metadata* returns the metadata for a manual send (the
+        "Send to" selection); without it the Send button broadcasts."""
+        self._dispatcher = dispatcher
         self._clipboard_watcher = clipboard_watcher
+        self._send_metadata = send_metadata
 
     def set_connection_status(self, connected: bool) -> None:
         if connected:
@@ -137,12 +157,23 @@ class DashboardPage(QWidget):
             self._conn_label.setText("● Offline")
             self._conn_label.setStyleSheet(f"color: {theme.ERROR};")
 
+    def set_last_sent(self, text: str) -> None:
+        self._last_label.setText(text[:40] + ("…" if len(text) > 40 else ""))
+        self._last_label.setStyleSheet(f"color: {theme.SENT_BADGE};")
+
+    def set_outbox_progress(self, progress) -> None:
+        """Show an ``outbox.reconcile.ReconcileProgress``."""
+        text = progress.describe()
+        self._outbox_label.setText(text[:1].upper() + text[1:])
+        if progress.running and progress.paused:
+            self._outbox_label.setStyleSheet(f"color: {theme.ERROR};")
+        elif progress.running:
+            self._outbox_label.setStyleSheet(f"color: {theme.PRIMARY_LIGHT};")
+        else:
+            self._outbox_label.setStyleSheet("")
+
     def log_activity(self, message: str) -> None:
-        ts = datetime.now().strftime("%H:%M:%S")
-        item = QListWidgetItem(f"[{ts}]  {message}")
-        self._activity_list.insertItem(0, item)
-        while self._activity_list.count() > 200:
-            self._activity_list.takeItem(self._activity_list.count() - 1)
+        self._activity.append(message)
 
     # ── slots ────────────────────────────────────────────────────────
 
@@ -162,19 +193,9 @@ class DashboardPage(QWidget):
 
         self.log_activity(f"Sending: {text[:80]}{'…' if len(text) > 80 else ''}")
 
-        if self._api_client is not None:
-            import asyncio
-
-            async def _dispatch() -> None:
-                try:
-                    await self._api_client.send_clip(text)
-                    self._last_label.setText(text[:40] + ("…" if len(text) > 40 else ""))
-                    self._last_label.setStyleSheet(f"color: {theme.SENT_BADGE};")
-                    self.log_activity("Delivered to backend.")
-                except Exception as exc:
-                    logger.exception("Send failed: %s", exc)
-                    self.log_activity(f"Send failed: {exc}")
-
-            asyncio.get_event_loop().create_task(_dispatch())
+        if self._dispatcher is not None:
+            # completion is reported by the app's dispatch callbacks
+            metadata = self._send_metadata() if self._send_metadata is not None else None
+            self._dispatcher.submit(text, metadata=metadata)
         else:
-            self.log_activity("API client not configured — payload buffered locally.")
+            self.log_activity("Dispatcher not configured — payload not sent.")
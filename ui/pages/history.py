@@ -0,0 +1,472 @@
+"""History page — virtualised, searchable list of captured clips.
+
+Layout (top → bottom):
+  - Page heading + subheading
+  - Search field + kind filter
+  - Clip list (QListView + custom delegate); activating a row (double
+    click / Enter) emits ``clip_activated`` so the app can copy it back
+
+The list is backed by ``HistoryListModel``, which pages rows out of
+SQLite on demand: ``fetchMore`` only grows the row count, and row data
+lives in a small LRU of pages re-read by keyset (``id <= ?``) when the
+view scrolls back to them.  Clips captured while the page is open are
+folded into the paged snapshot a page at a time, so memory tracks the
+visible window rather than the size of the history.  Rows have a uniform height so the
+view never measures off-screen items.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import sqlite3
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Optional
+
+from PySide6.QtCore import (
+    QAbstractListModel,
+    QModelIndex,
+    QPersistentModelIndex,
+    QRect,
+    QSize,
+    Qt,
+    QTimer,
+    Signal,
+    Slot,
+)
+from PySide6.QtGui import QColor, QFont, QPainter
+from PySide6.QtWidgets import (
+    QComboBox,
+    QHBoxLayout,
+    QLabel,
+    QLineEdit,
+    QListView,
+    QStyle,
+    QStyledItemDelegate,
+    QStyleOptionViewItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+from history.search import HistorySearcher, SearchQuery
+from history.store import HistoryEntry, HistoryStore, connect
+
+from .. import theme
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 100
+MAX_CACHED_PAGES = 8
+PREVIEW_CHARS = 512
+ROW_HEIGHT = 48
+
+ENTRY_ROLE = Qt.ItemDataRole.UserRole + 1
+
+_PAGE_SQL = (
+    "SELECT id, created_at, kind, substr(content, 1, ?) AS content, domain, length"
+    " FROM clips WHERE id <= ? ORDER BY id DESC LIMIT ?"
+)
+
+_KIND_COLOURS: dict[str, str] = {
+    "text":  theme.PRIMARY_DARK,
+    "url":   theme.ACCENT,
+    "image": "#7e57c2",
+    "file":  "#ff9800",
+}
+
+_KIND_FILTERS = [
+    ("All kinds", frozenset()),
+    ("Text", frozenset({"text"})),
+    ("URLs", frozenset({"url"})),
+]
+
+
+def _truncate(entry: HistoryEntry) -> HistoryEntry:
+    if len(entry.content) > PREVIEW_CHARS:
+        entry.content = entry.content[:PREVIEW_CHARS]
+    return entry
+
+
+# ── model ────────────────────────────────────────────────────────────
+
+class HistoryListModel(QAbstractListModel):
+    """Lazy, paged view over ``clips`` (newest first).
+
+    Rows captured after the last reset are kept in ``_head`` and shown
+    above the paged snapshot; once they fill a page they become its new
+    first page (``_fold_head``) without touching row numbers.  ``set_results`` switches the model to a
+    fixed list of search hits until ``clear_results`` is called.
+    """
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._head: list[HistoryEntry] = []
+        self._total = 0
+        self._loaded = 0
+        self._page_starts: list[int] = []
+        self._pages: OrderedDict[int, list[HistoryEntry]] = OrderedDict()
+        self._results: Optional[list[HistoryEntry]] = None
+
+    # ── public API ───────────────────────────────────────────────────
+
+    def set_store(self, store: HistoryStore) -> None:
+        if self._conn is not None:
+            self._conn.close()
+        self._conn = connect(store.path, readonly=True)
+        self.reload()
+
+    def reload(self) -> None:
+        self.beginResetModel()
+        self._head.clear()
+        self._pages.clear()
+        self._page_starts = []
+        self._loaded = 0
+        self._total = 0
+        if self._conn is not None:
+            row = self._conn.execute("SELECT count(*), max(id) FROM clips").fetchone()
+            self._total = int(row[0])
+            if row[1] is not None:
+                self._page_starts.append(int(row[1]))
+        self.endResetModel()
+
+    def prepend(self, entry: HistoryEntry) -> None:
+        self._head.insert(0, _truncate(entry))
+        if self._results is None:
+            self.beginInsertRows(QModelIndex(), 0, 0)
+            self.endInsertRows()
+        if len(self._head) >= PAGE_SIZE:
+            self._fold_head()
+
+    def set_results(self, entries: list[HistoryEntry]) -> None:
+        self.beginResetModel()
+        self._results = [_truncate(e) for e in entries]
+        self.endResetModel()
+
+    def clear_results(self) -> None:
+        if self._results is None:
+            return
+        self.beginResetModel()
+        self._results = None
+        self.endResetModel()
+
+    @property
+    def total(self) -> int:
+        return self._total + len(self._head)
+
+    # ── Qt model interface ───────────────────────────────────────────
+
+    def rowCount(self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()) -> int:  # noqa: N802
+        if parent.isValid():
+            return 0
+        if self._results is not None:
+            return len(self._results)
+        return len(self._head) + self._loaded
+
+    def canFetchMore(self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()) -> bool:  # noqa: N802
+        if parent.isValid() or self._results is not None:
+            return False
+        return self._loaded < self._total
+
+    def fetchMore(self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()) -> None:  # noqa: N802
+        if not self.canFetchMore(parent):
+            return
+        page = self._loaded // PAGE_SIZE
+        rows = self._page(page)
+        if not rows:
+            self._total = self._loaded
+            return
+        first = len(self._head) + self._loaded
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._loaded += len(rows)
+        self.endInsertRows()
+
+    def data(self, index: QModelIndex | QPersistentModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        entry = self._entry(index.row())
+        if entry is None:
+            return None
+        if role == ENTRY_ROLE:
+            return entry
+        if role == Qt.ItemDataRole.DisplayRole:
+            return entry.content
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return entry.content[:300]
+        return None
+
+    # ── private ──────────────────────────────────────────────────────
+
+    def _entry(self, row: int) -> Optional[HistoryEntry]:
+        if self._results is not None:
+            return self._results[row] if 0 <= row < len(self._results) else None
+        if row < len(self._head):
+            return self._head[row]
+        row -= len(self._head)
+        page = self._page(row // PAGE_SIZE)
+        offset = row % PAGE_SIZE
+        return page[offset] if offset < len(page) else None
+
+    def _fold_head(self) -> None:
+        # the head is exactly one page of the newest clips: it becomes
+        # page 0 (starting at its newest id) and every snapshot page moves
+        # down one, so row numbers and the view are unchanged
+        head, self._head = self._head, []
+        self._page_starts.insert(0, head[0].id)
+        self._pages = OrderedDict((page + 1, rows) for page, rows in self._pages.items())
+        self._pages[0] = head
+        while len(self._pages) > MAX_CACHED_PAGES:
+            self._pages.popitem(last=False)
+        self._total += len(head)
+        self._loaded += len(head)
+
+    def _page(self, page: int) -> list[HistoryEntry]:
+        cached = self._pages.get(page)
+        if cached is not None:
+            self._pages.move_to_end(page)
+            return cached
+        if self._conn is None or page >= len(self._page_starts):
+            return []
+
+        rows = self._conn.execute(
+            _PAGE_SQL, (PREVIEW_CHARS, self._page_starts[page], PAGE_SIZE),
+        ).fetchall()
+        entries = [HistoryEntry.from_row(r) for r in rows]
+        if entries and page + 1 == len(self._page_starts):
+            self._page_starts.append(entries[-1].id - 1)
+
+        self._pages[page] = entries
+        while len(self._pages) > MAX_CACHED_PAGES:
+            self._pages.popitem(last=False)
+        return entries
+
+
+# ── delegate ─────────────────────────────────────────────────────────
+
+class HistoryDelegate(QStyledItemDelegate):
+    """Paints a kind badge, a one-line preview and a timestamp per row.
+
+    Previews are normalised (whitespace collapsed) and elided lazily on
+    first paint, then cached per (clip id, width) so scrolling back over
+    rows never re-measures text.
+    """
+
+    _CACHE_SIZE = 512
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._badge_font = QFont()
+        self._badge_font.setPixelSize(10)
+        self._badge_font.setWeight(QFont.Weight.DemiBold)
+        self._meta_font = QFont()
+        self._meta_font.setPixelSize(11)
+        self._previews: OrderedDict[tuple[int, int], str] = OrderedDict()
+
+    def sizeHint(self, option: QStyleOptionViewItem, index) -> QSize:  # noqa: N802
+        return QSize(option.rect.width(), ROW_HEIGHT)
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index) -> None:
+        entry: Optional[HistoryEntry] = index.data(ENTRY_ROLE)
+        if entry is None:
+            return
+
+        rect = option.rect
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        if option.state & QStyle.StateFlag.State_Selected:
+            painter.fillRect(rect, QColor(theme.SURFACE_LIGHT))
+        elif option.state & QStyle.StateFlag.State_MouseOver:
+            painter.fillRect(rect, QColor(theme.SURFACE_HIGH))
+
+        # kind badge
+        badge = QRect(rect.left() + 12, rect.top() + (rect.height() - 18) // 2, 42, 18)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor(_KIND_COLOURS.get(entry.kind, theme.PRIMARY)))
+        painter.drawRoundedRect(badge, 4, 4)
+        painter.setFont(self._badge_font)
+        painter.setPen(QColor("#ffffff"))
+        painter.drawText(badge, Qt.AlignmentFlag.AlignCenter, entry.kind.upper())
+
+        # timestamp / size column
+        meta = datetime.fromtimestamp(entry.created_at).strftime("%d %b %H:%M")
+        meta_rect = QRect(rect.right() - 120, rect.top(), 108, rect.height())
+        painter.setFont(self._meta_font)
+        painter.setPen(QColor(theme.TEXT_SECONDARY))
+        painter.drawText(
+            meta_rect, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter, meta,
+        )
+
+        # preview
+        text_rect = QRect(badge.right() + 12, rect.top(), meta_rect.left() - badge.right() - 24, rect.height())
+        painter.setFont(option.font)
+        painter.setPen(QColor(theme.TEXT_PRIMARY))
+        painter.drawText(
+            text_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+            self._preview(entry, option, text_rect.width()),
+        )
+
+        painter.setPen(QColor(theme.BORDER))
+        painter.drawLine(rect.left() + 8, rect.bottom(), rect.right() - 8, rect.bottom())
+        painter.restore()
+
+    # ── private ──────────────────────────────────────────────────────
+
+    def _preview(self, entry: HistoryEntry, option: QStyleOptionViewItem, width: int) -> str:
+        key = (entry.id, width)
+        cached = self._previews.get(key)
+        if cached is not None:
+            self._previews.move_to_end(key)
+            return cached
+
+        text = " ".join(entry.content.split())
+        elided = option.fontMetrics.elidedText(text, Qt.TextElideMode.ElideRight, width)
+        self._previews[key] = elided
+        if len(self._previews) > self._CACHE_SIZE:
+            self._previews.popitem(last=False)
+        return elided
+
+
+# ── page ─────────────────────────────────────────────────────────────
+
+class HistoryPage(QWidget):
+    """Browse and search previously captured clips."""
+
+    clip_activated = Signal(int)     # clip id
+
+    _SEARCH_DEBOUNCE_MS = 60
+
+    def __init__(self, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+
+        self._store: Optional[HistoryStore] = None
+        self._searcher: Optional[HistorySearcher] = None
+        self._search_task: Optional[asyncio.Task] = None
+
+        root = QVBoxLayout(self)
+        root.setContentsMargins(32, 24, 32, 24)
+        root.setSpacing(0)
+
+        # ── header ───────────────────────────────────────────────────
+        heading = QLabel("History")
+        heading.setProperty("class", "heading")
+        root.addWidget(heading)
+
+        sub = QLabel("Everything you've copied, newest first.")
+        sub.setProperty("class", "subheading")
+        root.addWidget(sub)
+        root.addSpacing(20)
+
+        # ── search row ───────────────────────────────────────────────
+        search_row = QHBoxLayout()
+        search_row.setSpacing(12)
+
+        self._search = QLineEdit()
+        self._search.setPlaceholderText("Search clips…")
+        self._search.setClearButtonEnabled(True)
+        self._search.textChanged.connect(self._on_search_changed)
+        search_row.addWidget(self._search, stretch=1)
+
+        self._kind_filter = QComboBox()
+        for label, _ in _KIND_FILTERS:
+            self._kind_filter.addItem(label)
+        self._kind_filter.currentIndexChanged.connect(self._on_search_changed)
+        search_row.addWidget(self._kind_filter)
+
+        root.addLayout(search_row)
+        root.addSpacing(12)
+
+        self._status = QLabel("History is disabled.")
+        self._status.setProperty("class", "card-value")
+        root.addWidget(self._status)
+        root.addSpacing(8)
+
+        # ── clip list ────────────────────────────────────────────────
+        self._model = HistoryListModel(self)
+        self._list = QListView()
+        self._list.setObjectName("history_list")
+        self._list.setModel(self._model)
+        self._list.setItemDelegate(HistoryDelegate(self._list))
+        self._list.setUniformItemSizes(True)
+        self._list.setMouseTracking(True)
+        self._list.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)
+        self._list.activated.connect(self._on_activated)
+        root.addWidget(self._list, stretch=1)
+
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(self._SEARCH_DEBOUNCE_MS)
+        self._debounce.timeout.connect(self._start_search)
+
+    # ── public API ───────────────────────────────────────────────────
+
+    def set_history(self, store: HistoryStore, searcher: HistorySearcher) -> None:
+        """Show *store*; the page owns *searcher* and closes it when done."""
+        if self._searcher is not None and self._searcher is not searcher:
+            self._searcher.close()
+        self._store = store
+        self._searcher = searcher
+        # bound to the searcher, not the page: it runs as the page goes away
+        self.destroyed.connect(searcher.close)
+        self._model.set_store(store)
+        self._update_status()
+
+    def clip_added(self, clip_id: int) -> None:
+        if self._store is None:
+            return
+        entry = self._store.get(clip_id)
+        if entry is not None:
+            self._model.prepend(entry)
+            self._update_status()
+
+    # ── slots ────────────────────────────────────────────────────────
+
+    @Slot()
+    def _on_search_changed(self) -> None:
+        if self._search_task is not None:
+            self._search_task.cancel()
+            self._search_task = None
+        if self._searcher is not None:
+            self._searcher.cancel()
+        self._debounce.start()
+
+    @Slot(QModelIndex)
+    def _on_activated(self, index: QModelIndex) -> None:
+        entry = index.data(ENTRY_ROLE)
+        if entry is not None:
+            self.clip_activated.emit(entry.id)
+
+    @Slot()
+    def _start_search(self) -> None:
+        if self._searcher is None:
+            return
+        text = self._search.text().strip()
+        kinds = _KIND_FILTERS[self._kind_filter.currentIndex()][1]
+        if not text and not kinds:
+            self._model.clear_results()
+            self._update_status()
+            return
+
+        query = SearchQuery(text=text, kinds=kinds)
+        self._search_task = asyncio.get_event_loop().create_task(self._run_search(query))
+
+    async def _run_search(self, query: SearchQuery) -> None:
+        try:
+            result = await self._searcher.search(query)
+        except asyncio.CancelledError:
+            return
+        except Exception as exc:
+            logger.exception("History search failed: %s", exc)
+            self._status.setText(f"Search failed: {exc}")
+            return
+        self._model.set_results(result.entries)
+        suffix = " (fuzzy)" if result.fuzzy else ""
+        count = len(result.entries)
+        self._status.setText(f"{count} match{'es' if count != 1 else ''}{suffix}")
+
+    # ── private ──────────────────────────────────────────────────────
+
+    def _update_status(self) -> None:
+        total = self._model.total
+        self._status.setText(f"{total:,} clip{'s' if total != 1 else ''}")
@@ -42,6 +42,7 @@ class SettingsPage(QWidget):
         super().__init__(parent)
 
         self._settings_store = None
+        self._outbox_progress = None
         self._dirty = False
 
         root = QVBoxLayout(self)
@@ -117,6 +118,10 @@ class SettingsPage(QWidget):
         self._speedboost.toggled.connect(self._mark_dirty)
         bc.addWidget(self._speedboost)
 
+        self._e2e = QCheckBox("End-to-end encrypt sent clips")
+        self._e2e.toggled.connect(self._mark_dirty)
+        bc.addWidget(self._e2e)
+
         body_lay.addWidget(beh_card)
 
         # ── System card ──────────────────────────────────────────────
@@ -174,6 +179,11 @@ class SettingsPage(QWidget):
         self._settings_store = store
         self._load_from_store()
 
+    def set_outbox_progress(self, progress) -> None:
+        """Show an ``outbox.reconcile.ReconcileProgress`` in the status card."""
+        self._outbox_progress = progress
+        self._update_outbox_count()
+
     # ── private ──────────────────────────────────────────────────────
 
     def _load_from_store(self) -> None:
@@ -182,7 +192,7 @@ class SettingsPage(QWidget):
         s = self._settings_store
 
         for w in (self._device_id, self._api_url, self._firebase_path,
-                  self._auto_text, self._auto_urls, self._speedboost):
+                  self._auto_text, self._auto_urls, self._speedboost, self._e2e):
             w.blockSignals(True)
 
         self._device_id.setText(s.get("device_id", ""))
@@ -191,9 +201,10 @@ class SettingsPage(QWidget):
         self._auto_text.setChecked(s.get("auto_send_text", False))
         self._auto_urls.setChecked(s.get("auto_send_urls", False))
         self._speedboost.setChecked(s.get("speedboost_enabled", True))
+        self._e2e.setChecked(s.get("e2e_enabled", False))
 
         for w in (self._device_id, self._api_url, self._firebase_path,
-                  self._auto_text, self._auto_urls, self._speedboost):
+                  self._auto_text, self._auto_urls, self._speedboost, self._e2e):
             w.blockSignals(False)
 
         self._dirty = False
@@ -207,9 +218,13 @@ class SettingsPage(QWidget):
             "auto_send_text": self._auto_text.isChecked(),
             "auto_send_urls": self._auto_urls.isChecked(),
             "speedboost_enabled": self._speedboost.isChecked(),
+            "e2e_enabled": self._e2e.isChecked(),
         }
 
     def _update_outbox_count(self) -> None:
+        if self._outbox_progress is not None:
+            self._outbox_label.setText(f"Outbox: {self._outbox_progress.describe()}")
+            return
         outbox = Path.home() / ".biome" / "outbox"
         count = len(list(outbox.glob("*.json"))) if outbox.exists() else 0
         self._outbox_label.setText(f"Outbox: {count} pending item{'s' if count != 1 else ''}")
@@ -8,7 +8,6 @@ quit button.  All styling is done via QSS pseudo-states defined in
 from __future__ import annotations
 
 from PySide6.QtCore import Qt, Signal, QSize
-from PySide6.QtGui import QIcon
 from PySide6.QtWidgets import (
     QFrame,
     QToolButton,
@@ -32,7 +31,7 @@ class NavButton(QToolButton):
     ) -> None:
         super().__init__(parent)
         self.setObjectName("nav_btn")
-        self.setIcon(QIcon(theme.icon_path(icon_name)))
+        self.setIcon(theme.icon(icon_name))
         self.setIconSize(QSize(22, 22))
         self.setToolTip(tooltip)
         self.setFixedSize(44, 44)
@@ -69,7 +68,7 @@ class Sidebar(QFrame):
         # ── logo ─────────────────────────────────────────────────────
         self._logo = QToolButton(self)
         self._logo.setObjectName("nav_btn")
-        self._logo.setIcon(QIcon(theme.icon_path("send")))
+        self._logo.setIcon(theme.icon("send"))
         self._logo.setIconSize(QSize(28, 28))
         self._logo.setFixedSize(44, 44)
         self._logo.setToolTip("Biome")
@@ -82,6 +81,7 @@ class Sidebar(QFrame):
         self._buttons: list[NavButton] = []
         nav_items = [
             ("dashboard", "Dashboard"),
+            ("history",   "History"),
             ("settings",  "Settings"),
         ]
         for icon_name, tooltip in nav_items:
@@ -98,7 +98,7 @@ class Sidebar(QFrame):
         # ── quit button ──────────────────────────────────────────────
         self._quit_btn = QToolButton(self)
         self._quit_btn.setObjectName("nav_btn")
-        self._quit_btn.setIcon(QIcon(theme.icon_path("close")))
+        self._quit_btn.setIcon(theme.icon("close"))
         self._quit_btn.setIconSize(QSize(18, 18))
         self._quit_btn.setFixedSize(36, 36)
         self._quit_btn.setToolTip("Quit Biome")
@@ -3,15 +3,22 @@
 Wraps *qt-material* with a custom colour palette and exports semantic
 token constants that the rest of the UI can import.  Call
 ``apply_theme(app)`` once before any widget is created.
+
+The compiled sheet is cached on disk (see ``ui.stylesheet_cache``), so
+qt-material is only imported and rendered when the theme inputs change.
 """
 
 from __future__ import annotations
 
+import logging
 import os
+import time
 from pathlib import Path
 
 from PySide6.QtWidgets import QApplication
 
+logger = logging.getLogger(__name__)
+
 # ── asset directories ──────────────────────────────────────────────────
 _ROOT = Path(__file__).resolve().parent.parent
 ICONS_DIR = str(_ROOT / "icons")
@@ -23,6 +30,12 @@ def icon_path(name: str) -> str:
     return os.path.join(ICONS_DIR, f"{name}.svg")
 
 
+def icon(name: str):
+    """Return the shared QIcon for an icon stem name (see ``ui.assets``)."""
+    from .assets import icon as _bundled_icon
+    return _bundled_icon(name, svg_fallback=icon_path(name))
+
+
 # ── colour tokens  (Material teal-dark palette) ─────────────────────
 PRIMARY        = "#009688"    # teal 500
 PRIMARY_LIGHT  = "#4db6ac"    # teal 300
@@ -117,22 +130,31 @@ QScrollArea {{
 }}
 
 /* ─── Activity log ─── */
-QListWidget {{
+QListView#activity_log {{
     background-color: {SURFACE};
     border: 1px solid {BORDER};
     border-radius: 10px;
     padding: 4px;
     font-size: 12px;
 }}
-QListWidget::item {{
+QListView#activity_log::item {{
     padding: 6px 10px;
     border-bottom: 1px solid {BORDER};
     color: {TEXT_PRIMARY};
 }}
-QListWidget::item:selected {{
+QListView#activity_log::item:selected {{
     background-color: {SURFACE_LIGHT};
 }}
 
+/* ─── History list (rows painted by HistoryDelegate) ─── */
+QListView#history_list {{
+    background-color: {SURFACE};
+    border: 1px solid {BORDER};
+    border-radius: 10px;
+    padding: 4px;
+    font-size: 13px;
+}}
+
 /* ─── Page content area — slightly lighter than window bg ─── */
 QStackedWidget > QWidget {{
     background-color: {BACKGROUND_ALT};
@@ -328,30 +350,43 @@ QMenu::separator {{
 """
 
 
+THEME_FILE = "dark_teal.xml"
+
+THEME_EXTRA = {
+    "density_scale": "0",
+    "font_family": "Inter, Rubik, Segoe UI Variable, sans-serif",
+    "font_size": "13px",
+}
+
+
 def apply_theme(app: QApplication) -> None:
     """Apply Material dark-teal theme + Biome overrides."""
-    from PySide6.QtGui import QFontDatabase
-    from qt_material import apply_stylesheet
+    from .assets import register_fonts
+    from .stylesheet_cache import StylesheetCache, cache_key, enabled
+
+    t0 = time.perf_counter()
 
     # ── register bundled Inter font ───────────────────────────────
-    fonts_path = Path(FONTS_DIR)
-    if fonts_path.exists():
-        for ttf in fonts_path.glob("*.ttf"):
-            QFontDatabase.addApplicationFont(str(ttf))
+    register_fonts(FONTS_DIR)
+
+    cache = StylesheetCache(cache_key(THEME_FILE, THEME_EXTRA, _OVERRIDE_QSS)) if enabled() else None
+    if cache is not None and cache.load(app):
+        logger.info("Theme applied from cache in %.1f ms", (time.perf_counter() - t0) * 1000)
+        return
 
-    extra = {
-        "density_scale": "0",
-        "font_family": "Inter, Rubik, Segoe UI Variable, sans-serif",
-        "font_size": "13px",
-    }
+    from qt_material import apply_stylesheet
 
     apply_stylesheet(
         app,
-        theme="dark_teal.xml",
-        extra=extra,
+        theme=THEME_FILE,
+        extra=dict(THEME_EXTRA),
         css_file=None,
     )
 
     # layer our overrides on top
     current = app.styleSheet() or ""
     app.setStyleSheet(current + "\n" + _OVERRIDE_QSS)
+
+    if cache is not None:
+        cache.store(app)
+    logger.info("Theme compiled in %.1f ms", (time.perf_counter() - t0) * 1000)
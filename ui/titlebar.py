@@ -8,7 +8,7 @@ double-click to toggle maximize.
 from __future__ import annotations
 
 from PySide6.QtCore import Qt, QPoint
-from PySide6.QtGui import QIcon, QMouseEvent
+from PySide6.QtGui import QMouseEvent
 from PySide6.QtWidgets import (
     QHBoxLayout,
     QLabel,
@@ -48,14 +48,14 @@ class TitleBar(QWidget):
         btn_size = 36
 
         self._btn_minimize = QPushButton()
-        self._btn_minimize.setIcon(QIcon(theme.icon_path("minimize")))
+        self._btn_minimize.setIcon(theme.icon("minimize"))
         self._btn_minimize.setFixedSize(btn_size + 10, btn_size)
         self._btn_minimize.setToolTip("Minimize")
         self._btn_minimize.clicked.connect(self._on_minimize)
         layout.addWidget(self._btn_minimize)
 
         self._btn_maximize = QPushButton()
-        self._btn_maximize.setIcon(QIcon(theme.icon_path("maximize")))
+        self._btn_maximize.setIcon(theme.icon("maximize"))
         self._btn_maximize.setFixedSize(btn_size + 10, btn_size)
         self._btn_maximize.setToolTip("Maximize")
         self._btn_maximize.clicked.connect(self._on_maximize)
@@ -63,7 +63,7 @@ class TitleBar(QWidget):
 
         self._btn_close = QPushButton()
         self._btn_close.setObjectName("btn_close")
-        self._btn_close.setIcon(QIcon(theme.icon_path("close")))
+        self._btn_close.setIcon(theme.icon("close"))
         self._btn_close.setFixedSize(btn_size + 10, btn_size)
         self._btn_close.setToolTip("Close")
         self._btn_close.clicked.connect(self._on_close)
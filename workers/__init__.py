@@ -0,0 +1 @@
+"""Shared executors for CPU-bound payload work."""
@@ -0,0 +1,245 @@
+"""Thread and process pools for payload processing.
+
+qasync runs asyncio on the Qt main thread, so anything CPU-heavy done in
+a coroutine freezes the UI *and* every in-flight request.  Payload
+stages offload through here with one call::
+
+    digest = await offload(sha256_hex, data)                        # thread pool
+    hits = await offload(scan_secrets, text, process=True, timeout=5)
+
+* The **thread pool** is for work that releases the GIL — ``hashlib``,
+  ``zlib``, ``cryptography``, Pillow encoders — and is sized to the CPU
+  count.
+* The **process pool** is for pure-Python loops (scanning, diffing) that
+  would otherwise hold the GIL; it is created on first use with the
+  ``spawn`` start method (forking a Qt process is unsafe) and keeps one
+  core free for the GUI.
+
+Cancelling the awaiting coroutine, or hitting ``timeout``, cancels the
+job if it has not started.  A thread job that is already running can
+observe cancellation cooperatively: pass ``with_token=True`` and the
+function receives ``token=`` (a ``CancelToken``) to poll.  A running
+process job cannot be interrupted; its result is discarded.
+
+Pool sizes can be overridden with ``BIOME_WORKER_THREADS`` and
+``BIOME_WORKER_PROCESSES``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class OffloadCancelled(Exception):
+    """Raised by ``CancelToken.raise_if_cancelled`` inside a worker."""
+
+
+class CancelToken:
+    """Cooperative cancellation flag handed to thread-pool jobs."""
+
+    __slots__ = ("_event",)
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise OffloadCancelled()
+
+
+def cpu_count() -> int:
+    """CPUs this process may run on (respects affinity / cgroup masks)."""
+    if hasattr(os, "process_cpu_count"):            # 3.13+
+        return os.process_cpu_count() or 1
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+
+def _env_int(name: str) -> Optional[int]:
+    value = os.environ.get(name, "").strip()
+    if not value:
+        return None
+    try:
+        return max(1, int(value))
+    except ValueError:
+        logger.warning("Ignoring invalid %s=%r", name, value)
+        return None
+
+
+class WorkerPools:
+    """Lazily created thread + process executors."""
+
+    def __init__(self, threads: int | None = None, processes: int | None = None) -> None:
+        cpus = cpu_count()
+        self.thread_workers = threads or _env_int("BIOME_WORKER_THREADS") or cpus
+        self.process_workers = (
+            processes or _env_int("BIOME_WORKER_PROCESSES") or max(1, cpus - 1)
+        )
+        self._threads: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._processes: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    # ── public API ───────────────────────────────────────────────────
+
+    async def run_thread(
+        self,
+        fn: Callable[..., T],
+        /,
+        *args: Any,
+        timeout: float | None = None,
+        with_token: bool = False,
+        **kwargs: Any,
+    ) -> T:
+        """Run ``fn(*args, **kwargs)`` in the thread pool."""
+        token: Optional[CancelToken] = None
+        if with_token:
+            token = CancelToken()
+            kwargs["token"] = token
+        future = self._thread_pool().submit(fn, *args, **kwargs)
+        return await self._await(future, timeout, token)
+
+    async def run_process(
+        self,
+        fn: Callable[..., T],
+        /,
+        *args: Any,
+        timeout: float | None = None,
+        **kwargs: Any,
+    ) -> T:
+        """Run ``fn(*args, **kwargs)`` in the process pool.
+
+        ``fn`` and its arguments must be picklable (module-level
+        functions, plain data).
+        """
+        try:
+            future = self._process_pool().submit(fn, *args, **kwargs)
+        except BrokenProcessPool:
+            logger.warning("Process pool broken — recreating it")
+            self._reset_process_pool()
+            future = self._process_pool().submit(fn, *args, **kwargs)
+        return await self._await(future, timeout, None)
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Drop queued jobs and release the pools."""
+        with self._lock:
+            self._closed = True
+            threads, self._threads = self._threads, None
+            processes, self._processes = self._processes, None
+        if threads is not None:
+            threads.shutdown(wait=wait, cancel_futures=True)
+        if processes is not None:
+            processes.shutdown(wait=wait, cancel_futures=True)
+
+    # ── private ──────────────────────────────────────────────────────
+
+    @staticmethod
+    async def _await(
+        future: concurrent.futures.Future,
+        timeout: float | None,
+        token: Optional[CancelToken],
+    ) -> Any:
+        # wrap_future propagates cancellation of the asyncio side to the
+        # concurrent future, which drops the job if it has not started
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            if token is not None:
+                token.cancel()
+            raise
+
+    def _thread_pool(self) -> concurrent.futures.ThreadPoolExecutor:
+        with self._lock:
+            self._check_open()
+            if self._threads is None:
+                self._threads = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.thread_workers, thread_name_prefix="biome-worker",
+                )
+            return self._threads
+
+    def _process_pool(self) -> concurrent.futures.ProcessPoolExecutor:
+        with self._lock:
+            self._check_open()
+            if self._processes is None:
+                self._processes = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.process_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                logger.info("Started process pool (%d workers)", self.process_workers)
+            return self._processes
+
+    def _reset_process_pool(self) -> None:
+        with self._lock:
+            broken, self._processes = self._processes, None
+        if broken is not None:
+            broken.shutdown(wait=False, cancel_futures=True)
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise RuntimeError("worker pools have been shut down")
+
+
+_pools: Optional[WorkerPools] = None
+_pools_lock = threading.Lock()
+_shut_down = False
+
+
+def get_pools() -> WorkerPools:
+    """The shared pools; raises ``RuntimeError`` once ``shutdown`` ran."""
+    global _pools
+    with _pools_lock:
+        if _shut_down:
+            # a late offload during teardown must not start fresh pools
+            raise RuntimeError("worker pools have been shut down")
+        if _pools is None:
+            _pools = WorkerPools()
+        return _pools
+
+
+async def offload(
+    fn: Callable[..., T],
+    /,
+    *args: Any,
+    process: bool = False,
+    timeout: float | None = None,
+    **kwargs: Any,
+) -> T:
+    """Run a payload-processing step off the event-loop thread.
+
+    Thread pool by default; ``process=True`` for GIL-bound pure-Python
+    work.  Extra keyword arguments (including ``with_token``) are passed
+    through to ``WorkerPools.run_thread`` / ``run_process``.
+    """
+    pools = get_pools()
+    if process:
+        return await pools.run_process(fn, *args, timeout=timeout, **kwargs)
+    return await pools.run_thread(fn, *args, timeout=timeout, **kwargs)
+
+
+def shutdown() -> None:
+    """Shut down the shared pools (connected to ``aboutToQuit``) for good."""
+    global _pools, _shut_down
+    with _pools_lock:
+        _shut_down = True
+        pools, _pools = _pools, None
+    if pools is not None:
+        pools.shutdown()